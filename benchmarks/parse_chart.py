@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Micro-benchmark of utils.parse_quotes against the previous list-based parser,
+on synthetic 1m chart payloads like Yahoo returns.
+
+    python benchmarks/parse_chart.py [--bars 200000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from yfinance import utils  # noqa: E402
+
+
+def parse_quotes_lists(data):
+    # Previous implementation, for reference
+    timestamps = data["timestamp"]
+    ohlc = data["indicators"]["quote"][0]
+    quotes = pd.DataFrame({"Open": ohlc["open"],
+                           "High": ohlc["high"],
+                           "Low": ohlc["low"],
+                           "Close": ohlc["close"],
+                           "Adj Close": ohlc["close"],
+                           "Volume": ohlc["volume"]})
+    quotes.index = pd.to_datetime(timestamps, unit="s")
+    quotes.sort_index(inplace=True)
+    return quotes
+
+
+def make_payload(n, null_rate=0.001, seed=0):
+    rng = np.random.default_rng(seed)
+    ts = (1_700_000_000 + 60 * np.arange(n)).tolist()
+    close = (100 + np.cumsum(rng.normal(0, 0.05, n))).round(4)
+    nulls = rng.random(n) < null_rate
+
+    def _with_nulls(a):
+        a = a.tolist()
+        for i in np.flatnonzero(nulls):
+            a[i] = None
+        return a
+
+    quote = {'open': _with_nulls(close), 'high': _with_nulls(close + 0.01), 'low': _with_nulls(close - 0.01),
+             'close': _with_nulls(close), 'volume': _with_nulls(rng.integers(0, 10_000, n))}
+    return {'timestamp': ts, 'indicators': {'quote': [quote]}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bars', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    data = make_payload(args.bars)
+    pd.testing.assert_frame_equal(parse_quotes_lists(data), utils.parse_quotes(data))
+
+    for name, fn in (('lists', parse_quotes_lists), ('numpy', utils.parse_quotes)):
+        best = min(timeit.repeat(lambda: fn(data), number=1, repeat=args.repeat))
+        print(f"{name:>6}: {best * 1000:8.1f} ms for {args.bars} bars")
+
+
+if __name__ == '__main__':
+    main()
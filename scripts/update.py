@@ -1,7 +1,7 @@
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+import pandas as pd
 import yfinance as yf
-import time
 from datetime import datetime
 
 # --- Configuration ---
@@ -69,6 +69,14 @@ def update_google_sheet_prices():
 
         updates = []
 
+        # One batched request for every holding, instead of Ticker.info each
+        symbols = [
+            data[r - 1][SYMBOL_COL - 1].strip().upper()
+            for r in valid_rows
+            if r - 1 < len(data) and data[r - 1][SYMBOL_COL - 1].strip()
+        ]
+        quotes = yf.quotes(symbols, fields=['regularMarketPrice', 'regularMarketPreviousClose'])
+
         for row_num in valid_rows:
             row_index = row_num - 1
 
@@ -86,11 +94,11 @@ def update_google_sheet_prices():
                 except (ValueError, TypeError):
                     old_price = None
 
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
-
-                latest_price = info.get('regularMarketPrice') or info.get('previousClose')
-                if latest_price is None:
+                quote = quotes.loc[symbol]
+                latest_price = quote.get('regularMarketPrice')
+                if pd.isna(latest_price):
+                    latest_price = quote.get('regularMarketPreviousClose')
+                if latest_price is None or pd.isna(latest_price):
                     print(f"❌ {symbol} | price fetch failed")
                     continue
 
@@ -123,8 +131,6 @@ def update_google_sheet_prices():
                     f"{old_price if old_price is not None else 'N/A'} → {latest_price}"
                 )
 
-                time.sleep(0.5)
-
             except Exception as e:
                 print(f"🚨 Row {row_num} | Error: {e}")
 
@@ -60,14 +60,15 @@ setup(
     keywords='pandas, yahoo finance, pandas datareader',
     packages=find_packages(exclude=['contrib', 'docs', 'tests', 'examples']),
     install_requires=['pandas>=1.3.0', 'numpy>=1.16.5',
-                      'requests>=2.31', 'multitasking>=0.0.7',
+                      'requests>=2.31',
                       'platformdirs>=2.0.0', 'pytz>=2022.5',
-                      'frozendict>=2.3.4', 'peewee>=3.16.2',
+                      'peewee>=3.16.2',
                       'beautifulsoup4>=4.11.1', 'curl_cffi>=0.7',
                       'protobuf>=3.19.0', 'websockets>=13.0'],
     extras_require={
         'nospam': ['requests_cache>=1.0', 'requests_ratelimiter>=0.3.1'],
         'repair': ['scipy>=1.6.3'],
+        'parquet': ['pyarrow>=10.0.1'],
     },
     # Include protobuf files for websocket support
     package_data={
@@ -4,7 +4,11 @@ import platformdirs as _ad
 import datetime as _dt
 import sys
 import os
+import unittest
+from unittest.mock import patch
 import yfinance
+from yfinance.data import YfData
+from yfinance.mock_server import MockYahooServer
 # from requests_ratelimiter import LimiterSession
 # from pyrate_limiter import Duration, RequestRate, Limiter
 
@@ -46,3 +50,61 @@ session_gbl = None
 #     bucket_class=MemoryQueueBucket,
 #     backend=SQLiteCache(cache_fp, expire_after=_dt.timedelta(hours=1)),
 # )
+
+
+# Offline harness: a local mock Yahoo server, with the on-disk caches swapped
+# for in-memory ones so tests never touch real cache files.
+class MemoryCookieCache:
+    def __init__(self):
+        self.d = {}
+
+    def lookup(self, strategy):
+        if strategy not in self.d:
+            return None
+        return {'cookie': self.d[strategy], 'age': _dt.timedelta(0)}
+
+    def store(self, strategy, cookie):
+        if cookie is None:
+            self.d.pop(strategy, None)
+        else:
+            self.d[strategy] = cookie
+
+
+class MemoryTzCache:
+    def __init__(self):
+        self.d = {}
+
+    def lookup(self, tkr):
+        return self.d.get(tkr)
+
+    def store(self, tkr, tz):
+        self.d[tkr] = tz
+
+    def lookup_many(self, tkrs):
+        return {t: self.d[t] for t in tkrs if t in self.d}
+
+    def store_many(self, tzs):
+        self.d.update(tzs)
+
+
+class MockServerCase(unittest.TestCase):
+    # Swap on-disk caches for in-memory ones
+    patch_caches = True
+
+    def setUp(self):
+        self.ydata = YfData()
+        saved = (self.ydata._session, self.ydata._auth, self.ydata._cookie_strategy, self.ydata._crumb, self.ydata._cookie)
+
+        def _restore():
+            self.ydata._set_session(saved[0])
+            self.ydata._auth, self.ydata._cookie_strategy, self.ydata._crumb, self.ydata._cookie = saved[1:]
+        self.addCleanup(_restore)
+        if self.patch_caches:
+            for target, value in (('yfinance.cache.get_response_cache', yfinance.cache._ResponseCacheDummy()),
+                                  ('yfinance.cache.get_tz_cache', yfinance.cache._TzCacheDummy()),
+                                  ('yfinance.cache.get_cookie_cache', MemoryCookieCache())):
+                patcher = patch(target, return_value=value)
+                patcher.start()
+                self.addCleanup(patcher.stop)
+        self.server = MockYahooServer().start()
+        self.addCleanup(self.server.stop)
@@ -0,0 +1,71 @@
+"""
+Tests for quotes and spark
+
+To run all tests in suite from commandline:
+   python -m unittest tests.batch
+
+Specific test class:
+   python -m unittest tests.batch.TestQuotes
+
+"""
+from tests.context import yfinance as yf
+from tests.context import MockServerCase
+
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from yfinance.data import get_context
+from yfinance.exceptions import YFException
+
+class TestQuotes(MockServerCase):
+    def test_batched_typed_frame(self):
+        yf.set_config(transport=self.server.transport())
+        symbols = [f'Q{i}' for i in range(250)]
+        with patch('yfinance.batch._QUOTE_BATCH_SIZE', 100):
+            df = yf.quotes(symbols + ['q0'])
+        self.assertEqual(len([p for p, q in self.server.log if p.startswith('/v7/finance/quote')]), 3)
+        self.assertEqual(list(df.index), symbols)
+        self.assertEqual(df.index.name, 'Symbol')
+        self.assertTrue(pd.api.types.is_float_dtype(df['regularMarketPrice']))
+        self.assertEqual(str(df['regularMarketTime'].dt.tz), 'UTC')
+        self.assertEqual(df.loc['Q7', 'currency'], 'USD')
+
+    def test_session_context(self):
+        ctx = get_context('test-quotes', session=self.server.transport())
+        df = yf.quotes(['AAA', 'BBB'], fields=['regularMarketPrice'], session=ctx)
+        self.assertFalse(df['regularMarketPrice'].isna().any())
+        self.assertEqual(len([p for p, q in self.server.log if p.startswith('/v7/finance/quote')]), 1)
+
+    def test_failed_batch(self):
+        with patch('yfinance.data.YfData.get_raw_json', side_effect=YFException('down')):
+            df = yf.quotes('AAA, BBB')
+            self.assertEqual(list(df.index), ['AAA', 'BBB'])
+            with self.assertRaises(YFException):
+                yf.quotes(['AAA'], raise_errors=True)
+
+
+class TestSpark(MockServerCase):
+    def test_close_matrix(self):
+        yf.set_config(transport=self.server.transport())
+        symbols = [f'S{i}' for i in range(45)]
+        df = yf.spark(symbols, period='1mo', interval='1d')
+        self.assertEqual(len([p for p, q in self.server.log if p.startswith('/v7/finance/spark')]), 3)
+        self.assertEqual(list(df.columns), symbols)
+        self.assertIsNone(df.index.tz)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertFalse(df.isna().any().any())
+        ref = yf.download('S3', period='1mo', auto_adjust=False, progress=False, multi_level_index=False)
+        self.assertTrue(((df['S3'] - ref['Close'].reindex(df.index)).abs() < 1e-3).all())
+
+    def test_intraday_utc(self):
+        yf.set_config(transport=self.server.transport())
+        df = yf.spark('S1 S2', period='5d', interval='1h')
+        self.assertEqual(str(df.index.tz), 'UTC')
+        self.assertEqual(df.index.name, 'Datetime')
+        self.assertGreater(len(df), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,8 +11,10 @@ Specific test class:
 from tests.context import yfinance as yf
 
 import unittest
+from unittest.mock import patch
 import tempfile
 import os
+import time
 
 
 class TestCache(unittest.TestCase):
@@ -24,6 +26,7 @@ class TestCache(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
         yf.cache._TzDBManager.close_db()
+        yf.cache._ResponseDBManager.close_db()
         cls.tempCacheDir.cleanup()
 
     def test_storeTzNoRaise(self):
@@ -45,6 +48,41 @@ class TestCache(unittest.TestCase):
 
         self.assertTrue(os.path.exists(os.path.join(self.tempCacheDir.name, "tkr-tz.db")))
 
+    def test_tzCacheMany(self):
+        cache = yf.cache.get_tz_cache()
+        cache.store('AMZN', "America/New_York")
+        cache.store_many({'AMZN': "Europe/London", 'SAP.DE': "Europe/Berlin"})
+        self.assertEqual(cache.lookup_many(['AMZN', 'SAP.DE', 'NOPE']),
+                         {'AMZN': "Europe/London", 'SAP.DE': "Europe/Berlin"})
+
+    def test_responseCacheExpiry(self):
+        cache = yf.cache.get_response_cache()
+        cache.store('k-forever', 'http://x', 200, b'{}', None)
+        cache.store('k-expired', 'http://x', 200, b'{}', -1)
+        self.assertEqual(cache.lookup('k-forever')['content'], b'{}')
+        self.assertIsNone(cache.lookup('k-expired'))
+        self.assertTrue(os.path.exists(os.path.join(self.tempCacheDir.name, "http-cache.db")))
+
+    def test_responseCacheEvictsLRU(self):
+        cache = yf.cache.get_response_cache()
+        cache.clear()
+        with patch.object(yf.cache._ResponseCache, 'max_bytes', 250):
+            for k in ['a', 'b', 'c']:
+                cache.store(k, 'http://x', 200, b'x' * 100, None)
+                time.sleep(0.01)
+            cache.lookup('a')  # 'b' now least-recently used
+            cache._evict()
+        self.assertIsNotNone(cache.lookup('a'))
+        self.assertIsNone(cache.lookup('b'))
+        self.assertIsNotNone(cache.lookup('c'))
+
+    def test_responseCacheTTL(self):
+        from yfinance.data import _response_cache_ttl
+        chart = 'https://query2.finance.yahoo.com/v8/finance/chart/MSFT'
+        self.assertEqual(_response_cache_ttl(chart, {'period1': 0, 'period2': 86400}), 86400)
+        self.assertEqual(_response_cache_ttl(chart, {'range': '1d'}), 60)
+        self.assertEqual(_response_cache_ttl('https://query2.finance.yahoo.com/v10/finance/quoteSummary/MSFT', None), 300)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,215 @@
+"""
+Tests for YfData, session pool and contexts
+
+To run all tests in suite from commandline:
+   python -m unittest tests.data
+
+Specific test class:
+   python -m unittest tests.data.TestContexts
+
+"""
+from tests.context import yfinance as yf
+from tests.context import MemoryCookieCache
+
+import http.cookiejar
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from yfinance import pool
+from yfinance.data import YfData, _AuthSnapshot, get_context
+from yfinance.exceptions import YFRateLimitError
+
+class TestConsentParsing(unittest.TestCase):
+    def test_parse_csrf_consent(self):
+        content = b'''<form>
+            <input type="hidden" name="csrfToken" value="abc">
+            <input type="hidden" name="sessionId" value="xyz">
+        </form>'''
+        data = YfData()._parse_csrf_consent(content)
+        self.assertEqual(data['csrfToken'], 'abc')
+        self.assertEqual(data['sessionId'], 'xyz')
+
+    def test_parse_csrf_consent_missing(self):
+        self.assertIsNone(YfData()._parse_csrf_consent(b'<html></html>'))
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_identical_gets_share_one_request(self):
+        calls = []
+
+        def _make_request(self, url, request_method, body=None, params=None, timeout=30):
+            calls.append(url)
+            time.sleep(0.2)
+            return Mock(url=url, status_code=200)
+
+        results = []
+        with patch.object(YfData, '_make_request', _make_request):
+            threads = [threading.Thread(target=lambda: results.append(YfData().get('https://x/y', params={'a': 1})))
+                       for _ in range(5)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_error_shared_and_not_remembered(self):
+        def _make_request(self, url, request_method, body=None, params=None, timeout=30):
+            raise ValueError('boom')
+
+        with patch.object(YfData, '_make_request', _make_request):
+            with self.assertRaises(ValueError):
+                YfData().post('https://x/y', body={'q': 1})
+        self.assertEqual(YfData()._inflight._calls, {})
+
+
+class TestCrumbSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.ydata = YfData()
+        self._saved = (self.ydata._auth, self.ydata._cookie_strategy, self.ydata._crumb, self.ydata._cookie)
+        self.cookie_cache = MemoryCookieCache()
+        patcher = patch('yfinance.cache.get_cookie_cache', return_value=self.cookie_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.ydata._auth, self.ydata._cookie_strategy, self.ydata._crumb, self.ydata._cookie = self._saved
+        self.ydata._session.cookies.clear()
+
+    def _set_a3_cookie(self):
+        expires = int(time.time()) + 3600
+        a3 = http.cookiejar.Cookie(0, 'A3', 'v', None, False, '.yahoo.com', True, True, '/', True,
+                                   True, expires, False, None, None, {})
+        self.ydata._session.cookies.jar.set_cookie(a3)
+
+    def test_crumb_persisted_for_warm_start(self):
+        self._set_a3_cookie()
+        self.ydata._publish_auth('persisted', 'csrf')
+        self.assertIn('auth', self.cookie_cache.d['curlCffi'])
+
+        # Simulate new process
+        self.ydata._auth, self.ydata._crumb, self.ydata._cookie = None, None, None
+        self.ydata._cookie_strategy = 'basic'
+        self.ydata._session.cookies.clear()
+        with patch.object(YfData, '_get_cookie_and_crumb_basic', side_effect=AssertionError('handshake')), \
+                patch.object(YfData, '_get_crumb_csrf', side_effect=AssertionError('handshake')):
+            self.assertEqual(self.ydata._get_cookie_and_crumb(), ('persisted', 'csrf'))
+
+        # Rejected crumb must not survive for next process
+        with patch.object(YfData, '_get_cookie_and_crumb_basic', return_value='fresh'):
+            self.ydata._invalidate_cookie_and_crumb('persisted', 'csrf')
+        _, auth = self.ydata._lookup_cookie_curlCffi()
+        self.assertTrue(auth is None or auth.crumb != 'persisted')
+
+    def test_fast_path_skips_lock(self):
+        self.ydata._auth = _AuthSnapshot('c', 'basic', time.time() + 60)
+        with patch.object(self.ydata, '_cookie_lock', object()):
+            self.assertEqual(self.ydata._get_cookie_and_crumb(), ('c', 'basic'))
+
+    def test_expired_refreshes_once(self):
+        self.ydata._auth = _AuthSnapshot('old', 'basic', time.time() - 1)
+        self.ydata._cookie_strategy = 'basic'
+        fetches = []
+
+        def _basic(timeout):
+            fetches.append(1)
+            time.sleep(0.1)
+            return 'new'
+
+        with patch.object(YfData, '_get_cookie_and_crumb_basic', side_effect=_basic):
+            threads = [threading.Thread(target=self.ydata._get_cookie_and_crumb) for _ in range(5)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(self.ydata._auth.crumb, 'new')
+
+    def test_stale_invalidation_ignored(self):
+        # A 401 for a crumb already replaced must not toggle strategy again
+        self.ydata._auth = _AuthSnapshot('new', 'csrf', time.time() + 60)
+        self.ydata._cookie_strategy = 'csrf'
+        self.assertEqual(self.ydata._invalidate_cookie_and_crumb('old', 'basic'), ('new', 'csrf'))
+        self.assertEqual(self.ydata._cookie_strategy, 'csrf')
+
+
+class TestSessionPool(unittest.TestCase):
+    def test_borrow_reuses_and_bounds(self):
+        p = pool.SessionPool(size=2)
+        with p.borrow() as s1:
+            with p.borrow() as s2:
+                self.assertIsNot(s1, s2)
+                self.assertIs(s1.cookies.jar, s2.cookies.jar)
+        with p.borrow() as s3:
+            self.assertIn(s3, (s1, s2))
+        self.assertEqual(len(p._sessions), 2)
+
+    def test_ticker_creates_no_session(self):
+        with patch('curl_cffi.requests.Session', side_effect=AssertionError('new session')):
+            for s in ['AAA', 'BBB', 'CCC']:
+                yf.Ticker(s)
+        self.assertIsInstance(YfData()._session, pool.SessionPool)
+
+    def test_set_config_closes_replaced_pool(self):
+        old = YfData()._session
+        self.assertIsInstance(old, pool.SessionPool)
+        with patch.object(old, 'close') as close:
+            yf.set_config(session_pool_size=old.size)
+        close.assert_called_once_with()
+        new = YfData()._session
+        with patch.object(new, 'close') as close:
+            yf.set_config(transport=None)
+        close.assert_called_once_with()
+
+
+class TestContexts(unittest.TestCase):
+    def test_named_context_is_not_singleton(self):
+        a, b = get_context('test-a'), get_context('test-b')
+        self.assertIsNot(a, YfData())
+        self.assertIsNot(a._session, b._session)
+        self.assertIs(get_context('test-a'), a)
+        self.assertEqual(a._cookie_cache_key, 'curlCffi-test-a')
+        self.assertIs(yf.Ticker('MSFT', session=a)._data, a)
+
+    def test_dispatcher_round_robin_and_quarantine(self):
+        a, b = get_context('test-rr-a'), get_context('test-rr-b')
+        d = yf.Dispatcher([a, b])
+        picked = []
+        for _ in range(4):
+            with d.borrow() as ctx:
+                picked.append(ctx)
+        self.assertEqual(picked, [a, b, a, b])
+
+        a._rate_limited_at = time.time()
+        for _ in range(2):
+            with d.borrow() as ctx:
+                self.assertIs(ctx, b)
+        a._rate_limited_at = None
+
+    def test_dispatcher_run_fails_over(self):
+        a, b = get_context('test-fo-a'), get_context('test-fo-b')
+        a._rate_limited_at = b._rate_limited_at = None
+        d = yf.Dispatcher([a, b], strategy='least_loaded')
+
+        def fn(ctx):
+            if ctx is a:
+                raise YFRateLimitError()
+            return ctx.name
+
+        self.assertEqual(d.run(fn), 'test-fo-b')
+        self.assertIsNotNone(a._rate_limited_at)
+
+    def test_tickers_spread_over_least_loaded(self):
+        a, b = get_context('test-ll-a'), get_context('test-ll-b')
+        a._rate_limited_at = b._rate_limited_at = None
+        d = yf.Dispatcher([a, b], strategy='least_loaded')
+        tickers = yf.Tickers('AAA BBB CCC DDD', dispatcher=d)
+        self.assertEqual([t._data for t in tickers.tickers.values()], [a, b, a, b])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Tests for request metrics
+
+To run all tests in suite from commandline:
+   python -m unittest tests.metrics
+
+Specific test class:
+   python -m unittest tests.metrics.TestMetrics
+
+"""
+from tests.context import yfinance as yf
+from tests.context import MockServerCase
+
+import unittest
+from unittest.mock import Mock, patch
+
+from yfinance import cache, metrics
+from yfinance.data import YfData
+
+class TestMetrics(MockServerCase):
+    def test_events_and_registry(self):
+        yf.set_config(transport=self.server.transport())
+        registry = metrics.get_registry()
+        registry.reset()
+        events = []
+        metrics.add_callback(events.append)
+        self.addCleanup(metrics.remove_callback, events.append)
+
+        yf.Ticker('MOCKC').history(period='1mo')
+
+        # Timezone lookup + history
+        chart = [e for e in events if e.kind == 'request' and e.endpoint == '/v8/finance/chart/{symbol}']
+        self.assertEqual(len(chart), 2)
+        self.assertEqual(chart[-1].status, 200)
+        self.assertGreater(chart[-1].bytes, 0)
+        self.assertGreater(chart[-1].latency, 0)
+
+        samples = registry.to_dict()['yf_requests_total']
+        self.assertIn({'labels': {'endpoint': '/v8/finance/chart/{symbol}', 'status': '200'}, 'value': 2}, samples)
+        text = registry.to_prometheus()
+        self.assertIn('# TYPE yf_request_latency_seconds histogram', text)
+        self.assertIn('yf_request_latency_seconds_count{endpoint="/v8/finance/chart/{symbol}"} 2', text)
+
+    def test_cache_hit_and_miss(self):
+        events = []
+        metrics.add_callback(events.append)
+        self.addCleanup(metrics.remove_callback, events.append)
+        hit = {'url': 'u', 'status_code': 200, 'content': b'{}'}
+        with patch.object(cache._ResponseCacheDummy, 'lookup', side_effect=[hit, None]), \
+                patch.object(YfData, 'get', return_value=Mock(status_code=500)):
+            self.ydata.cache_get('https://query2.finance.yahoo.com/v7/finance/quote', {'symbols': 'A'})
+            self.ydata.cache_get('https://query2.finance.yahoo.com/v7/finance/quote', {'symbols': 'B'})
+        self.assertEqual([e.cache for e in events], ['hit', 'miss'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+"""
+Tests for download
+
+To run all tests in suite from commandline:
+   python -m unittest tests.multi
+
+Specific test class:
+   python -m unittest tests.multi.TestDownloadEngine
+
+"""
+from tests.context import yfinance as yf
+from tests.context import MockServerCase, MemoryTzCache
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+from yfinance.data import get_context
+
+class TestDownloadAsync(unittest.TestCase):
+    def test_download_async_collects_errors(self):
+        idx = pd.DatetimeIndex(['2024-01-02', '2024-01-03'], tz='America/New_York')
+        df = pd.DataFrame({'Close': [1.0, 2.0]}, index=idx)
+
+        async def _history_async(self, **kwargs):
+            if self.ticker == 'BAD':
+                raise ValueError('boom')
+            return df.copy()
+
+        with patch('yfinance.base.TickerBase.history_async', _history_async):
+            data = asyncio.run(yf.download_async(['AAA', 'BAD'], max_concurrency=1))
+
+        self.assertEqual(data.shape[0], 2)
+        self.assertIn(('Close', 'AAA'), data.columns)
+        self.assertIn(('Close', 'BAD'), data.columns)
+        self.assertTrue(data[('Close', 'BAD')].isna().all())
+
+
+class TestDownloadEngine(unittest.TestCase):
+    def test_completion_order_and_errors(self):
+        def _fetch(ticker):
+            time.sleep({'A': 0.2, 'B': 0.0, 'C': 0.1}[ticker])
+            if ticker == 'C':
+                raise ValueError('bad')
+            return ticker
+
+        results = list(yf.multi._iter_downloads(['A', 'B', 'C'], _fetch, 3))
+        self.assertEqual([r[0] for r in results], ['B', 'C', 'A'])
+        self.assertEqual(results[0][1], 'B')
+        self.assertIn('ValueError', results[1][2])
+        self.assertIn('bad', results[1][3])
+
+    def test_hung_ticker_does_not_hang_download(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def _fetch(ticker):
+            if ticker == 'HANG':
+                release.wait(10)
+            return ticker
+
+        start = time.monotonic()
+        results = {r[0]: r for r in yf.multi._iter_downloads(['HANG', 'A', 'B'], _fetch, 2, ticker_timeout=0.2)}
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertIn('TimeoutError', results['HANG'][2])
+        self.assertIsNone(results['A'][2])
+
+    def test_hung_worker_slot_not_reused(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def _fetch(ticker):
+            if ticker == 'HANG':
+                release.wait(10)
+            else:
+                time.sleep(0.1)
+            return ticker
+
+        start = time.monotonic()
+        results = {r[0]: r for r in yf.multi._iter_downloads(['HANG', 'A', 'B', 'C'], _fetch, 1, ticker_timeout=0.3)}
+        self.assertLess(time.monotonic() - start, 2)
+        self.assertIn('TimeoutError', results['HANG'][2])
+        for ticker in ('A', 'B', 'C'):
+            self.assertIsNone(results[ticker][2])
+
+    def test_deadline_cancels_unstarted(self):
+        started = []
+
+        def _fetch(ticker):
+            started.append(ticker)
+            time.sleep(0.3)
+            return ticker
+
+        results = list(yf.multi._iter_downloads([str(i) for i in range(10)], _fetch, 1, deadline=0.1))
+        self.assertEqual(len(results), 10)
+        self.assertEqual(len(started), 1)
+        self.assertTrue(all('deadline' in r[2] for r in results))
+
+
+class TestConcurrentDownloads(MockServerCase):
+    def test_downloads_in_parallel_threads_are_isolated(self):
+        yf.set_config(transport=self.server.transport())
+        idx = pd.DatetimeIndex(['2024-01-02', '2024-01-03'], tz='America/New_York')
+
+        def _history(self, **kwargs):
+            time.sleep(0.05)
+            if self.ticker.startswith('BAD'):
+                raise ValueError(self.ticker)
+            return pd.DataFrame({'Close': [1.0, 2.0]}, index=idx)
+
+        results = {}
+
+        def _run(tickers):
+            results[tickers[0]] = yf.download(tickers, progress=False, auto_adjust=True, threads=2)
+
+        with patch('yfinance.base.TickerBase.history', _history):
+            threads = [threading.Thread(target=_run, args=(t,)) for t in (['AAA', 'BAD1'], ['BBB', 'CCC'])]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(sorted(results['AAA']['Close'].columns), ['AAA', 'BAD1'])
+        self.assertTrue(results['AAA'][('Close', 'BAD1')].isna().all())
+        self.assertEqual(sorted(results['BBB']['Close'].columns), ['BBB', 'CCC'])
+        self.assertFalse(results['BBB']['Close'].isna().any().any())
+
+
+class TestDownloadIter(MockServerCase):
+    def test_yields_each_ticker(self):
+        yf.set_config(transport=self.server.transport())
+        idx = pd.DatetimeIndex(['2024-01-02', '2024-01-03'], tz='America/New_York')
+
+        def _history(self, **kwargs):
+            if self.ticker == 'BAD':
+                raise ValueError('boom')
+            return pd.DataFrame({'Close': [1.0, 2.0]}, index=idx)
+
+        with patch('yfinance.base.TickerBase.history', _history):
+            results = {t: (df, err) for t, df, err in yf.download_iter(['AAA', 'BAD', 'CCC'], threads=2)}
+            streamed = list(yf.download(['AAA'], stream=True, auto_adjust=True))
+
+        self.assertEqual(sorted(results), ['AAA', 'BAD', 'CCC'])
+        self.assertIsNone(results['AAA'][1])
+        self.assertEqual(list(results['AAA'][0]['Close']), [1.0, 2.0])
+        self.assertIn('boom', results['BAD'][1])
+        self.assertTrue(results['BAD'][0].empty)
+        self.assertEqual(streamed[0][0], 'AAA')
+
+
+class TestSinks(MockServerCase):
+    def setUp(self):
+        super().setUp()
+        yf.set_config(transport=self.server.transport())
+
+    @staticmethod
+    def _history(tkr, **kwargs):
+        if tkr.ticker == 'BAD':
+            raise ValueError('boom')
+        idx = pd.DatetimeIndex(['2024-01-02', '2024-01-03', '2024-01-04'], tz='America/New_York')
+        return pd.DataFrame({'Close': [1.0, 2.0, 3.0]}, index=idx)
+
+    def test_csv_sink_report(self):
+        with tempfile.TemporaryDirectory() as d, \
+                patch('yfinance.base.TickerBase.history', self._history):
+            report = yf.download(['AAA', 'BAD'], sink=yf.CsvSink(d), progress=False, auto_adjust=True)
+            self.assertEqual(report.loc['AAA', 'Rows'], 3)
+            self.assertTrue(pd.isna(report.loc['AAA', 'Error']))
+            self.assertEqual(report.loc['BAD', 'Rows'], 0)
+            self.assertIn('boom', report.loc['BAD', 'Error'])
+            df = pd.read_csv(os.path.join(d, 'AAA.csv'), index_col=0)
+            self.assertEqual(list(df['Close']), [1.0, 2.0, 3.0])
+
+    def test_parquet_sink(self):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            with self.assertRaises(ImportError):
+                yf.ParquetSink(tempfile.gettempdir())
+            return
+        with tempfile.TemporaryDirectory() as d, \
+                patch('yfinance.base.TickerBase.history', self._history):
+            yf.download(['AAA', 'BBB'], sink=yf.ParquetSink(d), progress=False, auto_adjust=True)
+            df = pd.read_parquet(d)
+            self.assertEqual(len(df), 6)
+
+
+class TestBulkTimezones(MockServerCase):
+    def setUp(self):
+        super().setUp()
+        self.tz_cache = MemoryTzCache()
+        patcher = patch('yfinance.cache.get_tz_cache', return_value=self.tz_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.transport = self.server.transport()
+        self.transport.persist_caches = True
+        yf.set_config(transport=self.transport)
+
+    def test_cold_download_batches_quote_requests(self):
+        tickers = [f'TZ{i}' for i in range(25)]
+        with patch('yfinance.batch._QUOTE_BATCH_SIZE', 10):
+            data = yf.download(tickers, period='5d', progress=False, threads=8, auto_adjust=True)
+        self.assertEqual(len(data['Close'].columns), 25)
+        quotes = [q for p, q in self.server.log if p.startswith('/v7/finance/quote')]
+        self.assertEqual(len(quotes), 3)
+        tz_charts = [q for p, q in self.server.log if p.startswith('/v8/finance/chart/') and q.get('range') == '1d']
+        self.assertEqual(tz_charts, [])
+        self.assertEqual(self.tz_cache.lookup_many(tickers[:3]), {t: 'America/New_York' for t in tickers[:3]})
+
+        # Warm: no more quote requests
+        yf.download(tickers[:10], period='5d', progress=False, auto_adjust=True)
+        self.assertEqual(len([p for p, q in self.server.log if p.startswith('/v7/finance/quote')]), 3)
+
+    def test_skipped_if_cache_fails_to_initialise(self):
+        broken = yf.cache._TzCache()
+        with patch('yfinance.cache.get_tz_cache', return_value=broken), \
+                patch('yfinance.cache._TzDBManager.get_database', side_effect=yf.cache._TzCacheException('no dir')), \
+                patch('yfinance.multi._fetch_quotes') as fetch:
+            yf.download(['TZA', 'TZB', 'TZC'], period='5d', progress=False, auto_adjust=True)
+        self.assertEqual(broken.initialised, 0)
+        fetch.assert_not_called()
+
+    def test_uses_download_session(self):
+        ctx = get_context('test-tz', session=self.transport)
+        d = yf.Dispatcher([ctx])
+        with patch('yfinance.multi._fetch_quotes', wraps=yf.multi._fetch_quotes) as fetch:
+            yf.download(['TZA', 'TZB'], period='5d', progress=False, auto_adjust=True, session=ctx)
+            yf.download(['TZC', 'TZD'], period='5d', progress=False, auto_adjust=True, dispatcher=d)
+        self.assertEqual([c.kwargs['session'] for c in fetch.call_args_list], [ctx, ctx])
+        self.assertEqual(len(self.tz_cache.lookup_many(['TZA', 'TZB', 'TZC', 'TZD'])), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
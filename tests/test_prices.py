@@ -1,7 +1,11 @@
 from tests.context import yfinance as yf
 from tests.context import session_gbl
+from tests.context import MockServerCase
 
+import tempfile
+import time
 import unittest
+from unittest.mock import patch
 
 import datetime as _dt
 import pytz as _tz
@@ -457,5 +461,229 @@ class TestPriceHistory(unittest.TestCase):
         dat.history(start=start, end=end, interval=interval)
 
 
+class TestHistoryStore(MockServerCase):
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        old_dir = yf.cache._HistoryDBManager.get_location()
+        yf.cache._HistoryDBManager.set_location(tmp.name)
+        self.addCleanup(yf.cache._HistoryDBManager.set_location, old_dir)
+        self.addCleanup(setattr, yf.cache._HistoryStoreManager, 'enabled', False)
+        transport = self.server.transport()
+        transport.persist_caches = True
+        yf.set_config(transport=transport)
+
+    def _chart_requests(self):
+        return [q for p, q in self.server.log if p.startswith('/v8/finance/chart/') and 'period1' in q]
+
+    def test_only_tail_fetched(self):
+        direct = yf.Ticker('MOCKS').history(start='2020-01-01', auto_adjust=False)
+        yf.set_config(history_store=True)
+        first = yf.Ticker('MOCKS').history(start='2020-01-01', auto_adjust=False)
+        self.assertTrue(direct.equals(first))
+
+        n = len(self._chart_requests())
+        again = yf.Ticker('MOCKS').history(start='2021-01-01', auto_adjust=False)
+        tail = self._chart_requests()[n:]
+        self.assertEqual(len(tail), 1)
+        self.assertGreater(int(tail[0]['period1']), time.time() - 10 * 86400)
+        self.assertTrue(first.loc['2021-01-01':].equals(again))
+
+        # Entirely within stored range: no request
+        yf.Ticker('MOCKS').history(start='2021-01-01', end='2022-01-01')
+        self.assertEqual(len(self._chart_requests()), n + 1)
+
+    def test_earlier_start_fetches_all(self):
+        yf.set_config(history_store=True)
+        yf.Ticker('MOCKS').history(start='2022-01-01')
+        n = len(self._chart_requests())
+        df = yf.Ticker('MOCKS').history(start='2020-01-01')
+        self.assertEqual(df.index[0].year, 2020)
+        self.assertLess(int(self._chart_requests()[n]['period1']), 1600000000)
+
+    def test_past_changed(self):
+        from yfinance.scrapers.history import _chart_past_changed
+        old = {'timestamp': [1, 2, 3], 'events': {'dividends': {'2': {'amount': 1, 'date': 2}}},
+               'indicators': {'quote': [{'close': [1.0, 2.0, 3.0]}], 'adjclose': [{'adjclose': [0.5, 2.0, 3.0]}]}}
+        new = {'timestamp': [2, 3, 4], 'events': {'dividends': {'2': {'amount': 1, 'date': 2}}},
+               'indicators': {'quote': [{'close': [2.0, 3.1, 4.0]}], 'adjclose': [{'adjclose': [2.0, 3.1, 4.0]}]}}
+        # Old's last bar may have been live, so may differ
+        self.assertFalse(_chart_past_changed(old, new))
+        new['events']['dividends']['4'] = {'amount': 1, 'date': 4}
+        self.assertTrue(_chart_past_changed(old, new))
+        del new['events']['dividends']['4']
+        new['indicators']['quote'][0]['close'][0] = 1.0  # split
+        self.assertTrue(_chart_past_changed(old, new))
+
+
+class TestIntradaySplit(MockServerCase):
+    def _chart_requests(self):
+        return [q for p, q in self.server.log if p.startswith('/v8/finance/chart/') and 'period1' in q]
+
+    def test_long_1m_range_split_and_merged(self):
+        yf.set_config(transport=self.server.transport())
+        dat = yf.Ticker('MOCKI')
+        df = dat.history(period='max', interval='1m')
+        requests = self._chart_requests()
+        self.assertGreater(len(requests), 1)
+        for q in requests:
+            self.assertLessEqual(int(q['period2']) - int(q['period1']), 8 * 86400)
+        self.assertTrue(df.index.is_unique)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        # Every trading day complete: 390 1m bars
+        counts = df.groupby(df.index.date).size()
+        self.assertTrue((counts.iloc[1:-1] == 390).all())
+        self.assertGreater(df.index[-1] - df.index[0], _pd.Timedelta(days=20))
+
+    def test_short_range_single_request(self):
+        yf.set_config(transport=self.server.transport())
+        yf.Ticker('MOCKI').history(start=_pd.Timestamp.now() - _pd.Timedelta(days=5), interval='1m')
+        self.assertEqual(len(self._chart_requests()), 1)
+
+    def test_range_clamped_to_available(self):
+        yf.set_config(transport=self.server.transport())
+        start = _pd.Timestamp.now() - _pd.Timedelta(days=90)
+        df = yf.Ticker('MOCKI').history(start=start, interval='5m')
+        requests = self._chart_requests()
+        self.assertEqual(len(requests), 1)
+        self.assertGreater(int(requests[0]['period1']), time.time() - 60 * 86400)
+        self.assertFalse(df.empty)
+
+    def test_merge_trading_periods(self):
+        from yfinance.scrapers.history import _merge_trading_periods
+
+        def _day(start):
+            return [{'start': start, 'end': start + 10, 'timezone': 'EST', 'gmtoffset': -18000}]
+        merged = _merge_trading_periods([[_day(1), _day(2)], [_day(2), _day(3)]])
+        self.assertEqual([d[0]['start'] for d in merged], [1, 2, 3])
+        merged = _merge_trading_periods([{'pre': [_day(0)], 'regular': [_day(1)], 'post': [_day(5)]},
+                                         {'pre': [_day(0), _day(10)], 'regular': [_day(1), _day(11)],
+                                          'post': [_day(5), _day(15)]}])
+        self.assertEqual([d[0]['start'] for d in merged['post']], [5, 15])
+
+
+class TestHistoryProfile(MockServerCase):
+    def test_profile_stages(self):
+        yf.set_config(transport=self.server.transport())
+        dat = yf.Ticker('MOCKP')
+        df = dat.history(period='1y', profile=True)
+        stages = dat.history_metadata['profile']
+        for k in ('fetch', 'decode', 'parse', 'localize', 'merge', 'adjust', 'cleanup'):
+            self.assertIn(k, stages)
+        self.assertNotIn('repair', stages)
+        self.assertEqual(stages['cleanup']['rows'], len(df))
+        self.assertGreaterEqual(stages['fetch']['wall'], stages['decode']['wall'])
+
+        seen = []
+        yf.set_config(history_profile=lambda t, st: seen.append((t, st)))
+        self.addCleanup(yf.set_config, history_profile=None)
+        dat.history(period='5d', interval='1m')
+        self.assertEqual(seen[0][0], 'MOCKP')
+        self.assertIn('prepost', seen[0][1])
+
+    def test_off_by_default(self):
+        yf.set_config(transport=self.server.transport())
+        dat = yf.Ticker('MOCKP')
+        dat.history(period='1mo')
+        self.assertNotIn('profile', dat._price_history._history_metadata)
+
+
+class TestDailyCache(MockServerCase):
+    def _chart_requests(self):
+        return [q for p, q in self.server.log if p.startswith('/v8/finance/chart/') and q.get('range') != '1d']
+
+    def test_slices_and_coarser_intervals_served_locally(self):
+        yf.set_config(transport=self.server.transport())
+        dat = yf.Ticker('MOCKD')
+        divs = dat.get_dividends()
+        self.assertGreater(len(divs), 0)
+        n = len(self._chart_requests())
+
+        df = dat.history(start='2024-01-01', end='2025-01-01', auto_adjust=False, keepna=True)
+        ref = yf.Ticker('MOCKD').history(start='2024-01-01', end='2025-01-01', auto_adjust=False, keepna=True)
+        _pd.testing.assert_frame_equal(df, ref)
+        adj = dat.history(start='2024-01-01', end='2025-01-01', actions=False)
+        ref = yf.Ticker('MOCKD').history(start='2024-01-01', end='2025-01-01', actions=False)
+        _pd.testing.assert_frame_equal(adj, ref)
+
+        self.assertGreater(len(dat.history(period='1y')), 240)
+
+        weekly = dat.history(start='2024-01-01', end='2025-01-01', interval='1wk', auto_adjust=False)
+        fetched = yf.Ticker('MOCKD').history(start='2024-01-01', end='2025-01-01', interval='1wk', auto_adjust=False)
+        _pd.testing.assert_index_equal(weekly.columns, fetched.columns)
+        _pd.testing.assert_index_equal(weekly.index, fetched.index)
+        daily = df.loc['2024-01-01':'2024-12-31']
+        self.assertTrue((weekly.index.dayofweek == 0).all())
+        week = daily[(daily.index >= weekly.index[1]) & (daily.index < weekly.index[2])]
+        self.assertEqual(weekly['Close'].iloc[1], week['Close'].iloc[-1])
+        self.assertAlmostEqual(weekly['Dividends'].sum(), daily['Dividends'].sum())
+        self.assertEqual(len(self._chart_requests()), n + 3)  # only the three references
+
+    def test_open_range_expires(self):
+        yf.set_config(transport=self.server.transport())
+        dat = yf.Ticker('MOCKD')
+        dat.history(period='1y')
+        n = len(self._chart_requests())
+        dat.history(period='6mo')
+        self.assertEqual(len(self._chart_requests()), n)
+        with patch('yfinance.scrapers.history._DAILY_CACHE_TTL', 0):
+            dat.history(period='6mo')
+        self.assertEqual(len(self._chart_requests()), n + 1)
+
+
+class TestCustomIntervals(MockServerCase):
+    def _chart_intervals(self):
+        return [q['interval'] for p, q in self.server.log
+                if p.startswith('/v8/finance/chart/') and q.get('range') != '1d']
+
+    def test_resampled_from_base_interval(self):
+        yf.set_config(transport=self.server.transport())
+        dat = yf.Ticker('MOCKI')
+        base = dat.history(period='5d', interval='5m')
+        df = dat.history(period='5d', interval='10m')
+        self.assertEqual(self._chart_intervals(), ['5m', '5m'])
+        self.assertEqual(df.index.name, 'Datetime')
+        self.assertEqual(df.index.dtype, base.index.dtype)
+        self.assertEqual(len(df), len(base) // 2)
+        bar = base.iloc[2:4]
+        self.assertEqual(df.index[1], bar.index[0])
+        self.assertEqual(df['Open'].iloc[1], bar['Open'].iloc[0])
+        self.assertEqual(df['High'].iloc[1], bar['High'].max())
+        self.assertEqual(df['Low'].iloc[1], bar['Low'].min())
+        self.assertEqual(df['Close'].iloc[1], bar['Close'].iloc[-1])
+        self.assertEqual(df['Volume'].iloc[1], bar['Volume'].sum())
+
+    def test_bars_aligned_to_session_open(self):
+        yf.set_config(transport=self.server.transport())
+        df = yf.Ticker('MOCKI').history(period='5d', interval='4h')
+        self.assertEqual(self._chart_intervals(), ['1h'])
+        times = sorted({t.strftime('%H:%M') for t in df.index})
+        self.assertEqual(times, ['09:30', '13:30'])
+        self.assertEqual(df.index.dtype, yf.Ticker('MOCKI').history(period='5d', interval='1h').index.dtype)
+        self.assertTrue((df.groupby(df.index.date).size() == 2).all())
+
+
+class TestAdjustmentFactor(MockServerCase):
+    def test_views_from_one_fetch(self):
+        yf.set_config(transport=self.server.transport())
+        raw = yf.Ticker('MOCKF').history(period='2y', adj_factor=True)
+        self.assertNotIn('Adj Close', raw.columns)
+        self.assertIn('Adj Factor', raw.columns)
+        self.assertLess(raw['Adj Factor'].iloc[0], 1)
+
+        ref = yf.Ticker('MOCKF').history(period='2y', auto_adjust=False)
+        _pd.testing.assert_series_equal(raw['Close'], ref['Close'])
+        for fn, kwargs in ((yf.utils.auto_adjust, {}), (yf.utils.back_adjust, {'auto_adjust': False, 'back_adjust': True})):
+            ref = yf.Ticker('MOCKF').history(period='2y', **kwargs)
+            _pd.testing.assert_frame_equal(fn(raw), ref, check_exact=False, rtol=1e-12)
+
+    def test_factor_not_rounded(self):
+        yf.set_config(transport=self.server.transport())
+        raw = yf.Ticker('MOCKF').history(period='2y', adj_factor=True, rounding=True)
+        self.assertNotEqual(raw['Adj Factor'].iloc[0], round(raw['Adj Factor'].iloc[0], 2))
+        self.assertEqual(raw['Close'].iloc[0], round(raw['Close'].iloc[0], 2))
+
+
 if __name__ == '__main__':
     unittest.main()
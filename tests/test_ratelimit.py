@@ -0,0 +1,68 @@
+"""
+Tests for rate limiter
+
+To run all tests in suite from commandline:
+   python -m unittest tests.ratelimit
+
+Specific test class:
+   python -m unittest tests.ratelimit.TestRateLimiter
+
+"""
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from yfinance import ratelimit
+from yfinance.data import YfData
+from yfinance.exceptions import YFRateLimitError
+
+class TestRateLimiter(unittest.TestCase):
+    def test_aimd(self):
+        limiter = ratelimit.HostRateLimiter('h', rate=10, max_rate=50, min_rate=0.2, max_concurrency=32)
+        limiter.acquire()
+        limiter.release(200)
+        self.assertGreater(limiter.rate, 10)
+        limiter.acquire()
+        limiter.release(429)
+        self.assertLess(limiter.rate, 6)
+        self.assertEqual(int(limiter.concurrency), 16)
+
+    def test_unpaced_until_429(self):
+        limiter = ratelimit.HostRateLimiter('h', rate=None, max_rate=50, min_rate=0.2, max_concurrency=8)
+        start = time.monotonic()
+        for _ in range(8):
+            limiter.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+        for _ in range(7):
+            limiter.release(200)
+        self.assertEqual(int(limiter.concurrency), 8)
+        limiter.release(429)
+        self.assertEqual(limiter.rate, 25)
+        self.assertEqual(int(limiter.concurrency), 4)
+        start = time.monotonic()
+        limiter.acquire()
+        limiter.release(None)
+        self.assertGreaterEqual(time.monotonic() - start, 0.03)
+
+    def test_token_bucket_paces(self):
+        limiter = ratelimit.HostRateLimiter('h', rate=20, max_rate=20, min_rate=20, max_concurrency=32)
+        limiter._tokens = 0.0
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.acquire()
+            limiter.release(None)
+        self.assertGreaterEqual(time.monotonic() - start, 0.14)
+
+    def test_retry_then_raise_on_429(self):
+        session = Mock()
+        session.get.return_value = Mock(status_code=429, headers={'Retry-After': '0'}, content=b'')
+        ydata = YfData()
+        with patch.object(YfData, '_get_cookie_and_crumb', return_value=(None, 'basic')):
+            with patch.dict(ratelimit._config, retries=2):
+                with self.assertRaises(YFRateLimitError):
+                    ydata._make_request('https://h/429', request_method=session.get)
+        self.assertEqual(session.get.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for transports and mock server
+
+To run all tests in suite from commandline:
+   python -m unittest tests.transport
+
+Specific test class:
+   python -m unittest tests.transport.TestTransports
+
+"""
+from tests.context import yfinance as yf
+from tests.context import MockServerCase
+
+import os
+import tempfile
+import unittest
+
+from yfinance.exceptions import YFException
+from yfinance.transport import RecordTransport, ReplayTransport
+
+class TestTransports(MockServerCase):
+    def test_history_from_mock_server(self):
+        yf.set_config(transport=self.server.transport())
+        df = yf.Ticker('MOCKA').history(period='1y')
+        self.assertGreater(len(df), 200)
+        self.assertEqual(str(df.index.tz), 'America/New_York')
+        self.assertGreater(df['Dividends'].sum(), 0)
+        # Deterministic
+        df2 = yf.Ticker('MOCKA').history(period='1y')
+        self.assertTrue(df['Close'].equals(df2['Close']))
+
+    def test_download_from_mock_server(self):
+        yf.set_config(transport=self.server.transport())
+        data = yf.download(['AAA', 'BBB', 'CCC'], period='1mo', progress=False, auto_adjust=True)
+        self.assertEqual(sorted(data['Close'].columns), ['AAA', 'BBB', 'CCC'])
+        self.assertFalse(data['Close'].isna().all().any())
+
+    def test_record_then_replay(self):
+        with tempfile.TemporaryDirectory() as d:
+            yf.set_config(transport=RecordTransport(d, session=self.server.transport()))
+            recorded = yf.Ticker('MOCKB').history(period='1mo')
+            self.assertTrue(len(os.listdir(d)) > 0)
+
+            self.server.stop()
+            yf.set_config(transport=ReplayTransport(d))
+            self.ydata._auth, self.ydata._crumb, self.ydata._cookie = None, None, None
+            replayed = yf.Ticker('MOCKB').history(period='1mo')
+            self.assertTrue(recorded.equals(replayed))
+
+            with self.assertRaises(YFException):
+                self.ydata._session.get('https://query2.finance.yahoo.com/v8/finance/chart/NOPE')
+
+class TestTransportCaches(MockServerCase):
+    # Real caches, in a temporary folder
+    patch_caches = False
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+        old_dir = yf.cache._TzDBManager.get_location()
+        yf.cache.set_cache_location(self.cache_dir)
+        self.addCleanup(yf.cache.set_cache_location, old_dir)
+        self.addCleanup(setattr, yf.cache._HistoryStoreManager, 'enabled', False)
+        super().setUp()
+        self.ydata._auth, self.ydata._crumb, self.ydata._cookie = None, None, None
+
+    def test_transport_skips_disk_caches(self):
+        yf.set_config(transport=self.server.transport(), history_store=True)
+        yf.Ticker('MOCKT').history(start='2020-01-01', end='2021-01-01')
+        yf.download(['MOCKU', 'MOCKV'], start='2020-01-01', end='2021-01-01', progress=False, auto_adjust=True)
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_opt_in(self):
+        transport = self.server.transport()
+        transport.persist_caches = True
+        yf.set_config(transport=transport)
+        yf.Ticker('MOCKT').history(start='2020-01-01', end='2021-01-01')
+        self.assertEqual(yf.cache.get_tz_cache().lookup('MOCKT'), 'America/New_York')
+
+
+if __name__ == '__main__':
+    unittest.main()
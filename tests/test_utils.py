@@ -15,7 +15,8 @@ import pandas as pd
 
 import unittest
 
-from yfinance.utils import is_valid_period_format, _dts_in_same_interval, _parse_user_dt
+from yfinance.utils import is_valid_period_format, _dts_in_same_interval, _parse_user_dt, parse_quotes, parse_actions, \
+    session_bins, safe_merge_dfs
 
 
 class TestPandas(unittest.TestCase):
@@ -182,6 +183,92 @@ class TestDateIntervalCheck(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.assertEqual(_parse_user_dt(float(epoch), exchange_tz), expected)
 
+
+class TestParseChart(unittest.TestCase):
+    def _chart(self, timestamps, volume):
+        n = len(timestamps)
+        closes = [10.0 + i for i in range(n)]
+        closes[1] = None
+        return {'timestamp': timestamps,
+                'indicators': {'quote': [{'open': closes, 'high': closes, 'low': closes, 'close': closes,
+                                          'volume': volume}],
+                               'adjclose': [{'adjclose': closes}]}}
+
+    def test_parse_quotes(self):
+        df = parse_quotes(self._chart([30, 10, 20], [1, 2, 3]))
+        self.assertEqual(list(df.index), list(pd.to_datetime([10, 20, 30], unit='s')))
+        self.assertEqual(list(df['Volume']), [2, 3, 1])
+        self.assertEqual(df['Volume'].dtype, 'int64')
+        self.assertTrue(pd.isna(df.loc[pd.Timestamp(10, unit='s'), 'Close']))
+        self.assertEqual(df['Open'].dtype, 'float64')
+
+        df = parse_quotes(self._chart([10, 20, 30], [1, None, 3]))
+        self.assertEqual(df['Volume'].dtype, 'float64')
+        self.assertEqual(df.index.dtype, pd.to_datetime([0], unit='s').dtype)
+
+    def test_parse_actions(self):
+        data = {'events': {'dividends': {'20': {'amount': 0.5, 'date': 20, 'currency': ''},
+                                         '10': {'amount': 0.25, 'date': 10, 'currency': ''}},
+                           'splits': {'30': {'date': 30, 'numerator': 3, 'denominator': 2, 'splitRatio': '3:2'}}}}
+        dividends, splits, capital_gains = parse_actions(data)
+        self.assertEqual(list(dividends.columns), ['Dividends'])
+        self.assertEqual(list(dividends['Dividends']), [0.25, 0.5])
+        self.assertEqual(splits['Stock Splits'].iloc[0], 1.5)
+        self.assertTrue(capital_gains.empty)
+
+
+class TestSessionBins(unittest.TestCase):
+    def test_counted_from_session_open(self):
+        tz = 'America/New_York'
+        idx = pd.DatetimeIndex(['2024-01-02 08:45', '2024-01-02 09:30', '2024-01-02 13:29', '2024-01-02 13:30',
+                                '2024-01-02 15:59', '2024-01-03 01:00'], name='Datetime').tz_localize(tz)
+        tps = pd.DataFrame({'start': [pd.Timestamp('2024-01-02 09:30', tz=tz)],
+                            'end': [pd.Timestamp('2024-01-02 16:00', tz=tz)]},
+                           index=pd.DatetimeIndex(['2024-01-02'], name='Date').tz_localize(tz))
+        bins = session_bins(idx, '4h', tps)
+        expected = pd.DatetimeIndex(['2024-01-02 05:30', '2024-01-02 09:30', '2024-01-02 09:30', '2024-01-02 13:30',
+                                     '2024-01-02 13:30', '2024-01-03 00:00'], name='Datetime').tz_localize(tz)
+        self.assertTrue(bins.equals(expected))
+        self.assertEqual(bins.name, 'Datetime')
+
+
+class TestSafeMergeDfs(unittest.TestCase):
+    tz = 'America/New_York'
+
+    def _prices(self, index):
+        index = pd.DatetimeIndex(index).tz_localize(self.tz)
+        data = dict.fromkeys(['Open', 'High', 'Low', 'Close', 'Adj Close'], 1.0)
+        data['Volume'] = 1
+        return pd.DataFrame(data, index=index)
+
+    def _events(self, **cols):
+        frames = [pd.DataFrame({c: list(v.values())}, index=pd.DatetimeIndex(list(v.keys())).tz_localize(self.tz))
+                  for c, v in cols.items()]
+        return pd.concat(frames)
+
+    def test_daily_all_event_types(self):
+        df = self._prices(['2024-01-02', '2024-01-03', '2024-01-04'])
+        events = self._events(Dividends={'2024-01-03': 0.5, '2024-01-05': 0.25},
+                              **{'Stock Splits': {'2024-01-03': 2.0, '2024-01-03 00:00:01': 3.0}})
+        merged = safe_merge_dfs(df, events, '1d')
+        self.assertEqual(list(merged.columns), list(df.columns) + ['Dividends', 'Stock Splits'])
+        self.assertEqual(len(merged), 4)  # out-of-range dividend gets a row of NaN prices
+        self.assertTrue(pd.isna(merged['Close'].iloc[-1]))
+        self.assertEqual(merged['Volume'].iloc[-1], 0)
+        self.assertEqual(merged['Dividends'].fillna(0).tolist(), [0, 0.5, 0, 0.25])
+        self.assertEqual(merged['Stock Splits'].fillna(0).tolist(), [0, 6.0, 0, 0])
+
+    def test_intraday_event_before_open(self):
+        df = self._prices(['2024-01-02 09:30', '2024-01-02 10:30', '2024-01-03 09:30'])
+        events = self._events(Dividends={'2024-01-03 00:00': 0.5, '2024-01-05 00:00': 0.25})
+        merged = safe_merge_dfs(df, events, '60m')
+        self.assertEqual(merged['Dividends'].fillna(0).tolist(), [0, 0, 0.5])
+
+        events = self._events(Dividends={'2024-01-05 00:00': 0.25})
+        merged = safe_merge_dfs(df, events, '60m')
+        self.assertEqual(merged['Dividends'].tolist(), [0, 0, 0])
+
+
 if __name__ == "__main__":
     unittest.main()
 
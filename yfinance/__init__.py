@@ -24,14 +24,20 @@ from .search import Search
 from .lookup import Lookup
 from .ticker import Ticker
 from .tickers import Tickers
-from .multi import download
+from .multi import download, download_async, download_iter
+from .batch import quotes, spark
 from .live import WebSocket, AsyncWebSocket
 from .utils import enable_debug_mode
 from .cache import set_tz_cache_location
 from .domain.sector import Sector
 from .domain.industry import Industry
 from .domain.market import Market
-from .data import YfData
+from .data import YfData, get_context
+from .dispatch import Dispatcher
+from .sinks import ParquetSink, CsvSink
+from . import cache, pool, ratelimit
+from . import metrics as _metrics
+from .scrapers import history as _price_history
 
 from .screener.query import EquityQuery, FundQuery
 from .screener.screener import screen, PREDEFINED_SCREENER_QUERIES
@@ -42,13 +48,49 @@ __author__ = "Ran Aroussi"
 import warnings
 warnings.filterwarnings('default', category=DeprecationWarning, module='^yfinance')
 
-__all__ = ['download', 'Market', 'Search', 'Lookup', 'Ticker', 'Tickers', 'enable_debug_mode', 'set_tz_cache_location', 'Sector', 'Industry', 'WebSocket', 'AsyncWebSocket']
+__all__ = ['download', 'download_async', 'download_iter', 'quotes', 'spark', 'ParquetSink', 'CsvSink', 'Dispatcher', 'get_context', 'Market', 'Search', 'Lookup', 'Ticker', 'Tickers', 'enable_debug_mode', 'set_tz_cache_location', 'Sector', 'Industry', 'WebSocket', 'AsyncWebSocket']
 # screener stuff:
 __all__ += ['EquityQuery', 'FundQuery', 'screen', 'PREDEFINED_SCREENER_QUERIES']
 
 # Config stuff:
 _NOTSET=object()
-def set_config(proxy=_NOTSET):
+def _swap_session(session):
+    old = YfData()._session
+    YfData(session=session)
+    if isinstance(old, pool.SessionPool) and old is not session:
+        # Pool was created here, so release its curl handles
+        old.close()
+
+
+def set_config(proxy=_NOTSET, rate_limit=_NOTSET, max_concurrency=_NOTSET, retries=_NOTSET,
+               session_pool_size=_NOTSET, http2=_NOTSET, dns_cache_timeout=_NOTSET, transport=_NOTSET,
+               metrics=_NOTSET, history_store=_NOTSET, history_profile=_NOTSET):
     if proxy is not _NOTSET:
         YfData(proxy=proxy)
+    if transport is not _NOTSET:
+        # None restores the default session pool
+        _swap_session(transport if transport is not None else pool.SessionPool())
+    if session_pool_size is not _NOTSET or http2 is not _NOTSET or dns_cache_timeout is not _NOTSET:
+        pool.configure(size=None if session_pool_size is _NOTSET else session_pool_size,
+                       http2=None if http2 is _NOTSET else http2,
+                       dns_cache_timeout=None if dns_cache_timeout is _NOTSET else dns_cache_timeout)
+        if isinstance(YfData()._session, pool.SessionPool):
+            # Replace pool, unless user supplied own session
+            _swap_session(pool.SessionPool())
+    if rate_limit is not _NOTSET:
+        if rate_limit is None or rate_limit is False:
+            ratelimit.configure(enabled=False)
+        else:
+            ratelimit.configure(enabled=True, rate=rate_limit)
+    if max_concurrency is not _NOTSET:
+        ratelimit.configure(max_concurrency=max_concurrency)
+    if retries is not _NOTSET:
+        ratelimit.configure(retries=retries)
+    if metrics is not _NOTSET:
+        _metrics.configure(enabled=metrics)
+    if history_store is not _NOTSET:
+        cache._HistoryStoreManager.enabled = bool(history_store)
+    if history_profile is not _NOTSET:
+        # Callable(ticker, stages) to profile every history(), None to stop
+        _price_history._profile_hook = history_profile
 __all__ += ["set_config"]
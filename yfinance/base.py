@@ -31,9 +31,9 @@ import pandas as pd
 from curl_cffi import requests
 
 
-from . import utils, cache
+from . import utils
 from .const import _MIC_TO_YAHOO_SUFFIX
-from .data import YfData
+from .data import YfData, AsyncYfData
 from .exceptions import YFEarningsDateMissing, YFRateLimitError
 from .live import WebSocket
 from .scrapers.analysis import Analysis
@@ -63,7 +63,7 @@ class TickerBase:
                 (MIC = market identifier code)
 
             session (requests.Session, optional):
-                Custom requests session.
+                Custom curl_cffi session. Default is yfinance's shared session pool.
         """        
         if isinstance(ticker, tuple):
             if len(ticker) != 2:
@@ -81,7 +81,8 @@ class TickerBase:
                 ticker = base_symbol
 
         self.ticker = ticker.upper()
-        self.session = session or requests.Session(impersonate="chrome")
+        # None = use YfData's shared session pool
+        self.session = session
         self._tz = None
 
         self._isin = None
@@ -105,7 +106,7 @@ class TickerBase:
         # accept isin as ticker
         if utils.is_isin(self.ticker):
             isin = self.ticker
-            c = cache.get_isin_cache()
+            c = self._data._isin_cache()
             self.ticker = c.lookup(isin)
             if not self.ticker:
                 self.ticker = utils.get_ticker_by_isin(isin)
@@ -131,6 +132,13 @@ class TickerBase:
     def history(self, *args, **kwargs) -> pd.DataFrame:
         return self._lazy_load_price_history().history(*args, **kwargs)
 
+    async def history_async(self, *args, **kwargs) -> pd.DataFrame:
+        """
+        Asyncio variant of :meth:`history`, same arguments.
+        """
+        price_history = await self._lazy_load_price_history_async()
+        return await price_history.history_async(*args, **kwargs)
+
     # ------------------------
 
     def _lazy_load_price_history(self):
@@ -138,39 +146,76 @@ class TickerBase:
             self._price_history = PriceHistory(self._data, self.ticker, self._get_ticker_tz(timeout=10))
         return self._price_history
 
-    def _get_ticker_tz(self, timeout):
-        if self._tz is not None:
-            return self._tz
-        c = cache.get_tz_cache()
+    async def _lazy_load_price_history_async(self):
+        if self._price_history is None:
+            tz = await self._get_ticker_tz_async(timeout=10)
+            self._price_history = PriceHistory(self._data, self.ticker, tz)
+        return self._price_history
+
+    def _lookup_ticker_tz(self):
+        c = self._data._tz_cache()
         tz = c.lookup(self.ticker)
 
         if tz and not utils.is_valid_timezone(tz):
             # Clear from cache and force re-fetch
             c.store(self.ticker, None)
             tz = None
+        return tz
 
-        if tz is None:
-            tz = self._fetch_ticker_tz(timeout)
-            if tz is None:
-                # _fetch_ticker_tz works in 99.999% of cases.
-                # For rare fail get from info.
-                global _tz_info_fetch_ctr
-                if _tz_info_fetch_ctr < 2:
-                    # ... but limit. If _fetch_ticker_tz() always
-                    # failing then bigger problem.
-                    _tz_info_fetch_ctr += 1
-                    for k in ['exchangeTimezoneName', 'timeZoneFullName']:
-                        if k in self.info:
-                            tz = self.info[k]
-                            break
-            if utils.is_valid_timezone(tz):
-                c.store(self.ticker, tz)
-            else:
-                tz = None
-
+    def _store_ticker_tz(self, tz):
+        if utils.is_valid_timezone(tz):
+            self._data._tz_cache().store(self.ticker, tz)
+        else:
+            tz = None
         self._tz = tz
         return tz
 
+    def _get_ticker_tz(self, timeout):
+        if self._tz is not None:
+            return self._tz
+        tz = self._lookup_ticker_tz()
+        if tz is not None:
+            self._tz = tz
+            return tz
+
+        tz = self._fetch_ticker_tz(timeout)
+        if tz is None:
+            # _fetch_ticker_tz works in 99.999% of cases.
+            # For rare fail get from info.
+            global _tz_info_fetch_ctr
+            if _tz_info_fetch_ctr < 2:
+                # ... but limit. If _fetch_ticker_tz() always
+                # failing then bigger problem.
+                _tz_info_fetch_ctr += 1
+                for k in ['exchangeTimezoneName', 'timeZoneFullName']:
+                    if k in self.info:
+                        tz = self.info[k]
+                        break
+
+        return self._store_ticker_tz(tz)
+
+    async def _get_ticker_tz_async(self, timeout):
+        if self._tz is not None:
+            return self._tz
+        tz = self._lookup_ticker_tz()
+        if tz is not None:
+            self._tz = tz
+            return tz
+
+        tz = await self._fetch_ticker_tz_async(timeout)
+        if tz is None:
+            # Rare, see _get_ticker_tz()
+            global _tz_info_fetch_ctr
+            if _tz_info_fetch_ctr < 2:
+                _tz_info_fetch_ctr += 1
+                info = await self.get_info_async()
+                for k in ['exchangeTimezoneName', 'timeZoneFullName']:
+                    if k in info:
+                        tz = info[k]
+                        break
+
+        return self._store_ticker_tz(tz)
+
     @utils.log_indent_decorator
     def _fetch_ticker_tz(self, timeout):
         # Query Yahoo for fast price data just to get returned timezone
@@ -190,20 +235,38 @@ class TickerBase:
         except Exception as e:
             logger.error(f"Failed to get ticker '{self.ticker}' reason: {e}")
             return None
+        return self._parse_ticker_tz(data)
+
+    async def _fetch_ticker_tz_async(self, timeout):
+        params = {"range": "1d", "interval": "1d"}
+        url = f"{_BASE_URL_}/v8/finance/chart/{self.ticker}"
+
+        try:
+            data = await AsyncYfData().cache_get(url=url, params=params, timeout=timeout)
+            data = data.json()
+        except YFRateLimitError:
+            # Must propagate this
+            raise
+        except Exception as e:
+            utils.get_yf_logger().error(f"Failed to get ticker '{self.ticker}' reason: {e}")
+            return None
+        return self._parse_ticker_tz(data)
+
+    def _parse_ticker_tz(self, data):
+        logger = utils.get_yf_logger()
+        error = data.get('chart', {}).get('error', None)
+        if error:
+            # explicit error from yahoo API
+            logger.debug(f"Got error from yahoo api for ticker {self.ticker}, Error: {error}")
         else:
-            error = data.get('chart', {}).get('error', None)
-            if error:
-                # explicit error from yahoo API
-                logger.debug(f"Got error from yahoo api for ticker {self.ticker}, Error: {error}")
-            else:
-                try:
-                    return data["chart"]["result"][0]["meta"]["exchangeTimezoneName"]
-                except Exception as err:
-                    logger.error(f"Could not get exchangeTimezoneName for ticker '{self.ticker}' reason: {err}")
-                    logger.debug("Got response: ")
-                    logger.debug("-------------")
-                    logger.debug(f" {data}")
-                    logger.debug("-------------")
+            try:
+                return data["chart"]["result"][0]["meta"]["exchangeTimezoneName"]
+            except Exception as err:
+                logger.error(f"Could not get exchangeTimezoneName for ticker '{self.ticker}' reason: {err}")
+                logger.debug("Got response: ")
+                logger.debug("-------------")
+                logger.debug(f" {data}")
+                logger.debug("-------------")
         return None
 
     def get_recommendations(self, proxy=_SENTINEL_, as_dict=False):
@@ -329,6 +392,12 @@ class TickerBase:
         data = self._quote.info
         return data
 
+    async def get_info_async(self) -> dict:
+        """
+        Asyncio variant of :meth:`get_info`.
+        """
+        return await self._quote.info_async()
+
     def get_fast_info(self, proxy=_SENTINEL_):
         if proxy is not _SENTINEL_:
             warnings.warn("Set proxy via new config function: yf.set_config(proxy=proxy)", DeprecationWarning, stacklevel=2)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Endpoints that answer for many symbols per request.
+"""
+
+import concurrent.futures as _futures
+
+import pandas as pd
+
+from . import utils
+from .const import _QUERY1_URL_
+from .data import YfData
+
+# Symbols per v7 quote request. Yahoo accepts more, but URL length is the limit.
+_QUOTE_BATCH_SIZE = 200
+# Yahoo rejects spark requests for more symbols than this
+_SPARK_BATCH_SIZE = 20
+_MAX_BATCH_THREADS = 4
+
+# v7 quote fields holding epoch seconds, besides those ending in Time/Timestamp*
+_QUOTE_DATE_FIELDS = ('dividendDate', 'exDividendDate')
+
+
+def _parse_symbols(symbols):
+    if isinstance(symbols, str):
+        symbols = symbols.replace(',', ' ').split()
+    return list(dict.fromkeys(s.upper() for s in symbols))
+
+
+def _batches(symbols, size):
+    return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+
+def _map_batches(fetch, batches):
+    """
+    Run fetch(batch) for each batch concurrently. Yield (batch, result, error)
+    in submission order.
+    """
+    if not batches:
+        return
+    with _futures.ThreadPoolExecutor(min(len(batches), _MAX_BATCH_THREADS)) as ex:
+        futures = [ex.submit(fetch, b) for b in batches]
+        for batch, f in zip(batches, futures):
+            try:
+                yield batch, f.result(), None
+            except Exception as e:
+                yield batch, None, e
+
+
+def _fetch_quotes(symbols, fields=None, timeout=10, session=None):
+    """
+    Raw v7 quote dicts for symbols, batched. Symbols Yahoo doesn't know are
+    missing from the result. Return (quotes, {symbol: exception}) for failed batches.
+    """
+    data = YfData(session=session)
+    params = {"formatted": "false"}
+    if fields is not None:
+        if not isinstance(fields, str):
+            fields = ",".join(fields)
+        params["fields"] = fields
+
+    def _fetch(batch):
+        result = data.get_raw_json(f"{_QUERY1_URL_}/v7/finance/quote",
+                                   params=dict(params, symbols=",".join(batch)), timeout=timeout)
+        return result.get("quoteResponse", {}).get("result") or []
+
+    quotes, errors = [], {}
+    for batch, result, err in _map_batches(_fetch, _batches(symbols, _QUOTE_BATCH_SIZE)):
+        if err is not None:
+            errors.update({s: err for s in batch})
+        else:
+            quotes.extend(q for q in result if "symbol" in q)
+    return quotes, errors
+
+
+def _is_epoch_field(name):
+    return name.endswith('Time') or 'Timestamp' in name or name in _QUOTE_DATE_FIELDS
+
+
+def _quotes_to_df(quotes, symbols):
+    df = pd.DataFrame.from_records(quotes)
+    if df.empty:
+        return pd.DataFrame(index=pd.Index(symbols, name='Symbol'))
+    df['symbol'] = df['symbol'].str.upper()
+    df = df.drop_duplicates('symbol').set_index('symbol').reindex(symbols)
+    df.index.name = 'Symbol'
+    df = df.infer_objects()
+    for c in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[c]) or pd.api.types.is_bool_dtype(df[c]):
+            continue
+        if c == 'firstTradeDateMilliseconds':
+            df[c] = pd.to_datetime(df[c], unit='ms', utc=True)
+        elif _is_epoch_field(c):
+            df[c] = pd.to_datetime(df[c], unit='s', utc=True)
+    return df
+
+
+def quotes(symbols, fields=None, timeout=10, raise_errors=False, session=None) -> pd.DataFrame:
+    """
+    Current quote for many symbols at once, from Yahoo's v7 quote endpoint.
+    Symbols are sent 200 per request, requests run concurrently.
+
+    Args:
+        symbols: list of symbols, or a string separated by spaces/commas
+        fields: only fetch these fields, e.g. ['regularMarketPrice', 'currency'].
+            Default is everything Yahoo returns.
+        timeout: request timeout in seconds
+        raise_errors: raise if any request failed, rather than logging it
+        session: optional curl_cffi session or YfData context, like Ticker
+
+    Returns:
+        DataFrame indexed by symbol in the order given, one column per field.
+        Times are UTC datetimes. Symbols without a quote have all-NaN rows.
+
+    Example:
+        >>> yf.quotes(['MSFT', 'AAPL'], fields=['regularMarketPrice'])
+    """
+    symbols = _parse_symbols(symbols)
+    found, errors = _fetch_quotes(symbols, fields, timeout, session)
+    if errors:
+        if raise_errors:
+            raise next(iter(errors.values()))
+        utils.get_yf_logger().error(f"{len(errors)} symbols failed to fetch quotes: {next(iter(errors.values()))!r}")
+    df = _quotes_to_df(found, symbols)
+    got = {q['symbol'].upper() for q in found}
+    missing = [s for s in symbols if s not in errors and s not in got]
+    if missing:
+        utils.get_yf_logger().error(f"No quote found for {len(missing)} symbols: {', '.join(missing[:20])}")
+    return df
+
+
+def _spark_series(item, daily):
+    symbol = item['symbol'].upper()
+    response = (item.get('response') or [{}])[0]
+    ts = response.get('timestamp') or []
+    close = ((response.get('indicators') or {}).get('quote') or [{}])[0].get('close') or []
+    idx = pd.to_datetime(ts, unit='s', utc=True)
+    if daily:
+        # Like download(): one row per exchange date, not per UTC instant
+        tz = (response.get('meta') or {}).get('exchangeTimezoneName')
+        if tz:
+            idx = idx.tz_convert(tz)
+        idx = idx.tz_localize(None).normalize()
+    s = pd.Series(close, index=idx, dtype='float64', name=symbol)
+    # Live bar can share a date with the last daily bar
+    return s[~s.index.duplicated(keep='last')]
+
+
+def spark(symbols, period='1mo', interval='1d', timeout=10, raise_errors=False, session=None) -> pd.DataFrame:
+    """
+    Close prices of many symbols from Yahoo's spark endpoint, 20 symbols per
+    request, requests run concurrently. Responses carry only timestamps and
+    closes, so this is much lighter than download() when that is all you need.
+
+    Args:
+        symbols: list of symbols, or a string separated by spaces/commas
+        period: 1d,5d,1mo,3mo,6mo,1y,2y,5y,10y,ytd,max
+        interval: 1m,2m,5m,15m,30m,60m,90m,1h,1d,5d,1wk,1mo,3mo
+        timeout: request timeout in seconds
+        raise_errors: raise if any request failed, rather than logging it
+        session: optional curl_cffi session or YfData context, like Ticker
+
+    Returns:
+        DataFrame of close prices, one column per symbol in the order given.
+        Daily and longer intervals are indexed by exchange date, intraday by UTC
+        datetime. Prices are not adjusted for dividends or splits.
+
+    Example:
+        >>> yf.spark(['MSFT', 'AAPL'], period='5d', interval='1h')
+    """
+    symbols = _parse_symbols(symbols)
+    daily = interval[-1] not in ('m', 'h')
+    data = YfData(session=session)
+    params = {"range": period, "interval": interval}
+
+    def _fetch(batch):
+        result = data.get_raw_json(f"{_QUERY1_URL_}/v7/finance/spark",
+                                   params=dict(params, symbols=",".join(batch)), timeout=timeout)
+        return (result.get("spark") or {}).get("result") or []
+
+    series, errors = {}, {}
+    for batch, result, err in _map_batches(_fetch, _batches(symbols, _SPARK_BATCH_SIZE)):
+        if err is not None:
+            errors.update({s: err for s in batch})
+            continue
+        for item in result:
+            if "symbol" in item:
+                s = _spark_series(item, daily)
+                series[s.name] = s
+
+    logger = utils.get_yf_logger()
+    if errors:
+        if raise_errors:
+            raise next(iter(errors.values()))
+        logger.error(f"{len(errors)} symbols failed to fetch spark: {next(iter(errors.values()))!r}")
+    missing = [s for s in symbols if s not in errors and s not in series]
+    if missing:
+        logger.error(f"No spark data for {len(missing)} symbols: {', '.join(missing[:20])}")
+
+    if series:
+        df = pd.concat(series.values(), axis=1).sort_index()
+    else:
+        df = pd.DataFrame(index=pd.DatetimeIndex([], tz=None if daily else 'UTC'))
+    df = df.reindex(columns=symbols)
+    df.index.name = 'Date' if daily else 'Datetime'
+    return df
@@ -4,7 +4,10 @@ import os as _os
 import platformdirs as _ad
 import atexit as _atexit
 import datetime as _dt
+import time as _time
 import pickle as _pkl
+import json as _json
+import zlib as _zlib
 
 from .utils import get_yf_logger
 
@@ -29,6 +32,12 @@ class _TzCacheDummy:
     def store(self, tkr, tz):
         pass
 
+    def lookup_many(self, tkrs):
+        return {}
+
+    def store_many(self, tzs):
+        pass
+
     @property
     def tz_db(self):
         return None
@@ -97,6 +106,8 @@ class _TzDBManager:
             cls._db.close()
             cls._db = None
         cls._cache_dir = new_cache_dir
+        # Cache object holds a reference to the old db
+        _TzCacheManager._tz_cache = None
 
     @classmethod
     def get_location(cls):
@@ -201,6 +212,49 @@ class _TzCache:
                     q = _TZ_KV.update(value=value).where(_TZ_KV.key == key)
                     q.execute()
 
+    def lookup_many(self, keys):
+        """
+        Return {key: value} for those keys that are cached, in one query per
+        chunk rather than one per key.
+        """
+        if self.dummy:
+            return {}
+
+        if self.initialised == -1:
+            self.initialise()
+
+        if self.initialised == 0:  # failure
+            return {}
+
+        keys = list(keys)
+        found = {}
+        # Stay well below SQLite's limit on query parameters
+        for i in range(0, len(keys), 500):
+            q = _TZ_KV.select().where(_TZ_KV.key.in_(keys[i:i + 500]))
+            found.update({row.key: row.value for row in q})
+        return found
+
+    def store_many(self, tzs):
+        """
+        Insert or replace many {key: value} in one transaction.
+        """
+        if self.dummy or not tzs:
+            return
+
+        if self.initialised == -1:
+            self.initialise()
+
+        if self.initialised == 0:  # failure
+            return
+
+        db = self.get_db()
+        if db is None:
+            return
+        rows = [{'key': k, 'value': v} for k, v in tzs.items()]
+        with db.atomic():
+            for i in range(0, len(rows), 500):
+                _TZ_KV.insert_many(rows[i:i + 500]).on_conflict_replace().execute()
+
 
 def get_tz_cache():
     return _TzCacheManager.get_tz_cache()
@@ -288,6 +342,8 @@ class _CookieDBManager:
             cls._db.close()
             cls._db = None
         cls._cache_dir = new_cache_dir
+        # Cache object holds a reference to the old db
+        _CookieCacheManager._Cookie_cache = None
 
     @classmethod
     def get_location(cls):
@@ -498,6 +554,8 @@ class _ISINDBManager:
             cls._db.close()
             cls._db = None
         cls._cache_dir = new_cache_dir
+        # Cache object holds a reference to the old db
+        _ISINCacheManager._isin_cache = None
 
     @classmethod
     def get_location(cls):
@@ -618,6 +676,485 @@ def get_isin_cache():
     return _ISINCacheManager.get_isin_cache()
 
 
+# --------------
+# HTTP response cache
+# --------------
+
+class _ResponseCacheException(Exception):
+    pass
+
+
+class _ResponseCacheDummy:
+    """Dummy cache to use if response cache is disabled"""
+
+    def lookup(self, key):
+        return None
+
+    def store(self, key, url, status_code, content, ttl):
+        pass
+
+    def clear(self):
+        pass
+
+    @property
+    def response_db(self):
+        return None
+
+
+class _ResponseCacheManager:
+    _response_cache = None
+
+    @classmethod
+    def get_response_cache(cls):
+        if cls._response_cache is None:
+            with _cache_init_lock:
+                cls._initialise()
+        return cls._response_cache
+
+    @classmethod
+    def _initialise(cls, cache_dir=None):
+        cls._response_cache = _ResponseCache()
+
+
+class _ResponseDBManager:
+    _db = None
+    _cache_dir = _os.path.join(_ad.user_cache_dir(), "py-yfinance")
+
+    @classmethod
+    def get_database(cls):
+        if cls._db is None:
+            cls._initialise()
+        return cls._db
+
+    @classmethod
+    def close_db(cls):
+        if cls._db is not None:
+            try:
+                cls._db.close()
+            except Exception:
+                # Must discard exceptions because Python trying to quit.
+                pass
+
+
+    @classmethod
+    def _initialise(cls, cache_dir=None):
+        if cache_dir is not None:
+            cls._cache_dir = cache_dir
+
+        if not _os.path.isdir(cls._cache_dir):
+            try:
+                _os.makedirs(cls._cache_dir)
+            except OSError as err:
+                raise _ResponseCacheException(f"Error creating ResponseCache folder: '{cls._cache_dir}' reason: {err}")
+        elif not (_os.access(cls._cache_dir, _os.R_OK) and _os.access(cls._cache_dir, _os.W_OK)):
+            raise _ResponseCacheException(f"Cannot read and write in ResponseCache folder: '{cls._cache_dir}'")
+
+        cls._db = _peewee.SqliteDatabase(
+            _os.path.join(cls._cache_dir, 'http-cache.db'),
+            pragmas={'journal_mode': 'wal', 'cache_size': -64}
+        )
+
+    @classmethod
+    def set_location(cls, new_cache_dir):
+        if cls._db is not None:
+            cls._db.close()
+            cls._db = None
+        cls._cache_dir = new_cache_dir
+        # Cache object holds a reference to the old db
+        _ResponseCacheManager._response_cache = None
+
+    @classmethod
+    def get_location(cls):
+        return cls._cache_dir
+
+# close DB when Python exists
+_atexit.register(_ResponseDBManager.close_db)
+
+
+response_db_proxy = _peewee.Proxy()
+class _ResponseSchema(_peewee.Model):
+    key = _peewee.CharField(primary_key=True)
+    url = _peewee.TextField()
+    status_code = _peewee.IntegerField()
+    content = _peewee.BlobField()
+    size = _peewee.IntegerField()
+    # Unix timestamps. expires_at = NULL means never expires.
+    expires_at = _peewee.FloatField(null=True)
+    last_access = _peewee.FloatField(index=True)
+
+    class Meta:
+        database = response_db_proxy
+        without_rowid = True
+
+
+class _ResponseCache:
+    """
+    Disk-backed cache of raw Yahoo responses, used by YfData.cache_get().
+    Entries carry their own expiry, and least-recently-used entries are
+    evicted once total size exceeds max_bytes.
+    """
+
+    max_bytes = 256 * 1024 * 1024
+    # Check size every N stores, not every store
+    _evict_interval = 50
+
+    def __init__(self):
+        self.initialised = -1
+        self.db = None
+        self.dummy = False
+        self._stores_since_evict = 0
+
+    def get_db(self):
+        if self.db is not None:
+            return self.db
+
+        try:
+            self.db = _ResponseDBManager.get_database()
+        except _ResponseCacheException as err:
+            get_yf_logger().info(f"Failed to create ResponseCache, reason: {err}. "
+                                 "ResponseCache will not be used. "
+                                 "Tip: You can direct cache to use a different location with 'set_tz_cache_location(mylocation)'")
+            self.dummy = True
+            return None
+        return self.db
+
+    def initialise(self):
+        if self.initialised != -1:
+            return
+
+        db = self.get_db()
+        if db is None:
+            self.initialised = 0  # failure
+            return
+
+        db.connect(reuse_if_open=True)
+        response_db_proxy.initialize(db)
+        try:
+            db.create_tables([_ResponseSchema])
+        except _peewee.OperationalError as e:
+            if 'WITHOUT' in str(e):
+                _ResponseSchema._meta.without_rowid = False
+                db.create_tables([_ResponseSchema])
+            else:
+                raise
+        self.initialised = 1  # success
+        self._evict()
+
+    def lookup(self, key):
+        if self.dummy:
+            return None
+
+        if self.initialised == -1:
+            self.initialise()
+
+        if self.initialised == 0:  # failure
+            return None
+
+        now = _time.time()
+        try:
+            row = _ResponseSchema.get(_ResponseSchema.key == key)
+        except _ResponseSchema.DoesNotExist:
+            return None
+        except _peewee.OperationalError as e:
+            get_yf_logger().debug(f"ResponseCache lookup failed: {e}")
+            return None
+        if row.expires_at is not None and row.expires_at < now:
+            return None
+        try:
+            _ResponseSchema.update(last_access=now).where(_ResponseSchema.key == key).execute()
+        except _peewee.OperationalError:
+            # Another process is writing, LRU order is best-effort
+            pass
+        return {'url': row.url, 'status_code': row.status_code, 'content': bytes(row.content)}
+
+    def store(self, key, url, status_code, content, ttl):
+        """
+        :param ttl: seconds until entry expires, or None to keep until evicted
+        """
+        if self.dummy:
+            return
+
+        if self.initialised == -1:
+            self.initialise()
+
+        if self.initialised == 0:  # failure
+            return
+
+        db = self.get_db()
+        if db is None:
+            return
+        now = _time.time()
+        expires_at = None if ttl is None else now + ttl
+        try:
+            with db.atomic():
+                _ResponseSchema.replace(key=key, url=url, status_code=status_code,
+                                        content=content, size=len(content),
+                                        expires_at=expires_at, last_access=now).execute()
+        except _peewee.OperationalError as e:
+            get_yf_logger().debug(f"ResponseCache store failed: {e}")
+            return
+
+        self._stores_since_evict += 1
+        if self._stores_since_evict >= self._evict_interval:
+            self._evict()
+
+    def _evict(self):
+        self._stores_since_evict = 0
+        db = self.get_db()
+        if db is None:
+            return
+        try:
+            with db.atomic():
+                _ResponseSchema.delete().where(
+                    _ResponseSchema.expires_at.is_null(False) &
+                    (_ResponseSchema.expires_at < _time.time())).execute()
+
+                total = _ResponseSchema.select(_peewee.fn.SUM(_ResponseSchema.size)).scalar() or 0
+                if total <= self.max_bytes:
+                    return
+                # Evict down to 90% so not evicting again on next store
+                excess = total - int(self.max_bytes * 0.9)
+                evict = []
+                q = _ResponseSchema.select(_ResponseSchema.key, _ResponseSchema.size).order_by(_ResponseSchema.last_access)
+                for row in q.tuples().iterator():
+                    evict.append(row[0])
+                    excess -= row[1]
+                    if excess <= 0:
+                        break
+                for i in range(0, len(evict), 500):
+                    _ResponseSchema.delete().where(_ResponseSchema.key.in_(evict[i:i+500])).execute()
+        except _peewee.OperationalError as e:
+            get_yf_logger().debug(f"ResponseCache eviction failed: {e}")
+
+    def clear(self):
+        if self.dummy:
+            return
+
+        if self.initialised == -1:
+            self.initialise()
+
+        if self.initialised == 0:  # failure
+            return
+
+        _ResponseSchema.delete().execute()
+
+
+def get_response_cache():
+    return _ResponseCacheManager.get_response_cache()
+
+
+# --------------
+# Price history store
+# --------------
+
+class _HistoryStoreException(Exception):
+    pass
+
+
+class _HistoryStoreDummy:
+    """Dummy store to use if history store is disabled"""
+
+    def lookup(self, ticker, interval):
+        return None
+
+    def store(self, ticker, interval, covered_from, result):
+        pass
+
+    def clear(self):
+        pass
+
+
+class _HistoryStoreManager:
+    _history_store = None
+    # Opt-in: yf.set_config(history_store=True)
+    enabled = False
+
+    @classmethod
+    def get_history_store(cls):
+        if not cls.enabled:
+            return _HistoryStoreDummy()
+        if cls._history_store is None:
+            with _cache_init_lock:
+                cls._initialise()
+        return cls._history_store
+
+    @classmethod
+    def _initialise(cls, cache_dir=None):
+        cls._history_store = _HistoryStore()
+
+
+class _HistoryDBManager:
+    _db = None
+    _cache_dir = _os.path.join(_ad.user_cache_dir(), "py-yfinance")
+
+    @classmethod
+    def get_database(cls):
+        if cls._db is None:
+            cls._initialise()
+        return cls._db
+
+    @classmethod
+    def close_db(cls):
+        if cls._db is not None:
+            try:
+                cls._db.close()
+            except Exception:
+                # Must discard exceptions because Python trying to quit.
+                pass
+
+    @classmethod
+    def _initialise(cls, cache_dir=None):
+        if cache_dir is not None:
+            cls._cache_dir = cache_dir
+
+        if not _os.path.isdir(cls._cache_dir):
+            try:
+                _os.makedirs(cls._cache_dir)
+            except OSError as err:
+                raise _HistoryStoreException(f"Error creating HistoryStore folder: '{cls._cache_dir}' reason: {err}")
+        elif not (_os.access(cls._cache_dir, _os.R_OK) and _os.access(cls._cache_dir, _os.W_OK)):
+            raise _HistoryStoreException(f"Cannot read and write in HistoryStore folder: '{cls._cache_dir}'")
+
+        cls._db = _peewee.SqliteDatabase(
+            _os.path.join(cls._cache_dir, 'history-store.db'),
+            pragmas={'journal_mode': 'wal', 'cache_size': -64}
+        )
+
+    @classmethod
+    def set_location(cls, new_cache_dir):
+        if cls._db is not None:
+            cls._db.close()
+            cls._db = None
+        cls._cache_dir = new_cache_dir
+        _HistoryStoreManager._history_store = None
+
+    @classmethod
+    def get_location(cls):
+        return cls._cache_dir
+
+# close DB when Python exists
+_atexit.register(_HistoryDBManager.close_db)
+
+
+history_db_proxy = _peewee.Proxy()
+class _HistorySchema(_peewee.Model):
+    ticker = _peewee.CharField()
+    interval = _peewee.CharField()
+    # Unix timestamp of earliest date requested from Yahoo, so know if
+    # a request starting earlier can be served
+    covered_from = _peewee.IntegerField()
+    # zlib-compressed JSON of Yahoo chart 'result' object
+    result = _peewee.BlobField()
+    updated_at = _peewee.FloatField()
+
+    class Meta:
+        database = history_db_proxy
+        primary_key = _peewee.CompositeKey('ticker', 'interval')
+
+
+class _HistoryStore:
+    """
+    Disk-backed store of raw Yahoo chart results, one per (ticker, interval),
+    used by PriceHistory to only fetch bars newer than stored.
+    """
+
+    def __init__(self):
+        self.initialised = -1
+        self.db = None
+        self.dummy = False
+
+    def get_db(self):
+        if self.db is not None:
+            return self.db
+
+        try:
+            self.db = _HistoryDBManager.get_database()
+        except _HistoryStoreException as err:
+            get_yf_logger().info(f"Failed to create HistoryStore, reason: {err}. "
+                                 "HistoryStore will not be used. "
+                                 "Tip: You can direct cache to use a different location with 'set_tz_cache_location(mylocation)'")
+            self.dummy = True
+            return None
+        return self.db
+
+    def initialise(self):
+        if self.initialised != -1:
+            return
+
+        db = self.get_db()
+        if db is None:
+            self.initialised = 0  # failure
+            return
+
+        db.connect(reuse_if_open=True)
+        history_db_proxy.initialize(db)
+        db.create_tables([_HistorySchema])
+        self.initialised = 1  # success
+
+    def lookup(self, ticker, interval):
+        """
+        Return {'covered_from': int, 'result': dict} or None
+        """
+        if self.dummy:
+            return None
+
+        if self.initialised == -1:
+            self.initialise()
+
+        if self.initialised == 0:  # failure
+            return None
+
+        try:
+            row = _HistorySchema.get((_HistorySchema.ticker == ticker) & (_HistorySchema.interval == interval))
+        except _HistorySchema.DoesNotExist:
+            return None
+        except _peewee.OperationalError as e:
+            get_yf_logger().debug(f"HistoryStore lookup failed: {e}")
+            return None
+        try:
+            result = _json.loads(_zlib.decompress(bytes(row.result)))
+        except (_zlib.error, ValueError):
+            return None
+        return {'covered_from': row.covered_from, 'result': result}
+
+    def store(self, ticker, interval, covered_from, result):
+        if self.dummy:
+            return
+
+        if self.initialised == -1:
+            self.initialise()
+
+        if self.initialised == 0:  # failure
+            return
+
+        db = self.get_db()
+        if db is None:
+            return
+        blob = _zlib.compress(_json.dumps(result, separators=(',', ':')).encode('utf-8'))
+        try:
+            with db.atomic():
+                _HistorySchema.replace(ticker=ticker, interval=interval, covered_from=int(covered_from),
+                                       result=blob, updated_at=_time.time()).execute()
+        except _peewee.OperationalError as e:
+            get_yf_logger().debug(f"HistoryStore store failed: {e}")
+
+    def clear(self):
+        if self.dummy:
+            return
+
+        if self.initialised == -1:
+            self.initialise()
+
+        if self.initialised == 0:  # failure
+            return
+
+        _HistorySchema.delete().execute()
+
+
+def get_history_store():
+    return _HistoryStoreManager.get_history_store()
+
+
 # --------------
 # Utils
 # --------------
@@ -633,6 +1170,8 @@ def set_cache_location(cache_dir: str):
     _TzDBManager.set_location(cache_dir)
     _CookieDBManager.set_location(cache_dir)
     _ISINDBManager.set_location(cache_dir)
+    _ResponseDBManager.set_location(cache_dir)
+    _HistoryDBManager.set_location(cache_dir)
 
 def set_tz_cache_location(cache_dir: str):
     set_cache_location(cache_dir)
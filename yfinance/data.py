@@ -1,40 +1,156 @@
-import functools
-from functools import lru_cache
+import asyncio
+import hashlib
+from collections import namedtuple
+import json
+import time
 
 from curl_cffi import requests
 from urllib.parse import urlsplit, urljoin
 from bs4 import BeautifulSoup
 import datetime
 
-from frozendict import frozendict
-
-from . import utils, cache
+from . import utils, cache, metrics, pool, ratelimit, transport
 import threading
 
 from .exceptions import YFRateLimitError, YFDataException
 
-cache_maxsize = 64
+# Seconds a cache_get() response stays fresh, by endpoint. None = never expires.
+# First matching url fragment wins.
+_RESPONSE_CACHE_TTL = [
+    ('/v10/finance/quoteSummary/', 5 * 60),
+    ('/ws/fundamentals-timeseries/', 24 * 60 * 60),
+    ('/v7/finance/quote', 60),
+    ('/v8/finance/chart/', 60),
+]
+_RESPONSE_CACHE_TTL_DEFAULT = 5 * 60
+# Chart ranges ending this long ago are complete, Yahoo won't add more bars
+_CHART_SETTLED_DELAY = 30 * 60
+# But their adjclose & events still change with each new dividend or split,
+# so bound how long an adjusted past can go stale
+_CHART_SETTLED_TTL = 24 * 60 * 60
+
+
+def _response_cache_ttl(url, params):
+    if '/v8/finance/chart/' in url and params and 'period2' in params:
+        try:
+            if int(params['period2']) + _CHART_SETTLED_DELAY <= time.time():
+                # Bars are final, adjustment isn't
+                return _CHART_SETTLED_TTL
+        except (TypeError, ValueError):
+            pass
+    for fragment, ttl in _RESPONSE_CACHE_TTL:
+        if fragment in url:
+            return ttl
+    return _RESPONSE_CACHE_TTL_DEFAULT
+
+
+def _response_cache_key(url, params, body=None):
+    if params:
+        params = {k: list(v) if isinstance(v, (list, tuple)) else v for k, v in params.items()}
+    blob = json.dumps([url, params, body], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+class _CachedResponse:
+    """
+    Stand-in for curl_cffi Response, rebuilt from the response cache.
+    Provides what callers of cache_get() use.
+    """
+
+    def __init__(self, url, status_code, content):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.from_cache = True
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self, **kw):
+        return json.loads(self.content, **kw)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(f"HTTP Error {self.status_code}", response=self)
+
+
+# Immutable, so request threads can read it without taking the cookie lock.
+# expires is a Unix timestamp.
+_AuthSnapshot = namedtuple('_AuthSnapshot', ['crumb', 'strategy', 'expires'])
 
+# Re-fetch crumb at least this often, even if Yahoo keeps accepting it
+_CRUMB_MAX_AGE = 24 * 60 * 60
 
-def lru_cache_freezeargs(func):
+
+class _SingleFlight:
+    """
+    Coalesce identical in-flight calls: first caller of a key does the work,
+    concurrent callers with the same key wait and share its result (or exception).
+    Nothing is remembered after the call completes, that is the cache's job.
+    """
+
+    class _Call:
+        __slots__ = ('event', 'result', 'error')
+
+        def __init__(self):
+            self.event = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+
+        if not leader:
+            utils.get_yf_logger().debug('joined in-flight request')
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+class _AsyncSingleFlight:
     """
-    Decorator transforms mutable dictionary and list arguments into immutable types
-    Needed so lru_cache can cache method calls what has dict or list arguments.
+    asyncio version of _SingleFlight. Must only be used from one event loop.
     """
 
-    @functools.wraps(func)
-    def wrapped(*args, **kwargs):
-        args = tuple([frozendict(arg) if isinstance(arg, dict) else arg for arg in args])
-        kwargs = {k: frozendict(v) if isinstance(v, dict) else v for k, v in kwargs.items()}
-        args = tuple([tuple(arg) if isinstance(arg, list) else arg for arg in args])
-        kwargs = {k: tuple(v) if isinstance(v, list) else v for k, v in kwargs.items()}
-        return func(*args, **kwargs)
+    def __init__(self):
+        self._calls = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        fut = self._calls.get(key)
+        if fut is not None:
+            utils.get_yf_logger().debug('joined in-flight request')
+            # shield: a cancelled waiter must not cancel the shared request
+            return await asyncio.shield(fut)
 
-    # copy over the lru_cache extra methods to this wrapper to be able to access them
-    # after this decorator has been applied
-    wrapped.cache_info = func.cache_info
-    wrapped.cache_clear = func.cache_clear
-    return wrapped
+        fut = asyncio.ensure_future(fn(*args, **kwargs))
+        self._calls[key] = fut
+        fut.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(fut)
 
 
 class SingletonMeta(type):
@@ -45,6 +161,10 @@ class SingletonMeta(type):
     _lock = threading.Lock()
 
     def __call__(cls, *args, **kwargs):
+        session = kwargs.get('session') if 'session' in kwargs else (args[0] if args else None)
+        if isinstance(session, cls):
+            # A named context passed as session: use it instead of singleton
+            return session
         with cls._lock:
             if cls not in cls._instances:
                 instance = super().__call__(*args, **kwargs)
@@ -60,60 +180,54 @@ class SingletonMeta(type):
             return cls._instances[cls]
 
 
-class YfData(metaclass=SingletonMeta):
+class _YfDataBase:
     """
-    Have one place to retrieve data from Yahoo API in order to ease caching and speed up operations.
-    Singleton means one session one cookie shared by all threads.
+    Cookie & consent handling shared by YfData and AsyncYfData.
+    Nothing here performs network I/O, so is safe to call from either.
     """
 
-    def __init__(self, session=None, proxy=None):
-        self._crumb = None
-        self._cookie = None
-
-        # Default to using 'basic' strategy
-        self._cookie_strategy = 'basic'
-        # If it fails, then fallback method is 'csrf'
-        # self._cookie_strategy = 'csrf'
+    # Cookie cache row. Named contexts get their own, see get_context()
+    _cookie_cache_key = 'curlCffi'
+    name = None
 
-        self._cookie_lock = threading.Lock()
+    def _persist_caches(self):
+        # Transports serve mock or recorded responses: unless they opt in, keep
+        # those out of the on-disk caches, or a later real run would read them
+        return getattr(self._session, 'persist_caches', True)
 
-        self._session, self._proxy = None, None
-        self._set_session(session or requests.Session(impersonate="chrome"))
-        self._set_proxy(proxy)
+    def _tz_cache(self):
+        return cache.get_tz_cache() if self._persist_caches() else cache._TzCacheDummy()
 
-    def _set_session(self, session):
-        if session is None:
-            return
+    def _isin_cache(self):
+        return cache.get_isin_cache() if self._persist_caches() else cache._ISINCacheDummy()
 
-        try:
-            session.cache
-        except AttributeError:
-            # Not caching
-            self._session_is_caching = False
-        else:
-            # Is caching. This is annoying.
-            # Can't simply use a non-caching session to fetch cookie & crumb,
-            # because then the caching-session won't have cookie.
-            self._session_is_caching = True
-            # But since switch to curl_cffi, can't use requests_cache with it.
-            raise YFDataException("request_cache sessions don't work with curl_cffi, which is necessary now for Yahoo API. Solution: stop setting session, let YF handle.")
+    def _cookie_cache(self):
+        return cache.get_cookie_cache() if self._persist_caches() else cache._CookieCacheDummy()
 
-        if not isinstance(session, requests.session.Session):
-            raise YFDataException(f"Yahoo API requires curl_cffi session not {type(session)}. Solution: stop setting session, let YF handle.")
+    def _response_cache(self):
+        return cache.get_response_cache() if self._persist_caches() else cache._ResponseCacheDummy()
 
-        with self._cookie_lock:
-            self._session = session
-            if self._proxy is not None:
-                self._session.proxies = self._proxy
+    def _history_store(self):
+        return cache.get_history_store() if self._persist_caches() else cache._HistoryStoreDummy()
 
-    def _set_proxy(self, proxy=None):
-        with self._cookie_lock:
-            if proxy is not None:
-                proxy = {'http': proxy, 'https': proxy} if isinstance(proxy, str) else proxy
-            else:
-                proxy = {}
-            self._proxy = proxy
-            self._session.proxies = proxy
+    def _emit_request(self, url, response, start, retries, switched_strategy, waited):
+        if not metrics.enabled():
+            return
+        metrics.emit(metrics.make_event(
+            'request', url,
+            status=None if response is None else response.status_code,
+            latency=time.monotonic() - start,
+            nbytes=0 if response is None else len(response.content or b''),
+            retries=retries, crumb_retries=int(switched_strategy),
+            rate_limit_wait=waited, context=self.name))
+
+    def _emit_cache(self, url, hit):
+        if not metrics.enabled():
+            return
+        metrics.emit(metrics.make_event(
+            'cache', url, status=None if hit is None else hit['status_code'],
+            nbytes=0 if hit is None else len(hit['content']),
+            cache='miss' if hit is None else 'hit', context=self.name))
 
     def _set_cookie_strategy(self, strategy, have_lock=False):
         if strategy == self._cookie_strategy:
@@ -131,6 +245,7 @@ class YfData(metaclass=SingletonMeta):
                 self._cookie_strategy = 'csrf'
             self._cookie = None
             self._crumb = None
+            self._auth = None
         except Exception:
             self._cookie_lock.release()
             raise
@@ -138,8 +253,30 @@ class YfData(metaclass=SingletonMeta):
         if not have_lock:
             self._cookie_lock.release()
 
+    def _auth_if_valid(self, stale=None):
+        auth = self._auth
+        if auth is not None and auth is not stale and auth.expires > time.time():
+            return auth
+        return None
+
+    def _publish_auth(self, crumb, strategy):
+        if crumb is None:
+            # Don't publish failure, next request retries handshake
+            self._auth = None
+        else:
+            self._auth = _AuthSnapshot(crumb, strategy, time.time() + _CRUMB_MAX_AGE)
+            self._save_cookie_curlCffi(self._auth)
+
+    def _auth_matches(self, crumb, strategy):
+        auth = self._auth
+        return auth is None or (auth.crumb == crumb and auth.strategy == strategy)
+
     @utils.log_indent_decorator
-    def _save_cookie_curlCffi(self):
+    def _save_cookie_curlCffi(self, auth=None):
+        """
+        Persist Yahoo cookie. If auth snapshot given, also persist its crumb,
+        strategy and expiry, so next process can skip the handshake.
+        """
         if self._session is None:
             return False
         cookies = self._session.cookies.jar._cookies
@@ -156,17 +293,32 @@ class YfData(metaclass=SingletonMeta):
             return False
         yh_domain = yh_domains[0]
         yh_cookie = {yh_domain: cookies[yh_domain]}
-        cache.get_cookie_cache().store('curlCffi', yh_cookie)
+        if auth is None:
+            self._cookie_cache().store(self._cookie_cache_key, yh_cookie)
+        else:
+            self._cookie_cache().store(self._cookie_cache_key, {'cookies': yh_cookie, 'auth': tuple(auth)})
         return True
 
+    def _lookup_cookie_curlCffi(self):
+        """
+        Return (cookies, auth snapshot or None). Handles entries written before
+        crumb was persisted, which hold just the cookies.
+        """
+        cookie_dict = self._cookie_cache().lookup(self._cookie_cache_key)
+        if cookie_dict is None or len(cookie_dict) == 0:
+            return None, None
+        cookies = cookie_dict['cookie']
+        if 'auth' in cookies and 'cookies' in cookies:
+            return cookies['cookies'], _AuthSnapshot(*cookies['auth'])
+        return cookies, None
+
     @utils.log_indent_decorator
     def _load_cookie_curlCffi(self):
         if self._session is None:
             return False
-        cookie_dict = cache.get_cookie_cache().lookup('curlCffi')
-        if cookie_dict is None or len(cookie_dict) == 0:
+        cookies, _ = self._lookup_cookie_curlCffi()
+        if not cookies:
             return False
-        cookies = cookie_dict['cookie']
         domain = list(cookies.keys())[0]
         cookie = cookies[domain]['/']['A3']
         expiry_ts = cookie.expires
@@ -182,6 +334,207 @@ class YfData(metaclass=SingletonMeta):
         self._cookie = cookie
         return True
 
+    @utils.log_indent_decorator
+    def _load_auth_curlCffi(self, stale=None):
+        """
+        Restore cookie + crumb persisted by another process (or earlier run).
+        Must hold cookie lock.
+        """
+        _, auth = self._lookup_cookie_curlCffi()
+        if auth is None or auth.expires <= time.time():
+            return None
+        if stale is not None and auth.crumb == stale.crumb:
+            # Same crumb we are replacing
+            return None
+        if not self._load_cookie_curlCffi():
+            return None
+        if auth.strategy == 'csrf':
+            self._cookie = True
+        self._cookie_strategy = auth.strategy
+        self._crumb = auth.crumb
+        self._auth = auth
+        utils.get_yf_logger().debug(f"reusing persistent crumb, strategy={auth.strategy}")
+        return auth
+
+    def _forget_auth_curlCffi(self):
+        # Persisted crumb was rejected, don't let next process reuse it
+        _, auth = self._lookup_cookie_curlCffi()
+        if auth is not None:
+            self._cookie_cache().store(self._cookie_cache_key, None)
+
+    def _is_this_consent_url(self, response_url: str) -> bool:
+        """
+        Check if given response_url is consent page
+
+        Args:
+            response_url (str) : response.url
+    
+        Returns:
+            True : This is cookie-consent page
+            False : This is not cookie-consent page
+        """
+        try:
+            return urlsplit(response_url).hostname and urlsplit(
+                response_url
+            ).hostname.endswith("consent.yahoo.com")
+        except Exception:
+            return False
+
+    def _parse_csrf_consent(self, content):
+        """
+        Extract the form fields needed to post Yahoo's GUCE consent, or None if page not recognised.
+        """
+        soup = BeautifulSoup(content, 'html.parser')
+        csrfTokenInput = soup.find('input', attrs={'name': 'csrfToken'})
+        if csrfTokenInput is None:
+            utils.get_yf_logger().debug('Failed to find "csrfToken" in response')
+            return None
+        csrfToken = csrfTokenInput['value']
+        utils.get_yf_logger().debug(f'csrfToken = {csrfToken}')
+        sessionIdInput = soup.find('input', attrs={'name': 'sessionId'})
+        sessionId = sessionIdInput['value']
+        utils.get_yf_logger().debug(f"sessionId='{sessionId}")
+
+        originalDoneUrl = 'https://finance.yahoo.com/'
+        namespace = 'yahoo'
+        return {
+            'agree': ['agree', 'agree'],
+            'consentUUID': 'default',
+            'sessionId': sessionId,
+            'csrfToken': csrfToken,
+            'originalDoneUrl': originalDoneUrl,
+            'namespace': namespace,
+        }
+
+    def _parse_consent_form(self, consent_resp):
+        """
+        Parse cookie-consent page into what is needed to click 'Accept all'.
+
+        Args:
+            consent_resp (requests.Response) : Response instance of cookie-consent page
+
+        Returns:
+            (action, data, headers) tuple to post, or None if no form found.
+        """
+        soup = BeautifulSoup(consent_resp.text, "html.parser")
+
+        # Heuristic: pick the first form; Yahoo's CMP tends to have a single form for consent
+        form = soup.find("form")
+        if not form:
+            return None
+    
+        # action : URL to send "Accept Cookies"
+        action = form.get("action") or consent_resp.url
+        action = urljoin(consent_resp.url, action)
+    
+        # Collect inputs (hidden tokens, etc.)
+        """
+        <input name="csrfToken" type="hidden" value="..."/>
+        <input name="sessionId" type="hidden" value="..."/>
+        <input name="originalDoneUrl" type="hidden" value="..."/>
+        <input name="namespace" type="hidden" value="yahoo"/>
+        """
+        data = {}
+        for inp in form.find_all("input"):
+            name = inp.get("name")
+            if not name:
+                continue
+            typ = (inp.get("type") or "text").lower()
+            val = inp.get("value") or ""
+    
+            if typ in ("checkbox", "radio"):
+                # If it's clearly an "agree"/"accept" field or already checked, include it
+                if (
+                    "agree" in name.lower()
+                    or "accept" in name.lower()
+                    or inp.has_attr("checked")
+                ):
+                    data[name] = val if val != "" else "1"
+            else:
+                data[name] = val
+    
+        # If no explicit agree/accept in inputs, add a best-effort flag
+        lowered = {k.lower() for k in data.keys()}
+        if not any(("agree" in k or "accept" in k) for k in lowered):
+            data["agree"] = "1"
+    
+        # Submit the form with "Referer". Some servers check this header as a simple CSRF protection measure.
+        headers = {"Referer": consent_resp.url}
+        return action, data, headers
+
+
+class YfData(_YfDataBase, metaclass=SingletonMeta):
+    """
+    Have one place to retrieve data from Yahoo API in order to ease caching and speed up operations.
+    Singleton means one session one cookie shared by all threads.
+    For more identities (e.g. one per proxy) see get_context().
+    """
+
+    def __init__(self, session=None, proxy=None, name=None):
+        self.name = name
+        if name is not None:
+            self._cookie_cache_key = f'curlCffi-{name}'
+            # Own rate limiters, so one context being throttled doesn't slow others
+            self._limiters = {}
+        else:
+            # Process-wide limiters in ratelimit
+            self._limiters = None
+        # Time of last 429 response, for Dispatcher quarantine
+        self._rate_limited_at = None
+
+        self._crumb = None
+        self._cookie = None
+
+        # Default to using 'basic' strategy
+        self._cookie_strategy = 'basic'
+        # If it fails, then fallback method is 'csrf'
+        # self._cookie_strategy = 'csrf'
+
+        self._cookie_lock = threading.Lock()
+        # Published crumb. Written under _cookie_lock, read without.
+        self._auth = None
+
+        # Threads requesting same thing at same time share one request
+        self._inflight = _SingleFlight()
+
+        self._session, self._proxy = None, None
+        self._set_session(session or pool.SessionPool())
+        self._set_proxy(proxy)
+
+    def _set_session(self, session):
+        if session is None:
+            return
+
+        try:
+            session.cache
+        except AttributeError:
+            # Not caching
+            self._session_is_caching = False
+        else:
+            # Is caching. This is annoying.
+            # Can't simply use a non-caching session to fetch cookie & crumb,
+            # because then the caching-session won't have cookie.
+            self._session_is_caching = True
+            # But since switch to curl_cffi, can't use requests_cache with it.
+            raise YFDataException("request_cache sessions don't work with curl_cffi, which is necessary now for Yahoo API. Solution: stop setting session, let YF handle.")
+
+        if not isinstance(session, (requests.session.Session, pool.SessionPool, transport.Transport)):
+            raise YFDataException(f"Yahoo API requires curl_cffi session not {type(session)}. Solution: stop setting session, let YF handle.")
+
+        with self._cookie_lock:
+            self._session = session
+            if self._proxy is not None:
+                self._session.proxies = self._proxy
+
+    def _set_proxy(self, proxy=None):
+        with self._cookie_lock:
+            if proxy is not None:
+                proxy = {'http': proxy, 'https': proxy} if isinstance(proxy, str) else proxy
+            else:
+                proxy = {}
+            self._proxy = proxy
+            self._session.proxies = proxy
+
     @utils.log_indent_decorator
     def _get_cookie_basic(self, timeout=30):
         if self._cookie is not None:
@@ -267,27 +620,10 @@ class YfData(metaclass=SingletonMeta):
             utils.get_yf_logger().debug('_get_cookie_csrf() encountering requests.exceptions.ChunkedEncodingError, aborting')
             return False
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-        csrfTokenInput = soup.find('input', attrs={'name': 'csrfToken'})
-        if csrfTokenInput is None:
-            utils.get_yf_logger().debug('Failed to find "csrfToken" in response')
+        data = self._parse_csrf_consent(response.content)
+        if data is None:
             return False
-        csrfToken = csrfTokenInput['value']
-        utils.get_yf_logger().debug(f'csrfToken = {csrfToken}')
-        sessionIdInput = soup.find('input', attrs={'name': 'sessionId'})
-        sessionId = sessionIdInput['value']
-        utils.get_yf_logger().debug(f"sessionId='{sessionId}")
-
-        originalDoneUrl = 'https://finance.yahoo.com/'
-        namespace = 'yahoo'
-        data = {
-            'agree': ['agree', 'agree'],
-            'consentUUID': 'default',
-            'sessionId': sessionId,
-            'csrfToken': csrfToken,
-            'originalDoneUrl': originalDoneUrl,
-            'namespace': namespace,
-        }
+        sessionId = data['sessionId']
         post_args = {**base_args,
             'url': f'https://consent.yahoo.com/v2/collectConsent?sessionId={sessionId}',
             'data': data}
@@ -343,13 +679,32 @@ class YfData(metaclass=SingletonMeta):
         utils.get_yf_logger().debug(f"crumb = '{self._crumb}'")
         return self._crumb
 
-    @utils.log_indent_decorator
     def _get_cookie_and_crumb(self, timeout=30):
+        # Fast path, no lock: crumb already known
+        auth = self._auth
+        if auth is not None and auth.expires > time.time():
+            return auth.crumb, auth.strategy
+        return self._refresh_cookie_and_crumb(auth, timeout)
+
+    @utils.log_indent_decorator
+    def _refresh_cookie_and_crumb(self, stale, timeout=30):
         crumb, strategy = None, None
 
         utils.get_yf_logger().debug(f"cookie_mode = '{self._cookie_strategy}'")
 
         with self._cookie_lock:
+            # Single-flight: if another thread refreshed while we waited, use that
+            auth = self._auth_if_valid(stale)
+            if auth is not None:
+                return auth.crumb, auth.strategy
+            if stale is not None and stale is self._auth:
+                # Expired
+                self._crumb = None
+
+            auth = self._load_auth_curlCffi(stale)
+            if auth is not None:
+                return auth.crumb, auth.strategy
+
             if self._cookie_strategy == 'csrf':
                 crumb = self._get_crumb_csrf()
                 if crumb is None:
@@ -364,10 +719,29 @@ class YfData(metaclass=SingletonMeta):
                     self._set_cookie_strategy('csrf', have_lock=True)
                     crumb = self._get_crumb_csrf()
             strategy = self._cookie_strategy
+            self._publish_auth(crumb, strategy)
         return crumb, strategy
 
+    def _invalidate_cookie_and_crumb(self, crumb, strategy, timeout=30):
+        """
+        Yahoo rejected crumb: switch cookie strategy and fetch new crumb.
+        Only the first thread to report a given crumb does the switch.
+        """
+        with self._cookie_lock:
+            if self._auth_matches(crumb, strategy):
+                self._forget_auth_curlCffi()
+                if strategy == 'basic':
+                    self._set_cookie_strategy('csrf', have_lock=True)
+                else:
+                    self._set_cookie_strategy('basic', have_lock=True)
+        return self._get_cookie_and_crumb(timeout)
+
     @utils.log_indent_decorator
     def get(self, url, params=None, timeout=30):
+        key = ('GET', _response_cache_key(url, params))
+        return self._inflight.do(key, self._get, url, params, timeout)
+
+    def _get(self, url, params=None, timeout=30):
         response = self._make_request(url, request_method = self._session.get, params=params, timeout=timeout)
 
         # Accept cookie-consent if redirected to consent page
@@ -382,7 +756,9 @@ class YfData(metaclass=SingletonMeta):
 
     @utils.log_indent_decorator
     def post(self, url, body, params=None, timeout=30):
-        return self._make_request(url, request_method = self._session.post, body=body, params=params, timeout=timeout)
+        key = ('POST', _response_cache_key(url, params, body))
+        return self._inflight.do(key, self._make_request, url, request_method=self._session.post,
+                                 body=body, params=params, timeout=timeout)
 
     @utils.log_indent_decorator
     def _make_request(self, url, request_method, body=None, params=None, timeout=30):
@@ -414,29 +790,82 @@ class YfData(metaclass=SingletonMeta):
         if body:
             request_args['json'] = body
 
-        response = request_method(**request_args)
-        utils.get_yf_logger().debug(f'response code={response.status_code}')
-        if response.status_code >= 400:
-            # Retry with other cookie strategy
-            if strategy == 'basic':
-                self._set_cookie_strategy('csrf')
-            else:
-                self._set_cookie_strategy('basic')
-            crumb, strategy = self._get_cookie_and_crumb(timeout)
-            request_args['params']['crumb'] = crumb
-            response = request_method(**request_args)
-            utils.get_yf_logger().debug(f'response code={response.status_code}')
+        limiter = ratelimit.get_limiter(url, self._limiters)
+        attempt = 0
+        switched_strategy = False
+        waited = 0.0
+        start = time.monotonic()
+        try:
+            while True:
+                response, wait = self._send(limiter, request_method, request_args)
+                waited += wait
+                utils.get_yf_logger().debug(f'response code={response.status_code}')
+                if response.status_code < 400:
+                    break
+                if response.status_code == 429:
+                    self._rate_limited_at = time.time()
+
+                if ratelimit.is_retryable(response.status_code):
+                    if attempt >= ratelimit.max_retries():
+                        break
+                    delay = ratelimit.backoff_delay(attempt, response)
+                    attempt += 1
+                    utils.get_yf_logger().debug(f'retry {attempt} in {delay:.2f}s')
+                    time.sleep(delay)
+                    continue
+
+                if response.status_code not in (401, 403) or switched_strategy:
+                    break
+                # Crumb rejected, retry with other cookie strategy
+                switched_strategy = True
+                crumb, strategy = self._invalidate_cookie_and_crumb(crumb, strategy, timeout)
+                request_args['params']['crumb'] = crumb
+        except Exception:
+            self._emit_request(url, None, start, attempt, switched_strategy, waited)
+            raise
+        self._emit_request(url, response, start, attempt, switched_strategy, waited)
 
-            # Raise exception if rate limited
-            if response.status_code == 429:
-                raise YFRateLimitError()
+        # Raise exception if rate limited
+        if response.status_code == 429:
+            raise YFRateLimitError()
 
         return response
 
-    @lru_cache_freezeargs
-    @lru_cache(maxsize=cache_maxsize)
+    @staticmethod
+    def _send(limiter, request_method, request_args):
+        """
+        Return (response, seconds waited on rate limiter)
+        """
+        if limiter is None:
+            return request_method(**request_args), 0.0
+        waited = limiter.acquire()
+        response = None
+        try:
+            response = request_method(**request_args)
+        finally:
+            limiter.release(None if response is None else response.status_code)
+        return response, waited
+
     def cache_get(self, url, params=None, timeout=30):
-        return self.get(url, params, timeout)
+        """
+        GET through the persistent response cache, see _response_cache_ttl() for
+        how long each endpoint is kept. Only successful responses are stored.
+        """
+        key = _response_cache_key(url, params)
+        return self._inflight.do(('CACHE', key), self._cache_get, key, url, params, timeout)
+
+    def _cache_get(self, key, url, params, timeout):
+        c = self._response_cache()
+        hit = c.lookup(key)
+        if hit is not None:
+            utils.get_yf_logger().debug(f'cache hit: {url}')
+            self._emit_cache(url, hit)
+            return _CachedResponse(**hit)
+        self._emit_cache(url, None)
+        response = self.get(url, params, timeout)
+        if response.status_code == 200:
+            c.store(key, url, response.status_code, response.content, _response_cache_ttl(url, params))
+        return response
 
     def get_raw_json(self, url, params=None, timeout=30):
         utils.get_yf_logger().debug(f'get_raw_json(): {url}')
@@ -444,24 +873,6 @@ class YfData(metaclass=SingletonMeta):
         response.raise_for_status()
         return response.json()
 
-    def _is_this_consent_url(self, response_url: str) -> bool:
-        """
-        Check if given response_url is consent page
-
-        Args:
-            response_url (str) : response.url
-    
-        Returns:
-            True : This is cookie-consent page
-            False : This is not cookie-consent page
-        """
-        try:
-            return urlsplit(response_url).hostname and urlsplit(
-                response_url
-            ).hostname.endswith("consent.yahoo.com")
-        except Exception:
-            return False
-
     def _accept_consent_form(
         self, consent_resp: requests.Response, timeout: int
     ) -> requests.Response:
@@ -475,51 +886,363 @@ class YfData(metaclass=SingletonMeta):
         Returns:
             response (requests.Response) : Reponse instance received from the server after accepting cookie-consent post.
         """
-        soup = BeautifulSoup(consent_resp.text, "html.parser")
-    
-        # Heuristic: pick the first form; Yahoo's CMP tends to have a single form for consent
-        form = soup.find("form")
-        if not form:
+        form = self._parse_consent_form(consent_resp)
+        if form is None:
             return consent_resp
-    
-        # action : URL to send "Accept Cookies"
-        action = form.get("action") or consent_resp.url
-        action = urljoin(consent_resp.url, action)
-    
-        # Collect inputs (hidden tokens, etc.)
-        """
-        <input name="csrfToken" type="hidden" value="..."/>
-        <input name="sessionId" type="hidden" value="..."/>
-        <input name="originalDoneUrl" type="hidden" value="..."/>
-        <input name="namespace" type="hidden" value="yahoo"/>
-        """
-        data = {}
-        for inp in form.find_all("input"):
-            name = inp.get("name")
-            if not name:
-                continue
-            typ = (inp.get("type") or "text").lower()
-            val = inp.get("value") or ""
-    
-            if typ in ("checkbox", "radio"):
-                # If it's clearly an "agree"/"accept" field or already checked, include it
-                if (
-                    "agree" in name.lower()
-                    or "accept" in name.lower()
-                    or inp.has_attr("checked")
-                ):
-                    data[name] = val if val != "" else "1"
-            else:
-                data[name] = val
-    
-        # If no explicit agree/accept in inputs, add a best-effort flag
-        lowered = {k.lower() for k in data.keys()}
-        if not any(("agree" in k or "accept" in k) for k in lowered):
-            data["agree"] = "1"
-    
-        # Submit the form with "Referer". Some servers check this header as a simple CSRF protection measure.
-        headers = {"Referer": consent_resp.url}
+        action, data, headers = form
         response = self._session.post(
             action, data=data, headers=headers, timeout=timeout, allow_redirects=True
         )
         return response
+
+
+_contexts = {}
+_contexts_lock = threading.Lock()
+
+
+def get_context(name, session=None, proxy=None) -> YfData:
+    """
+    Return named YfData context, creating it on first call.
+
+    Unlike the YfData singleton, each context has its own session, cookie,
+    crumb and rate limiter. Pass it wherever a session is accepted, e.g.
+    Ticker("MSFT", session=ctx), or spread work over several with a Dispatcher.
+    """
+    with _contexts_lock:
+        ctx = _contexts.get(name)
+        if ctx is None:
+            # Bypass SingletonMeta
+            ctx = YfData.__new__(YfData)
+            ctx.__init__(session=session, proxy=proxy, name=name)
+            _contexts[name] = ctx
+        else:
+            if session is not None:
+                ctx._set_session(session)
+            if proxy is not None:
+                ctx._set_proxy(proxy)
+        return ctx
+
+
+class AsyncYfData(_YfDataBase, metaclass=SingletonMeta):
+    """
+    Asyncio twin of YfData, built on curl_cffi's AsyncSession.
+    One event loop can keep hundreds of requests in flight, instead of a thread per request.
+
+    AsyncSession & asyncio.Lock are bound to an event loop, so they are (re)created
+    the first time this singleton is used inside a new running loop.
+    """
+
+    def __init__(self, session=None, proxy=None):
+        self._crumb = None
+        self._cookie = None
+
+        # Default to using 'basic' strategy
+        self._cookie_strategy = 'basic'
+
+        self._cookie_lock = None
+        self._auth = None
+        self._inflight = None
+        self._loop = None
+        self._session_is_caching = False
+        self._user_session = False
+
+        self._session, self._proxy = None, None
+        self._set_session(session)
+        self._set_proxy(proxy)
+
+    def _set_session(self, session):
+        if session is None:
+            return
+
+        if not isinstance(session, requests.AsyncSession):
+            raise YFDataException(f"AsyncYfData requires curl_cffi AsyncSession not {type(session)}. Solution: stop setting session, let YF handle.")
+
+        self._session = session
+        self._user_session = True
+        self._loop = None
+        if self._proxy is not None:
+            self._session.proxies = self._proxy
+
+    def _set_proxy(self, proxy=None):
+        if proxy is not None:
+            proxy = {'http': proxy, 'https': proxy} if isinstance(proxy, str) else proxy
+        else:
+            proxy = {}
+        self._proxy = proxy
+        if self._session is not None:
+            self._session.proxies = proxy
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if not self._user_session:
+            old_session = self._session
+            self._session = requests.AsyncSession(impersonate="chrome")
+            self._session.proxies = self._proxy
+            if old_session is not None:
+                # Keep cookie, so the crumb stays valid
+                self._session.cookies.jar._cookies.update(old_session.cookies.jar._cookies)
+        self._cookie_lock = asyncio.Lock()
+        self._inflight = _AsyncSingleFlight()
+        self._loop = loop
+
+    async def _get_cookie_basic(self, timeout=30):
+        if self._cookie is not None:
+            utils.get_yf_logger().debug('reusing cookie')
+            return True
+        elif self._load_cookie_curlCffi():
+            utils.get_yf_logger().debug('reusing persistent cookie')
+            return True
+
+        # To avoid infinite recursion, do NOT use self.get()
+        try:
+            await self._session.get(
+                url='https://fc.yahoo.com',
+                timeout=timeout,
+                allow_redirects=True)
+        except requests.exceptions.DNSError:
+            # Possible because url on some privacy/ad blocklists
+            return False
+        self._save_cookie_curlCffi()
+        return True
+
+    async def _get_crumb_basic(self, timeout=30):
+        if self._crumb is not None:
+            utils.get_yf_logger().debug('reusing crumb')
+            return self._crumb
+
+        if not await self._get_cookie_basic(timeout):
+            return None
+        crumb_response = await self._session.get(
+            url="https://query1.finance.yahoo.com/v1/test/getcrumb",
+            timeout=timeout,
+            allow_redirects=True)
+        self._crumb = crumb_response.text
+        if crumb_response.status_code == 429 or "Too Many Requests" in self._crumb:
+            utils.get_yf_logger().debug(f"Didn't receive crumb {self._crumb}")
+            raise YFRateLimitError()
+
+        if self._crumb is None or '<html>' in self._crumb:
+            utils.get_yf_logger().debug("Didn't receive crumb")
+            return None
+
+        utils.get_yf_logger().debug(f"crumb = '{self._crumb}'")
+        return self._crumb
+
+    async def _get_cookie_csrf(self, timeout):
+        if self._cookie is not None:
+            utils.get_yf_logger().debug('reusing cookie')
+            return True
+
+        elif self._load_cookie_curlCffi():
+            utils.get_yf_logger().debug('reusing persistent cookie')
+            self._cookie = True
+            return True
+
+        try:
+            response = await self._session.get(url='https://guce.yahoo.com/consent', timeout=timeout)
+        except requests.exceptions.ChunkedEncodingError:
+            utils.get_yf_logger().debug('_get_cookie_csrf() encountering requests.exceptions.ChunkedEncodingError, aborting')
+            return False
+
+        data = self._parse_csrf_consent(response.content)
+        if data is None:
+            return False
+        sessionId = data['sessionId']
+        try:
+            await self._session.post(
+                url=f'https://consent.yahoo.com/v2/collectConsent?sessionId={sessionId}',
+                data=data, timeout=timeout)
+            await self._session.get(
+                url=f'https://guce.yahoo.com/copyConsent?sessionId={sessionId}',
+                data=data, timeout=timeout)
+        except requests.exceptions.ChunkedEncodingError:
+            utils.get_yf_logger().debug('_get_cookie_csrf() encountering requests.exceptions.ChunkedEncodingError, aborting')
+        self._cookie = True
+        self._save_cookie_curlCffi()
+        return True
+
+    async def _get_crumb_csrf(self, timeout=30):
+        if self._crumb is not None:
+            utils.get_yf_logger().debug('reusing crumb')
+            return self._crumb
+
+        if not await self._get_cookie_csrf(timeout):
+            return None
+
+        r = await self._session.get(
+            url='https://query2.finance.yahoo.com/v1/test/getcrumb',
+            timeout=timeout)
+        self._crumb = r.text
+
+        if r.status_code == 429 or "Too Many Requests" in self._crumb:
+            utils.get_yf_logger().debug(f"Didn't receive crumb {self._crumb}")
+            raise YFRateLimitError()
+
+        if self._crumb is None or '<html>' in self._crumb or self._crumb == '':
+            utils.get_yf_logger().debug("Didn't receive crumb")
+            return None
+
+        utils.get_yf_logger().debug(f"crumb = '{self._crumb}'")
+        return self._crumb
+
+    async def _get_cookie_and_crumb(self, timeout=30):
+        self._bind_loop()
+        auth = self._auth
+        if auth is not None and auth.expires > time.time():
+            return auth.crumb, auth.strategy
+
+        async with self._cookie_lock:
+            # Another task may have refreshed while we waited
+            fresh = self._auth_if_valid(auth)
+            if fresh is not None:
+                return fresh.crumb, fresh.strategy
+            if auth is not None and auth is self._auth:
+                # Expired
+                self._crumb = None
+
+            loaded = self._load_auth_curlCffi(auth)
+            if loaded is not None:
+                return loaded.crumb, loaded.strategy
+
+            if self._cookie_strategy == 'csrf':
+                crumb = await self._get_crumb_csrf(timeout)
+                if crumb is None:
+                    # Fail
+                    self._set_cookie_strategy('basic', have_lock=True)
+                    crumb = await self._get_crumb_basic(timeout)
+            else:
+                crumb = await self._get_crumb_basic(timeout)
+                if crumb is None:
+                    # Fail
+                    self._set_cookie_strategy('csrf', have_lock=True)
+                    crumb = await self._get_crumb_csrf(timeout)
+            strategy = self._cookie_strategy
+            self._publish_auth(crumb, strategy)
+        return crumb, strategy
+
+    async def _invalidate_cookie_and_crumb(self, crumb, strategy, timeout=30):
+        async with self._cookie_lock:
+            if self._auth_matches(crumb, strategy):
+                self._forget_auth_curlCffi()
+                self._set_cookie_strategy('csrf' if strategy == 'basic' else 'basic', have_lock=True)
+        return await self._get_cookie_and_crumb(timeout)
+
+    async def get(self, url, params=None, timeout=30):
+        self._bind_loop()
+        key = ('GET', _response_cache_key(url, params))
+        return await self._inflight.do(key, self._get, url, params, timeout)
+
+    async def _get(self, url, params=None, timeout=30):
+        response = await self._make_request(url, request_method=self._session.get, params=params, timeout=timeout)
+
+        if self._is_this_consent_url(response.url):
+            form = self._parse_consent_form(response)
+            if form is not None:
+                action, data, headers = form
+                response = await self._session.post(
+                    action, data=data, headers=headers, timeout=timeout, allow_redirects=True)
+
+        return response
+
+    async def post(self, url, body, params=None, timeout=30):
+        self._bind_loop()
+        key = ('POST', _response_cache_key(url, params, body))
+        return await self._inflight.do(key, self._make_request, url, request_method=self._session.post,
+                                       body=body, params=params, timeout=timeout)
+
+    async def _make_request(self, url, request_method, body=None, params=None, timeout=30):
+        # Important: treat input arguments as immutable.
+        utils.get_yf_logger().debug(f'async url={url[:200]}')
+
+        if params is None:
+            params = {}
+        if 'crumb' in params:
+            raise Exception("Don't manually add 'crumb' to params dict, let data.py handle it")
+
+        crumb, strategy = await self._get_cookie_and_crumb(timeout)
+        crumbs = {'crumb': crumb} if crumb is not None else {}
+
+        request_args = {
+            'url': url,
+            'params': {**params, **crumbs},
+            'timeout': timeout
+        }
+        if body:
+            request_args['json'] = body
+
+        limiter = ratelimit.get_limiter(url)
+        attempt = 0
+        switched_strategy = False
+        waited = 0.0
+        start = time.monotonic()
+        try:
+            while True:
+                response, wait = await self._send(limiter, request_method, request_args)
+                waited += wait
+                utils.get_yf_logger().debug(f'response code={response.status_code}')
+                if response.status_code < 400:
+                    break
+
+                if ratelimit.is_retryable(response.status_code):
+                    if attempt >= ratelimit.max_retries():
+                        break
+                    delay = ratelimit.backoff_delay(attempt, response)
+                    attempt += 1
+                    await asyncio.sleep(delay)
+                    continue
+
+                if response.status_code not in (401, 403) or switched_strategy:
+                    break
+                # Crumb rejected, retry with other cookie strategy
+                switched_strategy = True
+                crumb, strategy = await self._invalidate_cookie_and_crumb(crumb, strategy, timeout)
+                request_args['params']['crumb'] = crumb
+        except Exception:
+            self._emit_request(url, None, start, attempt, switched_strategy, waited)
+            raise
+        self._emit_request(url, response, start, attempt, switched_strategy, waited)
+
+        if response.status_code == 429:
+            raise YFRateLimitError()
+
+        return response
+
+    @staticmethod
+    async def _send(limiter, request_method, request_args):
+        if limiter is None:
+            return await request_method(**request_args), 0.0
+        waited = await limiter.acquire_async()
+        response = None
+        try:
+            response = await request_method(**request_args)
+        finally:
+            limiter.release(None if response is None else response.status_code)
+        return response, waited
+
+    async def cache_get(self, url, params=None, timeout=30):
+        # Shares the persistent response cache with YfData. SQLite lookups
+        # are fast enough to not need an executor.
+        self._bind_loop()
+        key = _response_cache_key(url, params)
+        return await self._inflight.do(('CACHE', key), self._cache_get, key, url, params, timeout)
+
+    async def _cache_get(self, key, url, params, timeout):
+        c = self._response_cache()
+        hit = c.lookup(key)
+        if hit is not None:
+            utils.get_yf_logger().debug(f'cache hit: {url}')
+            self._emit_cache(url, hit)
+            return _CachedResponse(**hit)
+        self._emit_cache(url, None)
+        response = await self.get(url, params, timeout)
+        if response.status_code == 200:
+            c.store(key, url, response.status_code, response.content, _response_cache_ttl(url, params))
+        return response
+
+    async def get_raw_json(self, url, params=None, timeout=30):
+        utils.get_yf_logger().debug(f'get_raw_json(): {url}')
+        response = await self.get(url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import threading
+import time
+from contextlib import contextmanager
+
+from . import utils
+from .data import YfData, get_context
+from .exceptions import YFRateLimitError
+
+
+class Dispatcher:
+    """
+    Spread work over several YfData contexts, e.g. one per egress proxy.
+
+    Strategy 'round_robin' cycles through contexts, 'least_loaded' picks the
+    one with fewest borrowers. A context that received a 429 in the last
+    `quarantine` seconds is skipped, unless all are quarantined.
+
+    Pass to download(..., dispatcher=d) or Tickers(..., dispatcher=d).
+
+    Example:
+        d = yf.Dispatcher({'a': 'http://proxy-a:8080', 'b': 'http://proxy-b:8080'})
+        yf.download(tickers, dispatcher=d)
+    """
+
+    def __init__(self, contexts, strategy='round_robin', quarantine=60):
+        """
+        :param contexts: list of YfData contexts or names, or dict name -> proxy
+        """
+        if strategy not in ('round_robin', 'least_loaded'):
+            raise ValueError(f"Unknown strategy '{strategy}', use 'round_robin' or 'least_loaded'")
+        if isinstance(contexts, dict):
+            contexts = [get_context(name, proxy=proxy) for name, proxy in contexts.items()]
+        else:
+            contexts = [c if isinstance(c, YfData) else get_context(c) for c in contexts]
+        if len(contexts) == 0:
+            raise ValueError("Dispatcher needs at least one context")
+
+        self.contexts = contexts
+        self.strategy = strategy
+        self.quarantine = quarantine
+        self._load = {id(c): 0 for c in contexts}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def _is_quarantined(self, ctx, now):
+        t = ctx._rate_limited_at
+        return t is not None and now - t < self.quarantine
+
+    def _pick(self, exclude=(), assigned=None):
+        # assigned: extra load per context id, on top of current borrowers
+        now = time.time()
+        candidates = [c for c in self.contexts if id(c) not in exclude]
+        healthy = [c for c in candidates if not self._is_quarantined(c, now)]
+        if not healthy:
+            if not candidates:
+                return None
+            # All throttled: pick the one throttled longest ago
+            return min(candidates, key=lambda c: c._rate_limited_at)
+        if self.strategy == 'least_loaded':
+            return min(healthy, key=lambda c: self._load[id(c)] + (assigned or {}).get(id(c), 0))
+        for _ in range(len(self.contexts)):
+            ctx = self.contexts[self._next % len(self.contexts)]
+            self._next += 1
+            if ctx in healthy:
+                return ctx
+        return healthy[0]
+
+    @contextmanager
+    def borrow(self, exclude=()):
+        with self._lock:
+            ctx = self._pick(exclude)
+            if ctx is None:
+                raise YFRateLimitError()
+            self._load[id(ctx)] += 1
+        try:
+            yield ctx
+        finally:
+            with self._lock:
+                self._load[id(ctx)] -= 1
+
+    def assign(self, n):
+        """
+        Pick contexts for n long-lived users, e.g. the tickers of a Tickers.
+        Nothing is borrowed, so for 'least_loaded' these picks count towards
+        each other, spreading them evenly.
+        """
+        with self._lock:
+            assigned = {}
+            contexts = []
+            for _ in range(n):
+                ctx = self._pick(assigned=assigned)
+                assigned[id(ctx)] = assigned.get(id(ctx), 0) + 1
+                contexts.append(ctx)
+        return contexts
+
+    def run(self, fn):
+        """
+        Call fn(ctx) on a context. If it raises YFRateLimitError,
+        retry on each other context before giving up.
+        """
+        tried = set()
+        while True:
+            with self.borrow(exclude=tried) as ctx:
+                try:
+                    return fn(ctx)
+                except YFRateLimitError:
+                    ctx._rate_limited_at = time.time()
+                    tried.add(id(ctx))
+                    utils.get_yf_logger().debug(f"context '{ctx.name}' rate-limited, quarantined")
+                    if len(tried) >= len(self.contexts):
+                        raise
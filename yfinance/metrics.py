@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Request instrumentation, independent of logging.
+
+YfData emits one RequestEvent per request to Yahoo, and one per response-cache
+lookup. Events feed an in-process MetricsRegistry and any registered callbacks:
+
+    yf.metrics.add_callback(lambda e: print(e.endpoint, e.status, e.latency))
+    yf.download(tickers)
+    print(yf.metrics.get_registry().to_prometheus())
+"""
+
+import re
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from . import utils
+
+_config = {
+    'enabled': True,
+}
+
+# kind: 'request' or 'cache'
+# status: HTTP status, None if request raised
+# latency: seconds from first send to final response, including retries
+# retries: resends after 429/5xx; crumb_retries: resends after 401/403 with new crumb
+# rate_limit_wait: seconds spent waiting on client-side rate limiter
+# cache: 'hit' / 'miss' for kind='cache', else None
+RequestEvent = namedtuple('RequestEvent', ['kind', 'endpoint', 'url', 'status', 'latency', 'bytes', 'retries',
+                                           'crumb_retries', 'rate_limit_wait', 'cache', 'context', 'time'])
+
+# Path segments followed by a ticker symbol, replaced to keep label cardinality low
+_SYMBOL_PATH = re.compile(r'/(chart|quoteSummary|timeseries|options|insights|recommendationsbysymbol)/[^/]+')
+
+_LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_BYTES_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7)
+_WAIT_BUCKETS = (0.001, 0.01, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+def endpoint_of(url):
+    """'https://query2.finance.yahoo.com/v8/finance/chart/MSFT' -> '/v8/finance/chart/{symbol}'"""
+    return _SYMBOL_PATH.sub(r'/\1/{symbol}', urlsplit(url).path)
+
+
+def make_event(kind, url, status=None, latency=0.0, nbytes=0, retries=0, crumb_retries=0,
+               rate_limit_wait=0.0, cache=None, context=None):
+    return RequestEvent(kind, endpoint_of(url), url, status, latency, nbytes, retries,
+                        crumb_retries, rate_limit_wait, cache, context, time.time())
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram, as in Prometheus.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, b in enumerate(self.buckets):
+            if value <= b:
+                self.counts[i] += 1
+
+    def to_dict(self):
+        return {'count': self.count, 'sum': self.sum,
+                'buckets': {b: c for b, c in zip(self.buckets, self.counts)}}
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms aggregated from RequestEvents, labelled by endpoint.
+    Thread-safe.
+    """
+
+    _help = {
+        'yf_requests_total': ('counter', 'Requests sent to Yahoo, by final status'),
+        'yf_request_retries_total': ('counter', 'Resends after 429 or 5xx'),
+        'yf_crumb_retries_total': ('counter', 'Resends after crumb rejected with 401/403'),
+        'yf_request_errors_total': ('counter', 'Requests that raised without a response'),
+        'yf_cache_total': ('counter', 'Response cache lookups'),
+        'yf_request_latency_seconds': ('histogram', 'Time from first send to final response'),
+        'yf_response_bytes': ('histogram', 'Response body size'),
+        'yf_rate_limit_wait_seconds': ('histogram', 'Time waiting on client-side rate limiter'),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+
+    def _inc(self, name, labels, value=1):
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def _observe(self, name, labels, value, buckets):
+        key = (name, labels)
+        h = self._histograms.get(key)
+        if h is None:
+            h = self._histograms[key] = Histogram(buckets)
+        h.observe(value)
+
+    def record(self, event):
+        ep = (('endpoint', event.endpoint),)
+        with self._lock:
+            if event.kind == 'cache':
+                self._inc('yf_cache_total', ep + (('result', event.cache),))
+                return
+            if event.status is None:
+                self._inc('yf_request_errors_total', ep)
+            else:
+                self._inc('yf_requests_total', ep + (('status', str(event.status)),))
+                self._observe('yf_response_bytes', ep, event.bytes, _BYTES_BUCKETS)
+            self._observe('yf_request_latency_seconds', ep, event.latency, _LATENCY_BUCKETS)
+            self._observe('yf_rate_limit_wait_seconds', ep, event.rate_limit_wait, _WAIT_BUCKETS)
+            if event.retries:
+                self._inc('yf_request_retries_total', ep, event.retries)
+            if event.crumb_retries:
+                self._inc('yf_crumb_retries_total', ep, event.crumb_retries)
+
+    def to_dict(self):
+        """
+        {metric name: [{'labels': {...}, 'value': number or histogram dict}, ...]}
+        """
+        out = {}
+        with self._lock:
+            for (name, labels), v in sorted(self._counters.items()):
+                out.setdefault(name, []).append({'labels': dict(labels), 'value': v})
+            for (name, labels), h in sorted(self._histograms.items(), key=lambda kv: kv[0]):
+                out.setdefault(name, []).append({'labels': dict(labels), 'value': h.to_dict()})
+        return out
+
+    def to_prometheus(self):
+        """
+        Text exposition format, e.g. to serve from a /metrics endpoint.
+        """
+        def _fmt(labels):
+            if not labels:
+                return ''
+            return '{' + ','.join('{}="{}"'.format(k, str(v).replace('"', '\\"')) for k, v in labels) + '}'
+
+        lines = []
+        data = self.to_dict()
+        for name in sorted(data):
+            kind, desc = self._help.get(name, ('untyped', ''))
+            lines.append(f'# HELP {name} {desc}')
+            lines.append(f'# TYPE {name} {kind}')
+            for sample in data[name]:
+                labels = tuple(sample['labels'].items())
+                v = sample['value']
+                if kind != 'histogram':
+                    lines.append(f'{name}{_fmt(labels)} {v}')
+                    continue
+                for b, c in v['buckets'].items():
+                    lines.append(f'{name}_bucket{_fmt(labels + (("le", repr(float(b))),))} {c}')
+                lines.append(f'{name}_bucket{_fmt(labels + (("le", "+Inf"),))} {v["count"]}')
+                lines.append(f'{name}_sum{_fmt(labels)} {v["sum"]}')
+                lines.append(f'{name}_count{_fmt(labels)} {v["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+_registry = MetricsRegistry()
+_callbacks = []
+_callbacks_lock = threading.Lock()
+
+
+def get_registry():
+    return _registry
+
+
+def add_callback(fn):
+    """
+    Call fn(event) for every RequestEvent. Runs on the requesting thread,
+    so keep it quick. Exceptions are logged and ignored.
+    """
+    with _callbacks_lock:
+        _callbacks.append(fn)
+
+
+def remove_callback(fn):
+    with _callbacks_lock:
+        if fn in _callbacks:
+            _callbacks.remove(fn)
+
+
+def emit(event):
+    if not _config['enabled']:
+        return
+    _registry.record(event)
+    for fn in tuple(_callbacks):
+        try:
+            fn(event)
+        except Exception as e:
+            utils.get_yf_logger().warning(f'metrics callback {fn} failed: {e}')
+
+
+def enabled():
+    return _config['enabled']
+
+
+def configure(enabled=None):
+    if enabled is not None:
+        _config['enabled'] = bool(enabled)
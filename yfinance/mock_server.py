@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Local stand-in for the Yahoo Finance API, for offline tests and benchmarks.
+
+Serves deterministic synthetic data for v8 chart, v7 quote, quoteSummary and
+fundamentals-timeseries, with configurable latency and injected 429s.
+
+    from yfinance.mock_server import MockYahooServer
+    with MockYahooServer(latency=0.05, error_rate=0.1) as server:
+        yf.set_config(transport=server.transport())
+        yf.download(["AAA", "BBB"], period="1y")
+        print(server.stats)
+"""
+
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+import pandas as pd
+
+from . import utils
+from .transport import RewriteTransport
+
+_TZ = 'America/New_York'
+_VALID_RANGES = ["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "10y", "ytd", "max"]
+
+
+def _seed(symbol):
+    return zlib.crc32(symbol.encode('utf-8'))
+
+
+def _bar_times(start, end, interval):
+    """
+    Bar open times, as exchange-local Timestamps, in [start, end).
+    """
+    days = pd.bdate_range(start.tz_convert(_TZ).normalize().tz_localize(None),
+                          end.tz_convert(_TZ).normalize().tz_localize(None))
+    days = days.tz_localize(_TZ)
+    if interval[-1] in ('m', 'h'):
+        minutes = int(interval[:-1]) * (60 if interval[-1] == 'h' else 1)
+        offsets = pd.to_timedelta(np.arange(9 * 60 + 30, 16 * 60, minutes), unit='min')
+        times = pd.DatetimeIndex([d + o for d in days for o in offsets])
+    else:
+        times = days + pd.Timedelta(hours=9, minutes=30)
+        if interval == '5d':
+            times = times[::5]
+        elif interval in ('1wk', '1mo', '3mo'):
+            freq = {'1wk': 'W-SUN', '1mo': 'M', '3mo': 'Q'}[interval]
+            key = times.tz_localize(None).to_period(freq)
+            times = pd.DatetimeIndex(pd.Series(times, index=key).groupby(level=0).first())
+    return times[(times >= start) & (times < end)]
+
+
+def _range_start(rng, end):
+    if rng == 'max':
+        return end - pd.Timedelta(days=365 * 10)
+    if rng == 'ytd':
+        return pd.Timestamp(year=end.year, month=1, day=1, tz='UTC')
+    return end - utils._interval_to_timedelta(rng)
+
+
+# interval: (max days per request, max days back)
+_INTRADAY_LIMITS = {'1m': (8, 30), '2m': (60, 60), '5m': (60, 60), '15m': (60, 60),
+                    '30m': (60, 60), '90m': (60, 60), '60m': (730, 730), '1h': (730, 730)}
+
+
+class _ChartError(Exception):
+    pass
+
+
+def _close_at(steps, base):
+    return base * np.exp(0.02 * np.sin(steps / 9973.0) + 0.1 * np.sin(steps / 104729.0))
+
+
+def chart_payload(symbol, params):
+    interval = params.get('interval', '1d')
+    now = pd.Timestamp.now('UTC')
+    if 'period1' in params or 'period2' in params:
+        start = pd.Timestamp(int(params.get('period1', 0)), unit='s', tz='UTC')
+        end = pd.Timestamp(int(params.get('period2', now.timestamp())), unit='s', tz='UTC')
+    else:
+        end = now
+        start = _range_start(params.get('range', '1mo'), end)
+    end = min(end, now)
+    # Yahoo's per-request and availability limits for intraday
+    limit = _INTRADAY_LIMITS.get(interval)
+    if limit is not None:
+        if end - start > pd.Timedelta(days=limit[0]):
+            raise _ChartError(f"Only {limit[0]} days worth of {interval} granularity data are allowed to be fetched per request.")
+        if start < now - pd.Timedelta(days=limit[1]):
+            raise _ChartError(f"{interval} data not available for startTime={int(start.timestamp())}. "
+                              f"The requested range must be within the last {limit[1]} days.")
+
+    times = _bar_times(start, end, interval)
+    n = len(times)
+    base = 20 + _seed(symbol) % 200
+    # Every value a function of bar time only, so any window over the same
+    # bars returns identical values, like Yahoo
+    origin = pd.Timestamp('2000-01-03', tz=_TZ)
+    steps = ((times - origin) // pd.Timedelta(minutes=1)).to_numpy() if n else np.array([], dtype=np.int64)
+    close = _close_at(steps, base)
+    open_ = close * (1 + 0.002 * np.sin(steps * 0.7 + base))
+    high = np.maximum(open_, close) * (1 + 0.003 * np.abs(np.sin(steps * 1.3)))
+    low = np.minimum(open_, close) * (1 - 0.003 * np.abs(np.cos(steps * 1.7)))
+    volume = 10_000 + (steps * 7919 + base) % 990_000
+    ts = [int(t.timestamp()) for t in times]
+
+    # Quarterly dividend on first business day of each quarter. Like Yahoo, Adj
+    # Close is back-adjusted for every dividend up to now, not just those in the window.
+    dividends = {}
+    adj = np.ones(n)
+    if n and interval[-1] not in ('m', 'h'):
+        days = pd.bdate_range(times[0].tz_convert(_TZ).tz_localize(None).normalize(),
+                              now.tz_convert(_TZ).tz_localize(None).normalize())
+        days = days[(days - pd.offsets.BDay(1)).quarter != days.quarter]
+        div_times = (days + pd.Timedelta(hours=9, minutes=30)).tz_localize(_TZ)
+        div_close = _close_at(((div_times - origin) // pd.Timedelta(minutes=1)).to_numpy(), base)
+        in_window = 'div' in params.get('events', '')
+        for t, c in zip(div_times, div_close):
+            amount = round(float(c) * 0.005, 4)
+            adj[times < t] *= 1 - amount / c
+            if in_window and times[0] <= t <= times[-1]:
+                dividends[str(int(t.timestamp()))] = {'amount': amount, 'date': int(t.timestamp())}
+
+    meta = {
+        'currency': 'USD', 'symbol': symbol, 'exchangeName': 'NMS', 'fullExchangeName': 'NasdaqGS',
+        'instrumentType': 'EQUITY', 'firstTradeDate': 946909800, 'regularMarketTime': int(now.timestamp()),
+        'hasPrePostMarketData': True, 'gmtoffset': int(now.tz_convert(_TZ).utcoffset().total_seconds()),
+        'timezone': now.tz_convert(_TZ).tzname(), 'exchangeTimezoneName': _TZ,
+        'regularMarketPrice': float(close[-1]) if n else float(base), 'priceHint': 2,
+        'dataGranularity': interval, 'range': params.get('range', ''), 'validRanges': _VALID_RANGES,
+    }
+    if n:
+        day = times[-1].normalize()
+        meta['currentTradingPeriod'] = {
+            k: {'timezone': meta['timezone'], 'gmtoffset': meta['gmtoffset'],
+                'start': int((day + pd.Timedelta(hours=h0)).timestamp()),
+                'end': int((day + pd.Timedelta(hours=h1)).timestamp())}
+            for k, h0, h1 in (('pre', 4, 9.5), ('regular', 9.5, 16), ('post', 16, 20))}
+        if interval[-1] in ('m', 'h'):
+            meta['tradingPeriods'] = [[{'timezone': meta['timezone'], 'gmtoffset': meta['gmtoffset'],
+                                        'start': int((d + pd.Timedelta(hours=9.5)).timestamp()),
+                                        'end': int((d + pd.Timedelta(hours=16)).timestamp())}]
+                                      for d in times.normalize().unique()]
+
+    result = {'meta': meta, 'timestamp': ts,
+              'indicators': {'quote': [{'open': open_.round(4).tolist(), 'high': high.round(4).tolist(),
+                                        'low': low.round(4).tolist(), 'close': close.round(4).tolist(),
+                                        'volume': volume.tolist()}]}}
+    if interval[-1] not in ('m', 'h'):
+        result['indicators']['adjclose'] = [{'adjclose': (close * adj).round(4).tolist()}]
+    if dividends:
+        result['events'] = {'dividends': dividends}
+    if not n:
+        del result['timestamp']
+        result['indicators']['quote'] = [{}]
+    return {'chart': {'result': [result], 'error': None}}
+
+
+def quote_payload(symbols):
+    results = []
+    for s in symbols:
+        price = float(20 + _seed(s) % 200)
+        results.append({
+            'symbol': s, 'quoteType': 'EQUITY', 'currency': 'USD', 'exchange': 'NMS',
+            'shortName': f'{s} Inc', 'longName': f'{s} Incorporated',
+            'exchangeTimezoneName': _TZ, 'exchangeTimezoneShortName': 'EDT',
+            'regularMarketPrice': price, 'regularMarketPreviousClose': price * 0.99,
+            'regularMarketVolume': _seed(s) % 1_000_000, 'marketCap': int(price * 1e9),
+            'regularMarketTime': int(time.time()),
+        })
+    return {'quoteResponse': {'result': results, 'error': None}}
+
+
+# Yahoo rejects spark requests for more symbols than this
+_SPARK_MAX_SYMBOLS = 20
+
+
+def spark_payload(symbols, params):
+    results = []
+    for s in symbols:
+        chart = chart_payload(s, params)['chart']['result'][0]
+        meta = {k: chart['meta'][k] for k in ('symbol', 'currency', 'exchangeTimezoneName', 'regularMarketPrice',
+                                              'dataGranularity', 'range')}
+        response = {'meta': meta, 'indicators': {'quote': [{'close': chart['indicators']['quote'][0].get('close', [])}]}}
+        if 'timestamp' in chart:
+            response['timestamp'] = chart['timestamp']
+        results.append({'symbol': s, 'response': [response]})
+    return {'spark': {'result': results, 'error': None}}
+
+
+def quote_summary_payload(symbol, modules):
+    price = float(20 + _seed(symbol) % 200)
+    known = {
+        'financialData': {'currentPrice': price, 'maxAge': 86400},
+        'quoteType': {'symbol': symbol, 'quoteType': 'EQUITY', 'exchange': 'NMS',
+                      'shortName': f'{symbol} Inc', 'longName': f'{symbol} Incorporated',
+                      'timeZoneFullName': _TZ, 'timeZoneShortName': 'EDT'},
+        'summaryDetail': {'previousClose': price * 0.99, 'currency': 'USD', 'marketCap': int(price * 1e9)},
+        'defaultKeyStatistics': {'sharesOutstanding': 1_000_000_000},
+        'assetProfile': {'sector': 'Technology', 'industry': 'Software', 'country': 'United States'},
+    }
+    return {'quoteSummary': {'result': [{m: known.get(m, {}) for m in modules}], 'error': None}}
+
+
+def timeseries_payload(symbol, types, period1, period2):
+    dates = pd.date_range(pd.Timestamp(int(period1), unit='s'), pd.Timestamp(int(period2), unit='s'), freq='QE')
+    results = []
+    for t in types:
+        v = float(_seed(symbol + t) % 10_000)
+        results.append({
+            'meta': {'symbol': [symbol], 'type': [t]},
+            'timestamp': [int(d.timestamp()) for d in dates],
+            t: [{'asOfDate': d.strftime('%Y-%m-%d'), 'periodType': '3M', 'currencyCode': 'USD',
+                 'reportedValue': {'raw': v, 'fmt': str(v)}} for d in dates],
+        })
+    return {'timeseries': {'result': results, 'error': None}}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = 'MockYahoo/1.0'
+
+    def log_message(self, fmt, *args):
+        utils.get_yf_logger().debug('mock_server: ' + fmt % args)
+
+    def _send(self, status, body, content_type='application/json'):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if status == 429:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        self.do_GET()
+
+    def do_GET(self):
+        srv = self.server.owner
+        parts = urlsplit(self.path)
+        path = parts.path
+        q = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+
+        srv.log.append((path, q))
+        if srv.latency:
+            time.sleep(srv.latency)
+        if srv._should_throttle():
+            return self._send(429, b'Too Many Requests', 'text/plain')
+
+        if path.endswith('/v1/test/getcrumb'):
+            return self._send(200, b'mockcrumb', 'text/plain')
+        if path.startswith('/v8/finance/chart/'):
+            try:
+                return self._send(200, chart_payload(path.rsplit('/', 1)[1], q))
+            except _ChartError as e:
+                return self._send(422, {'chart': {'result': None, 'error': {
+                    'code': 'Unprocessable Entity', 'description': str(e)}}})
+        if path.startswith('/v7/finance/spark'):
+            symbols = [s for s in q.get('symbols', '').split(',') if s]
+            if len(symbols) > _SPARK_MAX_SYMBOLS:
+                return self._send(400, {'spark': {'result': None, 'error': {
+                    'code': 'Bad Request', 'description': 'symbols param size too big'}}})
+            try:
+                return self._send(200, spark_payload(symbols, q))
+            except _ChartError as e:
+                return self._send(400, {'spark': {'result': None, 'error': {
+                    'code': 'Bad Request', 'description': str(e)}}})
+        if path.startswith('/v7/finance/quote'):
+            symbols = [s for s in q.get('symbols', '').split(',') if s]
+            return self._send(200, quote_payload(symbols))
+        if path.startswith('/v10/finance/quoteSummary/'):
+            modules = [m for m in q.get('modules', '').split(',') if m]
+            return self._send(200, quote_summary_payload(path.rsplit('/', 1)[1], modules))
+        if '/finance/timeseries/' in path:
+            types = parse_qs(parts.query).get('type', [])
+            if len(types) == 1 and ',' in types[0]:
+                types = types[0].split(',')
+            now = int(time.time())
+            return self._send(200, timeseries_payload(path.rsplit('/', 1)[1], types,
+                                                      q.get('period1', now - 86400 * 365), q.get('period2', now)))
+        if path in ('', '/'):
+            # fc.yahoo.com cookie request
+            return self._send(200, b'', 'text/html')
+        return self._send(404, {'finance': {'result': None, 'error': {'code': 'Not Found', 'description': path}}})
+
+
+class MockYahooServer:
+    """
+    Threaded local HTTP server imitating Yahoo endpoints.
+
+    :param latency: seconds to sleep before answering each request
+    :param error_rate: fraction of requests answered 429, chosen with seeded RNG
+    :param max_rps: answer 429 when more requests/second than this arrive
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, error_rate=0.0, max_rps=None, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self.stats = {'requests': 0, 'throttled': 0}
+        # (path, query params) of every request, for tests
+        self.log = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(max_rps or 0)
+        self._last = time.monotonic()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.owner = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _should_throttle(self):
+        with self._lock:
+            self.stats['requests'] += 1
+            throttle = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if self.max_rps:
+                now = time.monotonic()
+                self._tokens = min(self.max_rps, self._tokens + (now - self._last) * self.max_rps)
+                self._last = now
+                if self._tokens < 1:
+                    throttle = True
+                else:
+                    self._tokens -= 1
+            if throttle:
+                self.stats['throttled'] += 1
+            return throttle
+
+    def transport(self, session=None):
+        """Transport that sends yfinance's Yahoo requests to this server."""
+        return RewriteTransport(self.url, session=session)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='Local mock of the Yahoo Finance API')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-rps', type=float, default=None)
+    args = parser.parse_args()
+    server = MockYahooServer(port=args.port, latency=args.latency, error_rate=args.error_rate, max_rps=args.max_rps)
+    print(f'Serving on {server.url}')
+    server._httpd.serve_forever()
@@ -21,17 +21,20 @@
 
 from __future__ import print_function
 
+import asyncio
+import concurrent.futures as _futures
+import functools
 import logging
+import os
 import time as _time
 import traceback
 from typing import Union
 import warnings
 
-import multitasking as _multitasking
 import pandas as _pd
-from curl_cffi import requests
 
-from . import Ticker, utils
+from . import Ticker, utils, cache
+from .batch import _fetch_quotes
 from .data import YfData
 from . import shared
 from .const import _SENTINEL_
@@ -41,7 +44,8 @@ def download(tickers, start=None, end=None, actions=False, threads=True,
              ignore_tz=None, group_by='column', auto_adjust=None, back_adjust=False,
              repair=False, keepna=False, progress=True, period=None, interval="1d",
              prepost=False, proxy=_SENTINEL_, rounding=False, timeout=10, session=None,
-             multi_level_index=True) -> Union[_pd.DataFrame, None]:
+             multi_level_index=True, dispatcher=None, deadline=None,
+             ticker_timeout=None, stream=False, sink=None) -> Union[_pd.DataFrame, None]:
     """
     Download yahoo tickers
     :Parameters:
@@ -53,6 +57,7 @@ def download(tickers, start=None, end=None, actions=False, threads=True,
             Either Use period parameter or use start and end
         interval : str
             Valid intervals: 1m,2m,5m,15m,30m,60m,90m,1h,1d,5d,1wk,1mo,3mo
+            Other minute/hour intervals e.g. 10m,4h are resampled from a finer interval
             Intraday data cannot extend last 60 days
         start: str
             Download start date string (YYYY-MM-DD) or _datetime, inclusive.
@@ -91,11 +96,24 @@ def download(tickers, start=None, end=None, actions=False, threads=True,
             Optional. Pass your own session object to be used for all requests
         multi_level_index: bool
             Optional. Always return a MultiIndex DataFrame? Default is True
+        dispatcher: None or Dispatcher
+            Optional. Spread tickers over several YfData contexts (e.g. proxies)
+        deadline: None or float
+            Optional. Give up on tickers not finished within this many seconds
+            of starting. They are returned empty, with a timeout error.
+        ticker_timeout: None or float
+            Optional. Give up on a single ticker taking longer than this.
+        stream: bool
+            Optional. Return a generator of (ticker, DataFrame, error) instead,
+            see download_iter(). Default is False
+        sink: None or Sink
+            Optional. Write each ticker to e.g. ParquetSink(path) as soon as it
+            is fetched, instead of combining. Returns per-ticker report of
+            rows written and errors.
     """
     logger = utils.get_yf_logger()
-    session = session or requests.Session(impersonate="chrome")
 
-    # Ensure data initialised with session.
+    # Ensure data initialised with session. No session = use shared pool.
     if proxy is not _SENTINEL_:
         warnings.warn("Set proxy via new config function: yf.set_config(proxy=proxy)", DeprecationWarning, stacklevel=3)
         YfData(proxy=proxy)
@@ -106,6 +124,13 @@ def download(tickers, start=None, end=None, actions=False, threads=True,
         warnings.warn("YF.download() has changed argument auto_adjust default to True", FutureWarning, stacklevel=3)
         auto_adjust = True
 
+    if stream:
+        return download_iter(tickers, start=start, end=end, actions=actions, threads=threads,
+                             auto_adjust=auto_adjust, back_adjust=back_adjust, repair=repair,
+                             keepna=keepna, period=period, interval=interval, prepost=prepost,
+                             rounding=rounding, timeout=timeout, session=session,
+                             dispatcher=dispatcher, deadline=deadline, ticker_timeout=ticker_timeout)
+
     if logger.isEnabledFor(logging.DEBUG):
         if threads:
             # With DEBUG, each thread generates a lot of log messages.
@@ -118,112 +143,315 @@ def download(tickers, start=None, end=None, actions=False, threads=True,
             progress = False
 
     if ignore_tz is None:
-        # Set default value depending on interval
-        if interval[-1] in ['m', 'h']:
-            # Intraday
-            ignore_tz = False
-        else:
-            ignore_tz = True
+        ignore_tz = _default_ignore_tz(interval)
+
+    # accept isin as ticker
+    isins = {}
+    tickers = _parse_tickers(tickers, isins)
+    state = _DownloadState(tickers, isins, progress)
+
+    fetch = functools.partial(_download_one, period=period, interval=interval,
+                              start=start, end=end, prepost=prepost,
+                              actions=actions, auto_adjust=auto_adjust,
+                              back_adjust=back_adjust, repair=repair, keepna=keepna,
+                              rounding=rounding, timeout=timeout,
+                              session=session, dispatcher=dispatcher)
+    threads = _num_threads(threads, len(tickers))
+    _resolve_tzs(tickers, timeout, session, dispatcher)
+
+    if sink is not None:
+        def _fetch_and_write(ticker):
+            # In the worker, so the frame is never held beyond this ticker
+            return sink.write(isins.get(ticker, ticker), fetch(ticker))
+        for ticker, result, err, tb in _iter_downloads(tickers, _fetch_and_write, threads, deadline, ticker_timeout):
+            state.add_written(ticker, result, err, tb)
+        return state.sink_report()
+
+    for ticker, data, err, tb in _iter_downloads(tickers, fetch, threads, deadline, ticker_timeout):
+        state.add(ticker, data, err, tb)
+
+    data = state.combine(ignore_tz, group_by, multi_level_index)
+    state.publish()
+    return data
+
+
+def download_iter(tickers, start=None, end=None, actions=False, threads=True,
+                  auto_adjust=True, back_adjust=False, repair=False, keepna=False,
+                  period=None, interval="1d", prepost=False, rounding=False, timeout=10,
+                  session=None, dispatcher=None, deadline=None, ticker_timeout=None):
+    """
+    Like :func:`download`, but yield ``(ticker, DataFrame, error)`` as each
+    ticker finishes, instead of combining them into one wide DataFrame.
+    error is None on success, else the DataFrame is empty.
+
+    Only ``threads`` tickers are in flight at a time, and each DataFrame is
+    released once consumed, so memory stays flat for any number of tickers.
+    Stopping iteration early cancels the remaining tickers.
+
+    Arguments match :func:`download`. Those about combining (``group_by``,
+    ``ignore_tz``, ``multi_level_index``) and ``progress`` don't apply.
+
+    Example:
+        for ticker, df, err in yf.download_iter(tickers, period='1y'):
+            if err is None:
+                df.to_parquet(f'{ticker}.parquet')
+    """
+    YfData(session=session)
+
+    if threads and utils.get_yf_logger().isEnabledFor(logging.DEBUG):
+        # See download()
+        threads = False
+
+    isins = {}
+    tickers = _parse_tickers(tickers, isins)
+    fetch = functools.partial(_download_one, period=period, interval=interval,
+                              start=start, end=end, prepost=prepost,
+                              actions=actions, auto_adjust=auto_adjust,
+                              back_adjust=back_adjust, repair=repair, keepna=keepna,
+                              rounding=rounding, timeout=timeout,
+                              session=session, dispatcher=dispatcher)
+    threads = _num_threads(threads, len(tickers))
+    _resolve_tzs(tickers, timeout, session, dispatcher)
+    for ticker, data, err, _ in _iter_downloads(tickers, fetch, threads, deadline, ticker_timeout):
+        yield isins.get(ticker, ticker), data, err
+
+
+def _resolve_tzs(tickers, timeout=10, session=None, dispatcher=None):
+    """
+    Fill the tz cache for tickers not yet in it, with one v7 quote request per
+    batch of symbols. Otherwise each ticker's history() costs an extra
+    chart request just to learn its exchange timezone.
+
+    Requests go through the download's session, or one of its dispatcher's
+    contexts. Symbols Yahoo doesn't answer for are left to the per-ticker lookup.
+    """
+    if len(tickers) < 2:
+        # Per-ticker lookup costs the same
+        return
+    logger = utils.get_yf_logger()
+    contexts = dispatcher.contexts if dispatcher is not None else [YfData(session=session)]
+    if not all(ctx._persist_caches() for ctx in contexts):
+        # Transport's answers stay out of the tz cache
+        return
+    c = cache.get_tz_cache()
+    if isinstance(c, cache._TzCacheDummy):
+        # Cache disabled, nowhere to put the answers
+        return
+    try:
+        # Also initialises the cache on first use
+        cached = c.lookup_many(tickers)
+    except Exception as e:
+        logger.debug(f"Skipping bulk timezone lookup, tz cache failed: {e}")
+        return
+    if getattr(c, 'dummy', False) or getattr(c, 'initialised', 1) == 0:
+        # Cache failed to initialise, nowhere to put the answers
+        return
+    missing = [t for t in tickers if t not in cached]
+    if len(missing) < 2:
+        # Warm cache, or per-ticker lookup costs the same
+        return
+
+    def _fetch(session):
+        return _fetch_quotes(missing, fields="exchangeTimezoneName", timeout=timeout, session=session)
+
+    quotes, errors = _fetch(session) if dispatcher is None else dispatcher.run(_fetch)
+    if errors:
+        logger.debug(f"Bulk timezone lookup failed for {len(errors)} tickers, falling back to per-ticker: "
+                     f"{next(iter(errors.values()))!r}")
+    tzs = {q["symbol"].upper(): q.get("exchangeTimezoneName") for q in quotes}
+
+    missing = set(missing)
+    tzs = {t: tz for t, tz in tzs.items() if t in missing and tz and utils.is_valid_timezone(tz)}
+    logger.debug(f"Resolved {len(tzs)}/{len(missing)} timezones in bulk")
+    try:
+        c.store_many(tzs)
+    except Exception as e:
+        logger.debug(f"Failed to store timezones: {e}")
+
+
+def _num_threads(threads, n_tickers):
+    if threads is True:
+        return max(1, min([n_tickers, (os.cpu_count() or 1) * 2]))
+    if not threads:
+        return 1
+    return int(threads)
+
+
+class _DownloadState:
+    """
+    Everything one download() call accumulates. Owned by the call, so
+    concurrent downloads in one process keep their results apart.
+    """
 
+    def __init__(self, tickers, isins, progress=False):
+        self.tickers = tickers
+        self.isins = isins
+        self.dfs = {}
+        self.errors = {}
+        self.tracebacks = {}
+        self.written = {}  # ticker -> (rows, path), when writing to a sink
+        self.progress_bar = utils.ProgressBar(len(tickers), 'completed') if progress else None
+
+    def add(self, ticker, df, error=None, tb=None):
+        self.dfs[ticker] = df
+        self._done(ticker, error, tb)
+
+    def add_written(self, ticker, result, error=None, tb=None):
+        self.written[ticker] = result if error is None else (0, None)
+        self._done(ticker, error, tb)
+
+    def _done(self, ticker, error, tb):
+        if error is not None:
+            self.errors[ticker] = error
+            self.tracebacks[ticker] = tb
+        if self.progress_bar is not None:
+            self.progress_bar.animate()
+
+    def sink_report(self):
+        """
+        DataFrame indexed by ticker: rows written, file path, error
+        """
+        if self.progress_bar is not None:
+            self.progress_bar.completed()
+        if self.errors:
+            _log_errors(self.errors, self.tracebacks)
+        report = _pd.DataFrame(
+            [(self.isins.get(t, t), *self.written.get(t, (0, None)), self.errors.get(t))
+             for t in self.tickers],
+            columns=['Ticker', 'Rows', 'Path', 'Error']).set_index('Ticker')
+        return report
+
+    def combine(self, ignore_tz, group_by, multi_level_index):
+        if self.progress_bar is not None:
+            self.progress_bar.completed()
+        # Preserve ticker order regardless of completion order
+        dfs = {t: self.dfs[t] for t in self.tickers if t in self.dfs}
+        return _combine_results(dfs, self.errors, self.tracebacks, self.isins,
+                                self.tickers, ignore_tz, group_by, multi_level_index)
+
+    def publish(self):
+        # Old code reads yf.shared._ERRORS after download(). Replace, never
+        # mutate, so a reader sees one whole download's results.
+        shared._DFS, shared._ERRORS, shared._TRACEBACKS, shared._ISINS = \
+            self.dfs, self.errors, self.tracebacks, self.isins
+
+
+def _default_ignore_tz(interval):
+    # Set default value depending on interval
+    if interval[-1] in ['m', 'h']:
+        # Intraday
+        return False
+    return True
+
+
+def _parse_tickers(tickers, isins):
     # create ticker list
     tickers = tickers if isinstance(
         tickers, (list, set, tuple)) else tickers.replace(',', ' ').split()
 
     # accept isin as ticker
-    shared._ISINS = {}
     _tickers_ = []
     for ticker in tickers:
         if utils.is_isin(ticker):
             isin = ticker
             ticker = utils.get_ticker_by_isin(ticker)
-            shared._ISINS[ticker] = isin
+            isins[ticker] = isin
         _tickers_.append(ticker)
 
-    tickers = _tickers_
-
-    tickers = list(set([ticker.upper() for ticker in tickers]))
-
-    if progress:
-        shared._PROGRESS_BAR = utils.ProgressBar(len(tickers), 'completed')
-
-    # reset shared._DFS
-    shared._DFS = {}
-    shared._ERRORS = {}
-    shared._TRACEBACKS = {}
-
-    # download using threads
-    if threads:
-        if threads is True:
-            threads = min([len(tickers), _multitasking.cpu_count() * 2])
-        _multitasking.set_max_threads(threads)
-        for i, ticker in enumerate(tickers):
-            _download_one_threaded(ticker, period=period, interval=interval,
-                                   start=start, end=end, prepost=prepost,
-                                   actions=actions, auto_adjust=auto_adjust,
-                                   back_adjust=back_adjust, repair=repair, keepna=keepna,
-                                   progress=(progress and i > 0),
-                                   rounding=rounding, timeout=timeout)
-        while len(shared._DFS) < len(tickers):
-            _time.sleep(0.01)
-    # download synchronously
-    else:
-        for i, ticker in enumerate(tickers):
-            data = _download_one(ticker, period=period, interval=interval,
-                                 start=start, end=end, prepost=prepost,
-                                 actions=actions, auto_adjust=auto_adjust,
-                                 back_adjust=back_adjust, repair=repair, keepna=keepna,
-                                 rounding=rounding, timeout=timeout)
-            if progress:
-                shared._PROGRESS_BAR.animate()
-
-    if progress:
-        shared._PROGRESS_BAR.completed()
-
-    if shared._ERRORS:
-        # Send errors to logging module
-        logger = utils.get_yf_logger()
-        logger.error('\n%.f Failed download%s:' % (
-            len(shared._ERRORS), 's' if len(shared._ERRORS) > 1 else ''))
-
-        # Log each distinct error once, with list of symbols affected
-        errors = {}
-        for ticker in shared._ERRORS:
-            err = shared._ERRORS[ticker]
-            err = err.replace(f'${ticker}: ', '')
-            if err not in errors:
-                errors[err] = [ticker]
-            else:
-                errors[err].append(ticker)
-        for err in errors.keys():
-            logger.error(f'{errors[err]}: ' + err)
-
-        # Log each distinct traceback once, with list of symbols affected
-        tbs = {}
-        for ticker in shared._TRACEBACKS:
-            tb = shared._TRACEBACKS[ticker]
-            tb = tb.replace(f'${ticker}: ', '')
-            if tb not in tbs:
-                tbs[tb] = [ticker]
+    return list(set([ticker.upper() for ticker in _tickers_]))
+
+
+async def download_async(tickers, start=None, end=None, actions=False, max_concurrency=10,
+                         ignore_tz=None, group_by='column', auto_adjust=True, back_adjust=False,
+                         repair=False, keepna=False, period=None, interval="1d",
+                         prepost=False, rounding=False, timeout=10,
+                         multi_level_index=True) -> _pd.DataFrame:
+    """
+    Asyncio variant of :func:`download`. All tickers are fetched on the running
+    event loop through :class:`AsyncYfData`, at most ``max_concurrency`` at a time.
+
+    Arguments match :func:`download`, except ``threads``, ``progress``, ``proxy`` and
+    ``session`` which do not apply. Result is identical.
+    """
+    if ignore_tz is None:
+        ignore_tz = _default_ignore_tz(interval)
+
+    isins = {}
+    tickers = _parse_tickers(tickers, isins)
+    state = _DownloadState(tickers, isins)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def _one(ticker):
+        async with semaphore:
+            try:
+                data = await Ticker(ticker).history_async(
+                    period=period, interval=interval,
+                    start=start, end=end, prepost=prepost,
+                    actions=actions, auto_adjust=auto_adjust,
+                    back_adjust=back_adjust, repair=repair,
+                    rounding=rounding, keepna=keepna, timeout=timeout,
+                    raise_errors=True
+                )
+            except Exception as e:
+                state.add(ticker, utils.empty_df(), repr(e), traceback.format_exc())
             else:
-                tbs[tb].append(ticker)
-        for tb in tbs.keys():
-            logger.debug(f'{tbs[tb]}: ' + tb)
+                state.add(ticker, data)
+
+    await asyncio.gather(*[_one(t) for t in tickers])
+
+    return state.combine(ignore_tz, group_by, multi_level_index)
+
+
+def _log_errors(errors_by_ticker, tracebacks_by_ticker):
+    # Send errors to logging module
+    logger = utils.get_yf_logger()
+    logger.error('\n%.f Failed download%s:' % (
+        len(errors_by_ticker), 's' if len(errors_by_ticker) > 1 else ''))
+
+    # Log each distinct error once, with list of symbols affected
+    errors = {}
+    for ticker in errors_by_ticker:
+        err = errors_by_ticker[ticker]
+        err = err.replace(f'${ticker}: ', '')
+        if err not in errors:
+            errors[err] = [ticker]
+        else:
+            errors[err].append(ticker)
+    for err in errors.keys():
+        logger.error(f'{errors[err]}: ' + err)
+
+    # Log each distinct traceback once, with list of symbols affected
+    tbs = {}
+    for ticker in tracebacks_by_ticker:
+        tb = tracebacks_by_ticker[ticker]
+        tb = tb.replace(f'${ticker}: ', '')
+        if tb not in tbs:
+            tbs[tb] = [ticker]
+        else:
+            tbs[tb].append(ticker)
+    for tb in tbs.keys():
+        logger.debug(f'{tbs[tb]}: ' + tb)
+
+
+def _combine_results(dfs, errors, tracebacks, isins, tickers, ignore_tz, group_by, multi_level_index):
+    if errors:
+        _log_errors(errors, tracebacks)
 
     if ignore_tz:
-        for tkr in shared._DFS.keys():
-            if (shared._DFS[tkr] is not None) and (shared._DFS[tkr].shape[0] > 0):
-                shared._DFS[tkr].index = shared._DFS[tkr].index.tz_localize(None)
+        for tkr in dfs.keys():
+            if (dfs[tkr] is not None) and (dfs[tkr].shape[0] > 0):
+                dfs[tkr].index = dfs[tkr].index.tz_localize(None)
 
     try:
-        data = _pd.concat(shared._DFS.values(), axis=1, sort=True,
-                          keys=shared._DFS.keys(), names=['Ticker', 'Price'])
+        data = _pd.concat(dfs.values(), axis=1, sort=True,
+                          keys=dfs.keys(), names=['Ticker', 'Price'])
     except Exception:
-        _realign_dfs()
-        data = _pd.concat(shared._DFS.values(), axis=1, sort=True,
-                          keys=shared._DFS.keys(), names=['Ticker', 'Price'])
+        dfs = _realign_dfs(dfs)
+        data = _pd.concat(dfs.values(), axis=1, sort=True,
+                          keys=dfs.keys(), names=['Ticker', 'Price'])
     data.index = _pd.to_datetime(data.index, utc=not ignore_tz)
     # switch names back to isins if applicable
-    data.rename(columns=shared._ISINS, inplace=True)
+    data.rename(columns=isins, inplace=True)
 
     if group_by == 'column':
         data.columns = data.columns.swaplevel(0, 1)
@@ -235,50 +463,126 @@ def download(tickers, start=None, end=None, actions=False, threads=True,
     return data
 
 
-def _realign_dfs():
+def _realign_dfs(dfs):
     idx_len = 0
     idx = None
 
-    for df in shared._DFS.values():
+    for df in dfs.values():
         if len(df) > idx_len:
             idx_len = len(df)
             idx = df.index
 
-    for key in shared._DFS.keys():
+    for key in dfs.keys():
         try:
-            shared._DFS[key] = _pd.DataFrame(
-                index=idx, data=shared._DFS[key]).drop_duplicates()
+            dfs[key] = _pd.DataFrame(
+                index=idx, data=dfs[key]).drop_duplicates()
         except Exception:
-            shared._DFS[key] = _pd.concat([
-                utils.empty_df(idx), shared._DFS[key].dropna()
+            dfs[key] = _pd.concat([
+                utils.empty_df(idx), dfs[key].dropna()
             ], axis=0, sort=True)
 
         # remove duplicate index
-        shared._DFS[key] = shared._DFS[key].loc[
-            ~shared._DFS[key].index.duplicated(keep='last')]
+        dfs[key] = dfs[key].loc[
+            ~dfs[key].index.duplicated(keep='last')]
+
+    return dfs
+
+
+def _iter_downloads(tickers, fetch, max_workers, deadline=None, ticker_timeout=None):
+    """
+    Run fetch(ticker) on a thread pool, yielding (ticker, df, error, traceback)
+    as each finishes. error and traceback are None on success.
+
+    At most max_workers tickers run at once, so memory and open requests stay
+    bounded however many tickers. A ticker running longer than ticker_timeout,
+    or still unfinished at deadline, is yielded with a timeout error. Python
+    can't kill its thread, so its result is discarded and later tickers run on
+    fresh threads instead of queueing behind it. Closing the generator cancels
+    the rest.
+    """
+    max_workers = max(1, int(max_workers))
+    end_time = None if deadline is None else _time.monotonic() + deadline
+    pending = iter(tickers)
+    running = {}  # future -> (ticker, [start time] once started)
 
+    def _run(ticker, started):
+        # Timeout counts from here, not from submit
+        started.append(_time.monotonic())
+        return fetch(ticker)
 
-@_multitasking.task
-def _download_one_threaded(ticker, start=None, end=None,
-                           auto_adjust=False, back_adjust=False, repair=False,
-                           actions=False, progress=True, period="max",
-                           interval="1d", prepost=False,
-                           keepna=False, rounding=False, timeout=10):
-    _download_one(ticker, start, end, auto_adjust, back_adjust, repair,
-                         actions, period, interval, prepost, rounding,
-                         keepna, timeout)
-    if progress:
-        shared._PROGRESS_BAR.animate()
+    def _timed_out(ticker, reason):
+        e = TimeoutError(f'{ticker}: {reason}')
+        return ticker, utils.empty_df(), repr(e), ''
+
+    def _new_executor():
+        return _futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='yf-download')
+
+    executors = [_new_executor()]
+    try:
+        while True:
+            while len(running) < max_workers:
+                ticker = next(pending, None)
+                if ticker is None:
+                    break
+                started = []
+                running[executors[-1].submit(_run, ticker, started)] = (ticker, started)
+            if not running:
+                break
+
+            now = _time.monotonic()
+            wait = None
+            if end_time is not None:
+                wait = end_time - now
+            if ticker_timeout is not None:
+                oldest = min(started[0] if started else now for _, started in running.values())
+                wait = oldest + ticker_timeout - now if wait is None else min(wait, oldest + ticker_timeout - now)
+            done, _ = _futures.wait(running, timeout=None if wait is None else max(0.0, wait),
+                                    return_when=_futures.FIRST_COMPLETED)
+
+            for future in done:
+                ticker, _ = running.pop(future)
+                try:
+                    yield ticker, future.result(), None, None
+                except Exception as e:
+                    tb = ''.join(traceback.format_exception(type(e), e, e.__traceback__))
+                    yield ticker, utils.empty_df(), repr(e), tb
+
+            now = _time.monotonic()
+            if ticker_timeout is not None:
+                hung = [(future, ticker) for future, (ticker, started) in running.items()
+                        if started and now - started[0] >= ticker_timeout]
+                if hung:
+                    # Their threads stay busy, so refill from a fresh pool
+                    executors[-1].shutdown(wait=False)
+                    executors.append(_new_executor())
+                for future, ticker in hung:
+                    del running[future]
+                    yield _timed_out(ticker, f'timed out after {ticker_timeout}s')
+            if end_time is not None and now >= end_time:
+                for future, (ticker, _) in list(running.items()):
+                    future.cancel()
+                    yield _timed_out(ticker, f'download deadline of {deadline}s exceeded')
+                running.clear()
+                for ticker in pending:
+                    yield _timed_out(ticker, f'download deadline of {deadline}s exceeded')
+                break
+    finally:
+        # Unsubmitted tickers were never queued. Not shutdown(cancel_futures=True),
+        # that needs Python 3.9.
+        for future in running:
+            future.cancel()
+        for executor in executors:
+            executor.shutdown(wait=False)
 
 
 def _download_one(ticker, start=None, end=None,
                   auto_adjust=False, back_adjust=False, repair=False,
                   actions=False, period="max", interval="1d",
                   prepost=False, rounding=False,
-                  keepna=False, timeout=10):
-    data = None
-    try:
-        data = Ticker(ticker).history(
+                  keepna=False, timeout=10,
+                  session=None, dispatcher=None):
+    def _history(session):
+        return Ticker(ticker, session=session).history(
                 period=period, interval=interval,
                 start=start, end=end, prepost=prepost,
                 actions=actions, auto_adjust=auto_adjust,
@@ -286,12 +590,7 @@ def _download_one(ticker, start=None, end=None,
                 rounding=rounding, keepna=keepna, timeout=timeout,
                 raise_errors=True
         )
-    except Exception as e:
-        # glob try/except needed as current thead implementation breaks if exception is raised.
-        shared._DFS[ticker.upper()] = utils.empty_df()
-        shared._ERRORS[ticker.upper()] = repr(e)
-        shared._TRACEBACKS[ticker.upper()] = traceback.format_exc()
-    else:
-        shared._DFS[ticker.upper()] = data
 
-    return data
+    if dispatcher is None:
+        return _history(session)
+    return dispatcher.run(_history)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+import queue
+import threading
+from contextlib import contextmanager
+from http.cookiejar import CookieJar
+
+from curl_cffi import requests
+from curl_cffi.const import CurlOpt
+
+# Defaults, change with yf.set_config()
+_config = {
+    'size': 16,
+    'impersonate': 'chrome',
+    'http2': True,
+    'keepalive': True,
+    'dns_cache_timeout': 300,  # seconds
+}
+
+
+class SessionPool:
+    """
+    Fixed-size pool of curl_cffi Sessions sharing one cookie jar.
+
+    A request borrows one session exclusively and returns it when done, so each
+    session keeps a single curl handle with its open TLS connections and DNS
+    cache, instead of curl_cffi creating a handle per thread. Sessions are
+    created on demand, up to `size`; beyond that borrowers wait.
+
+    Quacks like a Session for what YfData needs: get, post, cookies, proxies.
+    """
+
+    def __init__(self, size=None, impersonate=None, http2=None, keepalive=None, dns_cache_timeout=None):
+        self.size = max(1, int(size if size is not None else _config['size']))
+        self.impersonate = impersonate if impersonate is not None else _config['impersonate']
+        self.http2 = http2 if http2 is not None else _config['http2']
+        self.keepalive = keepalive if keepalive is not None else _config['keepalive']
+        self.dns_cache_timeout = dns_cache_timeout if dns_cache_timeout is not None else _config['dns_cache_timeout']
+
+        self._jar = CookieJar()
+        self.cookies = requests.Cookies(self._jar)
+        self._proxies = {}
+
+        self._idle = queue.LifoQueue()  # LIFO: hottest connection first
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def _create_session(self):
+        curl_options = {CurlOpt.DNS_CACHE_TIMEOUT: int(self.dns_cache_timeout)}
+        if self.keepalive:
+            curl_options[CurlOpt.TCP_KEEPALIVE] = 1
+        session = requests.Session(
+            impersonate=self.impersonate,
+            # Session is only ever used by one thread at a time
+            use_thread_local_curl=False,
+            http_version=None if self.http2 else 'v1',
+            curl_options=curl_options)
+        session.cookies = self._jar
+        session.proxies = self._proxies
+        return session
+
+    @contextmanager
+    def borrow(self):
+        try:
+            session = self._idle.get_nowait()
+        except queue.Empty:
+            session = None
+            with self._lock:
+                if len(self._sessions) < self.size:
+                    session = self._create_session()
+                    self._sessions.append(session)
+            if session is None:
+                session = self._idle.get()
+        try:
+            yield session
+        finally:
+            self._idle.put(session)
+
+    def request(self, method, url, **kwargs):
+        with self.borrow() as session:
+            return session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    @property
+    def proxies(self):
+        return self._proxies
+
+    @proxies.setter
+    def proxies(self, proxies):
+        self._proxies = proxies
+        with self._lock:
+            for session in self._sessions:
+                session.proxies = proxies
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
+            self._idle = queue.LifoQueue()
+
+
+def configure(size=None, http2=None, keepalive=None, dns_cache_timeout=None):
+    if size is not None:
+        _config['size'] = int(size)
+    if http2 is not None:
+        _config['http2'] = bool(http2)
+    if keepalive is not None:
+        _config['keepalive'] = bool(keepalive)
+    if dns_cache_timeout is not None:
+        _config['dns_cache_timeout'] = int(dns_cache_timeout)
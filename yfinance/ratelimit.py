@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Client-side throttling of Yahoo requests, one limiter per host.
+
+Each limiter combines a token bucket (requests per second) with a cap on
+concurrent requests. Until Yahoo answers 429, requests are only capped at
+max_concurrency, unpaced unless a rate is set. After that both adapt
+AIMD-style: a 429 halves them, every successful response nudges them back up.
+So bulk jobs settle at whatever rate Yahoo currently tolerates, without the
+caller sleeping between tickers.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from . import utils
+
+# Defaults, change with yf.set_config()
+_config = {
+    'enabled': True,
+    'rate': None,           # starting requests/second per host, None = unpaced until a 429
+    'max_rate': 50.0,
+    'min_rate': 0.2,
+    'max_concurrency': 32,  # ceiling for adaptive concurrency per host
+    'retries': 3,           # retries on 429/5xx
+    'backoff_base': 1.0,    # seconds
+    'backoff_cap': 30.0,
+}
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+class HostRateLimiter:
+    """
+    Token bucket + AIMD concurrency limit for one host. Thread-safe.
+    """
+
+    # Ignore further 429s this soon after a decrease: they were already in flight
+    _decrease_cooldown = 1.0
+
+    def __init__(self, host, rate, max_rate, min_rate, max_concurrency):
+        self.host = host
+        self.max_rate = float(max_rate)
+        self.min_rate = float(min_rate)
+        # No pacing without a rate, until Yahoo pushes back
+        self._paced = rate is not None
+        self.rate = float(rate) if rate is not None else self.max_rate
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.concurrency = float(self.max_concurrency)
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        burst = max(1.0, self.rate)
+        self._tokens = min(burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def _try_acquire(self):
+        """
+        Take a concurrency slot and a token if possible.
+        Return 0 on success, else seconds to wait before trying again.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if self._in_flight >= int(self.concurrency):
+            return None
+        if not self._paced:
+            self._in_flight += 1
+            return 0
+        if self._tokens < 1.0:
+            return (1.0 - self._tokens) / self.rate
+        self._tokens -= 1.0
+        self._in_flight += 1
+        return 0
+
+    def acquire(self):
+        """
+        Block until allowed to send. Return seconds spent waiting.
+        """
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                wait = self._try_acquire()
+                if wait == 0:
+                    break
+                # None = waiting on a slot, notified on release
+                self._cond.wait(wait)
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            utils.get_yf_logger().debug(f'rate limiter {self.host}: waited {waited:.3f}s')
+        return waited
+
+    async def acquire_async(self):
+        start = time.monotonic()
+        while True:
+            with self._cond:
+                wait = self._try_acquire()
+            if wait == 0:
+                break
+            await asyncio.sleep(wait if wait is not None else 0.01)
+        return time.monotonic() - start
+
+    def release(self, status_code=None):
+        """
+        Free the slot and adapt to the response. status_code=None means
+        request failed without a response, which does not change limits.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if status_code == 429:
+                now = time.monotonic()
+                if now - self._last_decrease > self._decrease_cooldown:
+                    self._last_decrease = now
+                    self._paced = True
+                    self.rate = max(self.min_rate, self.rate * 0.5)
+                    self.concurrency = max(1.0, self.concurrency * 0.5)
+                    self._tokens = min(self._tokens, 0.0)
+                    utils.get_yf_logger().debug(
+                        f'rate limiter {self.host}: throttled, now {self.rate:.2f}/s x{int(self.concurrency)}')
+            elif status_code is not None and status_code < 400:
+                # Additive increase, ~+1 per 'window' of successful requests
+                self.rate = min(self.max_rate, self.rate + 1.0 / self.rate)
+                self.concurrency = min(float(self.max_concurrency), self.concurrency + 1.0 / self.concurrency)
+            self._cond.notify_all()
+
+
+def get_limiter(url, limiters=None):
+    """
+    Return limiter for url's host, or None if rate limiting disabled.
+    :param limiters: dict host->limiter to use instead of process-wide one
+    """
+    if not _config['enabled']:
+        return None
+    if limiters is None:
+        limiters = _limiters
+    host = urlsplit(url).netloc
+    limiter = limiters.get(host)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = limiters.get(host)
+            if limiter is None:
+                limiter = HostRateLimiter(host, _config['rate'], _config['max_rate'],
+                                          _config['min_rate'], _config['max_concurrency'])
+                limiters[host] = limiter
+    return limiter
+
+
+def is_retryable(status_code):
+    return status_code == 429 or status_code >= 500
+
+
+def max_retries():
+    return _config['retries']
+
+
+def backoff_delay(attempt, response=None):
+    """
+    Full-jitter exponential backoff. Honours Retry-After if Yahoo sends it.
+    """
+    if response is not None:
+        headers = getattr(response, 'headers', None) or {}
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                return min(_config['backoff_cap'], float(retry_after))
+            except (TypeError, ValueError):
+                pass
+    ceiling = min(_config['backoff_cap'], _config['backoff_base'] * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+def configure(enabled=None, rate=None, max_concurrency=None, retries=None):
+    if enabled is not None:
+        _config['enabled'] = bool(enabled)
+    if rate is not None:
+        _config['rate'] = float(rate)
+        _config['max_rate'] = max(_config['max_rate'], float(rate))
+    if max_concurrency is not None:
+        _config['max_concurrency'] = int(max_concurrency)
+    if retries is not None:
+        _config['retries'] = int(retries)
+    # New settings apply to new limiters
+    with _limiters_lock:
+        _limiters.clear()
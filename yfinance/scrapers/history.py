@@ -1,4 +1,6 @@
-from curl_cffi import requests
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import copy
 from math import isclose
 import bisect
 import datetime as _datetime
@@ -6,13 +8,229 @@ import dateutil as _dateutil
 import logging
 import numpy as np
 import pandas as pd
+import threading
 import time as _time
 import warnings
 
-from yfinance import shared, utils
+from yfinance import cache, utils
+from yfinance.data import AsyncYfData
 from yfinance.const import _BASE_URL_, _PRICE_COLNAMES_, _SENTINEL_
 from yfinance.exceptions import YFInvalidPeriodError, YFPricesMissingError, YFTzMissingError, YFRateLimitError
 
+# History store: re-fetch this much before last stored bar, to replace
+# any partial bar and detect Yahoo revising the past.
+_STORE_OVERLAP = 7 * 24 * 3600
+_STORE_EVENTS = ('dividends', 'splits', 'capitalGains')
+
+
+def _chart_result(data):
+    # Return chart result with prices, or None
+    try:
+        result = data["chart"]["result"][0]
+    except (KeyError, IndexError, TypeError):
+        return None
+    if not result.get('timestamp'):
+        return None
+    return result
+
+
+def _trim_chart_result(result, start, end):
+    # Keep bars and events in [start, end)
+    ts = np.array(result['timestamp'], dtype=np.int64)
+    i0, i1 = np.searchsorted(ts, start, 'left'), np.searchsorted(ts, end, 'left')
+    out = dict(result)
+    out['timestamp'] = result['timestamp'][i0:i1]
+    out['indicators'] = {k: [{c: v[i0:i1] for c, v in result['indicators'][k][0].items()}]
+                         for k in result['indicators']}
+    if 'events' in result:
+        out['events'] = {k: {d: e for d, e in v.items() if start <= int(d) < end}
+                         for k, v in result['events'].items()}
+    return out
+
+
+def _merge_chart_results(old, new):
+    # Stored bars up to new's first bar, then all of new. Meta from new.
+    ts = old['timestamp']
+    n = bisect.bisect_left(ts, new['timestamp'][0])
+    out = dict(new)
+    out['timestamp'] = ts[:n] + new['timestamp']
+    out['indicators'] = {}
+    for k in new['indicators']:
+        old_cols = old['indicators'].get(k, [{}])[0]
+        out['indicators'][k] = [{c: old_cols.get(c, [None] * len(ts))[:n] + v
+                                 for c, v in new['indicators'][k][0].items()}]
+    events = {}
+    for k in set(old.get('events', {})) | set(new.get('events', {})):
+        events[k] = {**old.get('events', {}).get(k, {}), **new.get('events', {}).get(k, {})}
+    if events:
+        out['events'] = events
+    return out
+
+
+def _chart_past_changed(old, new):
+    """
+    True if new shows the stored past is now wrong: a dividend/split not
+    stored, which changes back-adjustment, or revised overlapping prices.
+    """
+    old_events = old.get('events', {})
+    for k in _STORE_EVENTS:
+        if set(new.get('events', {}).get(k, {})) - set(old_events.get(k, {})):
+            return True
+
+    # Compare overlapping bars, except old's last which may have been live
+    old_ts = old['timestamp'][:-1]
+    common, i_old, i_new = np.intersect1d(old_ts, new['timestamp'], return_indices=True)
+    if len(common) == 0:
+        return False
+    for k, col in (('quote', 'close'), ('adjclose', 'adjclose')):
+        if k not in old['indicators'] or k not in new['indicators']:
+            continue
+        a = np.array(old['indicators'][k][0][col], dtype=float)[i_old]
+        b = np.array(new['indicators'][k][0][col], dtype=float)[i_new]
+        if not np.allclose(a, b, rtol=1e-4, equal_nan=True):
+            return True
+    return False
+
+
+# Longest range Yahoo serves in one intraday request, seconds. Longer
+# ranges are split into windows of this size and fetched concurrently.
+_INTRADAY_WINDOW = {
+    '1m': 7 * 86400,
+    '60m': 729 * 86400, '1h': 729 * 86400,
+}
+# How far back Yahoo has intraday data. A range starting earlier is refused
+# outright, so start it here to not lose the part that is available.
+_INTRADAY_AVAILABLE = {
+    '1m': 30 * 86400,
+    '2m': 60 * 86400, '5m': 60 * 86400, '15m': 60 * 86400, '30m': 60 * 86400, '90m': 60 * 86400,
+    '60m': 730 * 86400, '1h': 730 * 86400,
+}
+_MAX_WINDOW_THREADS = 4
+
+# Intraday intervals Yahoo serves, in minutes, coarsest first. Any other
+# minute/hour interval is fetched at the coarsest of these that divides it
+# and resampled locally, e.g. 10m from 5m and 4h from 1h. Yahoo can return
+# 60m bars for 30m, so 30m is built from 15m too.
+_INTRADAY_BASES = (('1h', 60), ('15m', 15), ('5m', 5), ('2m', 2), ('1m', 1))
+_INTRADAY_NATIVE = ('1m', '2m', '5m', '15m', '60m', '90m', '1h')
+
+
+def _intraday_base(interval):
+    # Yahoo interval to fetch for a custom intraday interval, else None
+    if interval in _INTRADAY_NATIVE or interval[-1] not in ('m', 'h') or not interval[:-1].isdigit():
+        return None
+    minutes = int(interval[:-1]) * (60 if interval[-1] == 'h' else 1)
+    if minutes == 0:
+        return None
+    return next(base for base, m in _INTRADAY_BASES if minutes % m == 0)
+
+
+# Per-ticker cache of daily prices. A range reaching "now" also serves later
+# requests up to now for this long, then today's bar is considered stale.
+_DAILY_CACHE_TTL = 60
+# Intervals derivable from daily bars, by _resample()
+_DAILY_DERIVED = ('1wk', '1mo', '3mo')
+# Range periods whose start date can be computed locally
+_DAILY_CACHE_RANGES = ('1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd')
+
+
+def _merge_trading_periods(tps_list):
+    # Concatenate per-window tradingPeriods, dropping days repeated where
+    # windows meet. Lists hold one inner list per day.
+    tps_list = [t for t in tps_list if t]
+    if not tps_list:
+        return None
+    if isinstance(tps_list[0], list):
+        days = [day for tps in tps_list for day in tps]
+        keep = _first_of_each_day(days)
+        return [days[i] for i in keep]
+    merged = {k: [day for tps in tps_list for day in tps.get(k, [])] for k in tps_list[0]}
+    if 'regular' not in merged:
+        return tps_list[-1]
+    keep = _first_of_each_day(merged['regular'])
+    return {k: [v[i] for i in keep if i < len(v)] for k, v in merged.items()}
+
+
+def _first_of_each_day(days):
+    seen, keep = set(), []
+    for i, day in enumerate(days):
+        start = day[0]['start'] if day else None
+        if start not in seen:
+            seen.add(start)
+            keep.append(i)
+    return sorted(keep, key=lambda i: days[i][0]['start'] if days[i] else 0)
+
+
+def _merge_chart_windows(datas):
+    """
+    Merge chart responses of adjacent windows into one response, de-duplicating
+    overlapping bars. Windows Yahoo returned no prices for are skipped, unless
+    all are, then return first so its error is reported.
+    """
+    results = sorted((r for r in (_chart_result(d) for d in datas) if r is not None),
+                     key=lambda r: r['timestamp'][0])
+    if not results:
+        return datas[0]
+    merged = results[0]
+    for r in results[1:]:
+        merged = _merge_chart_results(merged, r)
+    tps = _merge_trading_periods([r['meta'].get('tradingPeriods') for r in results])
+    if tps is not None:
+        merged['meta'] = dict(merged['meta'], tradingPeriods=tps)
+    return {'chart': {'result': [merged], 'error': None}}
+
+
+# Called with (ticker, stages) after every history(), see set_config(history_profile=...)
+_profile_hook = None
+
+
+class _StageProfiler:
+    """
+    Wall & CPU seconds, and rows out, per stage of one history() call.
+    lap() closes the stage that began at the previous lap/mark. Stages
+    repeated, e.g. decode of each intraday window, are summed.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self._lock = threading.Lock()
+        self.mark()
+
+    def mark(self):
+        # CPU clock is per-thread, so re-mark when processing moves thread
+        self._wall, self._cpu = _time.perf_counter(), _time.thread_time()
+
+    def lap(self, stage, rows=None):
+        wall, cpu = _time.perf_counter(), _time.thread_time()
+        self.add(stage, wall - self._wall, cpu - self._cpu, rows)
+        self._wall, self._cpu = wall, cpu
+
+    def add(self, stage, wall, cpu, rows=None):
+        with self._lock:
+            s = self.stages.setdefault(stage, {'wall': 0.0, 'cpu': 0.0, 'rows': None, 'calls': 0})
+            s['wall'] += wall
+            s['cpu'] += cpu
+            s['calls'] += 1
+            if rows is not None:
+                s['rows'] = rows
+
+
+class _NoProfiler:
+    stages = None
+
+    def mark(self):
+        pass
+
+    def lap(self, stage, rows=None):
+        pass
+
+    def add(self, stage, wall, cpu, rows=None):
+        pass
+
+
+_NO_PROFILER = _NoProfiler()
+
+
 class PriceHistory:
     def __init__(self, data, ticker, tz, session=None, proxy=_SENTINEL_):
         self._data = data
@@ -21,9 +239,11 @@ class PriceHistory:
         if proxy is not _SENTINEL_:
             warnings.warn("Set proxy via new config function: yf.set_config(proxy=proxy)", DeprecationWarning, stacklevel=5)
             self._data._set_proxy(proxy)
-        self.session = session or requests.Session(impersonate="chrome")
+        self.session = session
 
         self._history_cache = {}
+        # {repair: {'df', 'start', 'end', 'open', 'time', 'metadata'}}, see _daily_cache_put()
+        self._daily_cache = {}
         self._history_metadata = None
         self._history_metadata_formatted = False
 
@@ -35,7 +255,7 @@ class PriceHistory:
                 start=None, end=None, prepost=False, actions=True,
                 auto_adjust=True, back_adjust=False, repair=False, keepna=False,
                 proxy=_SENTINEL_, rounding=False, timeout=10,
-                raise_errors=False) -> pd.DataFrame:
+                raise_errors=False, profile=False, adj_factor=False) -> pd.DataFrame:
         """
         :Parameters:
             period : str
@@ -44,7 +264,10 @@ class PriceHistory:
               | Can combine with start/end e.g. end = start + period
             interval : str
               | Valid intervals: 1m,2m,5m,15m,30m,60m,90m,1h,1d,5d,1wk,1mo,3mo
+              | Other minute/hour intervals e.g. 3m,10m,2h,4h are resampled from a
+              | finer interval, with bars counted from each session's open
               | Intraday data cannot extend last 60 days
+              | Intraday ranges longer than one Yahoo request allows are fetched in parallel windows
             start : str
               | Download start date string (YYYY-MM-DD) or _datetime, inclusive.
               | Default: 99 years ago
@@ -76,13 +299,204 @@ class PriceHistory:
               | Default: 10 seconds
             raise_errors : bool
                 If True, then raise errors as Exceptions instead of logging.
+            profile : bool or callable
+              | Time each stage (fetch, decode, parse, ..., repair, adjust).
+              | True: put into history_metadata['profile'].
+              | Callable: also call profile(ticker, stages).
+              | Default: False
+            adj_factor : bool
+              | Return unadjusted OHLC, with column 'Adj Factor' = Adj Close / Close
+              | instead of 'Adj Close'. auto_adjust and back_adjust are ignored.
+              | Get adjusted prices from the same frame with yf.utils.auto_adjust(df)
+              | or yf.utils.back_adjust(df), without fetching again.
+              | Default: False
         """
-        logger = utils.get_yf_logger()
-
         if proxy is not _SENTINEL_:
             warnings.warn("Set proxy via new config function: yf.set_config(proxy=proxy)", DeprecationWarning, stacklevel=5)
             self._data._set_proxy(proxy)
 
+        prof = _StageProfiler() if profile or _profile_hook is not None else _NO_PROFILER
+        request = self._prepare_history_request(period, interval, start, end, prepost, repair, raise_errors)
+        if request is None:
+            return utils.empty_df()
+        prof.lap('prepare')
+
+        finish_args = (actions, auto_adjust, back_adjust, adj_factor, keepna, rounding, raise_errors, prof)
+        span = self._daily_span(request)
+        if span is not None:
+            df = self._history_from_daily_cache(request, span, repair, *finish_args)
+            if df is not None:
+                self._report_profile(prof, profile)
+                return df
+
+        windows = self._split_history_request(request)
+        if windows is None:
+            data = self._fetch_history_json(request, timeout, raise_errors, profiler=prof)
+        else:
+            workers = min(len(windows), _MAX_WINDOW_THREADS)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='yf-window') as executor:
+                datas = list(executor.map(lambda w: self._fetch_history_json(w, timeout, raise_errors, profiler=prof),
+                                          windows))
+            data = _merge_chart_windows(datas)
+        prof.lap('fetch')
+        df = self._process_history_json(data, request, span, prepost, repair, *finish_args)
+        self._report_profile(prof, profile)
+        return df
+
+    def _report_profile(self, prof, profile):
+        if prof is _NO_PROFILER:
+            return
+        if self._history_metadata is not None:
+            self._history_metadata['profile'] = prof.stages
+        if callable(profile):
+            profile(self.ticker, prof.stages)
+        if _profile_hook is not None:
+            _profile_hook(self.ticker, prof.stages)
+
+    async def history_async(self, period=None, interval="1d",
+                            start=None, end=None, prepost=False, actions=True,
+                            auto_adjust=True, back_adjust=False, repair=False, keepna=False,
+                            rounding=False, timeout=10, raise_errors=False, profile=False,
+                            adj_factor=False) -> pd.DataFrame:
+        """
+        Asyncio variant of :meth:`history`, same arguments.
+        The Yahoo fetch is awaited on :class:`AsyncYfData`. Parsing is CPU-only
+        so runs inline, except with repair=True which may fetch finer-grained
+        data, so is moved to a worker thread to avoid blocking the event loop.
+        """
+        prof = _StageProfiler() if profile or _profile_hook is not None else _NO_PROFILER
+        request = self._prepare_history_request(period, interval, start, end, prepost, repair, raise_errors)
+        if request is None:
+            return utils.empty_df()
+        prof.lap('prepare')
+
+        finish_args = (actions, auto_adjust, back_adjust, adj_factor, keepna, rounding, raise_errors, prof)
+        span = self._daily_span(request)
+        if span is not None:
+            df = self._history_from_daily_cache(request, span, repair, *finish_args)
+            if df is not None:
+                self._report_profile(prof, profile)
+                return df
+
+        windows = self._split_history_request(request)
+        if windows is None:
+            data = await self._fetch_history_json_async(request, timeout, raise_errors, profiler=prof)
+        else:
+            datas = await asyncio.gather(*[self._fetch_history_json_async(w, timeout, raise_errors, profiler=prof)
+                                           for w in windows])
+            data = _merge_chart_windows(datas)
+        prof.lap('fetch')
+        process_args = (data, request, span, prepost, repair, *finish_args)
+        if repair:
+            loop = asyncio.get_running_loop()
+            df = await loop.run_in_executor(None, lambda: self._process_history_json(*process_args))
+        else:
+            df = self._process_history_json(*process_args)
+        self._report_profile(prof, profile)
+        return df
+
+    @staticmethod
+    def _daily_span(request):
+        """
+        If request can be answered from daily bars, return its (start, end) as
+        epoch seconds, else None.
+        """
+        interval, interval_user = request['interval'], request['interval_user']
+        if interval != '1d' and not (interval == interval_user and interval in _DAILY_DERIVED):
+            return None
+        params = request['params']
+        if params.get('period1') is not None and params.get('period2') is not None:
+            return params['period1'], params['period2']
+        period, tz = params.get('range'), request['tz']
+        if period not in _DAILY_CACHE_RANGES or tz is None:
+            return None
+        now = pd.Timestamp.now(tz)
+        if period == 'ytd':
+            start = int(pd.Timestamp(year=now.year, month=1, day=1, tz=tz).timestamp())
+        else:
+            start = int((now.normalize() - utils._interval_to_timedelta(period)).timestamp())
+        return start, int(now.timestamp())
+
+    def _daily_cache_get(self, span, repair):
+        entry = self._daily_cache.get(repair)
+        if entry is None:
+            return None
+        start, end = span
+        if start < entry['start']:
+            return None
+        if entry['open']:
+            # Still-trading last bar and adjustments may have moved since
+            if _time.time() - entry['time'] >= _DAILY_CACHE_TTL:
+                return None
+        elif end > entry['end']:
+            return None
+        return entry
+
+    def _daily_cache_put(self, span, repair, df):
+        now = _time.time()
+        self._daily_cache[repair] = {
+            'df': df, 'start': span[0], 'end': span[1],
+            'open': span[1] >= now - _DAILY_CACHE_TTL, 'time': now,
+            'metadata': copy.deepcopy(self._history_metadata)}
+
+    def _history_from_daily_cache(self, request, span, repair, actions, auto_adjust, back_adjust, adj_factor, keepna,
+                                  rounding, raise_errors, profiler=_NO_PROFILER):
+        # Slice of cached daily prices, resampled if coarser interval wanted.
+        # None if not cached.
+        entry = self._daily_cache_get(span, repair)
+        if entry is None:
+            return None
+        utils.get_yf_logger().debug(f'{self.ticker}: serving {request["interval_user"]} from cached daily prices')
+        df = entry['df']
+        start = pd.Timestamp(span[0], unit='s', tz='UTC')
+        end = pd.Timestamp(span[1], unit='s', tz='UTC')
+        df = df[(df.index >= start) & (df.index < end)].copy()
+        self._history_metadata = copy.deepcopy(entry['metadata'])
+        self._history_metadata_formatted = False
+        profiler.lap('cache', len(df))
+        request = dict(request, interval='1d')
+        return self._finish_history(df, request, actions, auto_adjust, back_adjust, adj_factor, keepna, rounding,
+                                    raise_errors, profiler)
+
+    def _process_history_json(self, data, request, span, prepost, repair, actions, auto_adjust, back_adjust,
+                              adj_factor, keepna, rounding, raise_errors, profiler=_NO_PROFILER) -> pd.DataFrame:
+        # If span given, also keep daily prices for _history_from_daily_cache()
+        df = self._process_history_json_raw(data, request, prepost, repair, raise_errors, profiler)
+        if df is None:
+            return utils.empty_df()
+        if span is not None and request['interval'] == '1d' and not df.empty:
+            self._daily_cache_put(span, repair, df)
+            df = df.copy()
+        return self._finish_history(df, request, actions, auto_adjust, back_adjust, adj_factor, keepna, rounding,
+                                    raise_errors, profiler)
+
+    @staticmethod
+    def _split_history_request(request):
+        """
+        If an intraday date range is longer than Yahoo serves in one request,
+        return one request per window, else None.
+        """
+        params = request['params']
+        window = _INTRADAY_WINDOW.get(params['interval'])
+        start, end = params.get('period1'), params.get('period2')
+        if window is None or start is None or end is None or end - start <= window:
+            return None
+
+        stale_before = _time.time() - 30 * 60
+        windows = []
+        for p1 in range(int(start), int(end), window):
+            p2 = min(p1 + window, int(end))
+            # Like whole request, only a window fully in the past is cacheable
+            windows.append(dict(request, params=dict(params, period1=p1, period2=p2),
+                                use_cache=p2 <= stale_before))
+        utils.get_yf_logger().debug(f'Splitting {params["interval"]} request into {len(windows)} windows')
+        return windows
+
+    def _prepare_history_request(self, period, interval, start, end, prepost, repair, raise_errors):
+        # Translate user arguments into Yahoo chart request.
+        # Returns None if request impossible (error already handled).
+        logger = utils.get_yf_logger()
+
         interval_user = interval
         period_user = period
         if repair and interval in ["5d", "1wk", "1mo", "3mo"]:
@@ -96,13 +510,11 @@ class PriceHistory:
                     # Every valid ticker has a timezone. A missing timezone is a problem.
                     _exception = YFTzMissingError(self.ticker)
                     err_msg = str(_exception)
-                    shared._DFS[self.ticker] = utils.empty_df()
-                    shared._ERRORS[self.ticker] = err_msg.split(': ', 1)[1]
                     if raise_errors:
                         raise _exception
                     else:
                         logger.error(err_msg)
-                    return utils.empty_df()
+                    return None
                 if period == 'ytd':
                     start = _datetime.date(pd.Timestamp.utcnow().tz_convert(tz).year, 1, 1)
                 else:
@@ -112,6 +524,9 @@ class PriceHistory:
                 period_user = period
                 period = None
             interval = '1d'
+        elif _intraday_base(interval) is not None:
+            interval = _intraday_base(interval)
+            logger.debug(f'{self.ticker}: fetching {interval} to resample to {interval_user}')
 
         start_user = start
         end_user = end
@@ -122,13 +537,11 @@ class PriceHistory:
                 # Every valid ticker has a timezone. A missing timezone is a problem.
                 _exception = YFTzMissingError(self.ticker)
                 err_msg = str(_exception)
-                shared._DFS[self.ticker] = utils.empty_df()
-                shared._ERRORS[self.ticker] = err_msg.split(': ', 1)[1]
                 if raise_errors:
                     raise _exception
                 else:
                     logger.error(err_msg)
-                return utils.empty_df()
+                return None
 
         if start:
             start_dt = utils._parse_user_dt(start, tz)
@@ -152,7 +565,7 @@ class PriceHistory:
                     end = int(_time.time())
                 if start is None:
                     if interval == "1m":
-                        start = end - 691200  # 8 days
+                        start = end - 2592000  # 30 days, fetched in windows
                     elif interval in ("2m", "5m", "15m", "30m", "90m"):
                         start = end - 5184000  # 60 days
                     elif interval in ("1h", "60m"):
@@ -180,10 +593,12 @@ class PriceHistory:
 
         params["interval"] = interval.lower()
         params["includePrePost"] = prepost
-
-        # 1) fix weird bug with Yahoo! - returning 60m for 30m bars
-        if params["interval"] == "30m":
-            params["interval"] = "15m"
+        if "period1" in params and params["interval"] in _INTRADAY_AVAILABLE:
+            oldest = int(_time.time() - _INTRADAY_AVAILABLE[params["interval"]]) + 60
+            if params["period1"] < oldest < params["period2"]:
+                logger.debug(f'{self.ticker}: Yahoo keeps {params["interval"]} data for '
+                             f'{_INTRADAY_AVAILABLE[params["interval"]] // 86400} days, clamping start')
+                params["period1"] = oldest
 
         # if the ticker is MUTUALFUND or ETF, then get capitalGains events
         params["events"] = "div,splits,capitalGains"
@@ -195,35 +610,148 @@ class PriceHistory:
                 params_pretty[k] = str(pd.Timestamp(params[k], unit='s').tz_localize("UTC").tz_convert(tz))
         logger.debug(f'{self.ticker}: Yahoo GET parameters: {str(params_pretty)}')
 
-        # Getting data from json
         url = f"{_BASE_URL_}/v8/finance/chart/{self.ticker}"
-        data = None
-        get_fn = self._data.get
+        use_cache = False
+        end_dt = None
         if end is not None:
             end_dt = pd.Timestamp(end, unit='s').tz_localize("UTC")
             dt_now = pd.Timestamp.utcnow()
             data_delay = _datetime.timedelta(minutes=30)
             if end_dt + data_delay <= dt_now:
                 # Date range in past so safe to fetch through cache:
-                get_fn = self._data.cache_get
+                use_cache = True
+
+        return {'url': url, 'params': params, 'use_cache': use_cache,
+                'interval': interval, 'interval_user': interval_user,
+                'period': period, 'period_user': period_user,
+                'start': start, 'start_user': start_user,
+                'end': end, 'end_dt': end_dt, 'end_user': end_user,
+                'tz': tz}
+
+    def _fetch_history_json(self, request, timeout, raise_errors, use_store=True, profiler=_NO_PROFILER):
+        if use_store and self._can_use_store(request):
+            return self._fetch_history_json_stored(request, timeout, raise_errors, profiler)
+
+        get_fn = self._data.cache_get if request['use_cache'] else self._data.get
+        data = None
         try:
             data = get_fn(
-                url=url,
-                params=params,
+                url=request['url'],
+                params=request['params'],
                 timeout=timeout
             )
-            if "Will be right back" in data.text or data is None:
-                raise RuntimeError("*** YAHOO! FINANCE IS CURRENTLY DOWN! ***\n"
-                                   "Our engineers are working quickly to resolve "
-                                   "the issue. Thank you for your patience.")
-
-            data = data.json()
+            data = self._decode_history_response(data, profiler)
+        # Special case for rate limits
+        except YFRateLimitError:
+            raise
+        except Exception:
+            if raise_errors:
+                raise
+        return data
+
+    @staticmethod
+    def _can_use_store(request):
+        # Store only daily bars requested by date range (incl. period="max").
+        # Intraday would also need tradingPeriods merging, and a tail fetch of
+        # weekly/monthly could return a bar split at period1.
+        params = request['params']
+        return (cache._HistoryStoreManager.enabled and 'period1' in params
+                and params['period1'] is not None and params['period2'] is not None
+                and params['interval'] == '1d')
+
+    def _fetch_history_json_stored(self, request, timeout, raise_errors, profiler=_NO_PROFILER):
+        """
+        Like _fetch_history_json, but serve what the local history store has
+        and only request bars after it. Full re-fetch if a new dividend or split
+        appeared, because that changes Yahoo's back-adjusted past.
+        """
+        logger = utils.get_yf_logger()
+        params = request['params']
+        interval = params['interval']
+        want_start, want_end = params['period1'], params['period2']
+        store = self._data._history_store()
+        entry = store.lookup(self.ticker, interval)
+
+        result = None
+        covered_from = want_start
+        if entry is not None:
+            old = entry['result']
+            first_trade = old['meta'].get('firstTradeDate') or want_start
+            if entry['covered_from'] <= max(want_start, first_trade):
+                covered_from = entry['covered_from']
+                last_ts = old['timestamp'][-1]
+                if want_end <= last_ts:
+                    logger.debug(f'{self.ticker}: {interval} served from history store')
+                    result = old
+                else:
+                    tail_params = dict(params, period1=max(covered_from, last_ts - _STORE_OVERLAP))
+                    tail = self._fetch_history_json(dict(request, params=tail_params, use_cache=False),
+                                                    timeout, raise_errors, use_store=False, profiler=profiler)
+                    tail = _chart_result(tail)
+                    if tail is None:
+                        logger.debug(f'{self.ticker}: history store tail fetch failed, fetching all')
+                    elif _chart_past_changed(old, tail):
+                        logger.debug(f'{self.ticker}: new dividend/split or revised prices, fetching all')
+                    else:
+                        logger.debug(f'{self.ticker}: {interval} history store + {len(tail["timestamp"])} new bars')
+                        result = _merge_chart_results(old, tail)
+                        store.store(self.ticker, interval, covered_from, result)
+
+        if result is None:
+            full_params = dict(params, period1=min(want_start, covered_from))
+            data = self._fetch_history_json(dict(request, params=full_params), timeout, raise_errors,
+                                            use_store=False, profiler=profiler)
+            result = _chart_result(data)
+            if result is None:
+                # Let processing report the error
+                return data
+            store.store(self.ticker, interval, full_params['period1'], result)
+
+        return {'chart': {'result': [_trim_chart_result(result, want_start, want_end)], 'error': None}}
+
+    async def _fetch_history_json_async(self, request, timeout, raise_errors, profiler=_NO_PROFILER):
+        data_async = AsyncYfData()
+        get_fn = data_async.cache_get if request['use_cache'] else data_async.get
+        data = None
+        try:
+            data = await get_fn(
+                url=request['url'],
+                params=request['params'],
+                timeout=timeout
+            )
+            data = self._decode_history_response(data, profiler)
         # Special case for rate limits
         except YFRateLimitError:
             raise
         except Exception:
             if raise_errors:
                 raise
+        return data
+
+    @staticmethod
+    def _decode_history_response(response, profiler=_NO_PROFILER):
+        if "Will be right back" in response.text or response is None:
+            raise RuntimeError("*** YAHOO! FINANCE IS CURRENTLY DOWN! ***\n"
+                               "Our engineers are working quickly to resolve "
+                               "the issue. Thank you for your patience.")
+        wall, cpu = _time.perf_counter(), _time.thread_time()
+        data = response.json()
+        # Part of 'fetch' too
+        profiler.add('decode', _time.perf_counter() - wall, _time.thread_time() - cpu)
+        return data
+
+    def _process_history_json_raw(self, data, request, prepost, repair, raise_errors, profiler=_NO_PROFILER):
+        # Chart JSON -> unadjusted prices with all events and NaN rows, repaired
+        # if asked. None if Yahoo returned no prices (error already handled).
+        logger = utils.get_yf_logger()
+        profiler.mark()
+
+        params = request['params']
+        interval = request['interval']
+        period = request['period']
+        start, start_user = request['start'], request['start_user']
+        end, end_dt, end_user = request['end'], request['end_dt'], request['end_user']
+        tz = request['tz']
 
         # Store the meta data that gets retrieved simultaneously
         try:
@@ -273,15 +801,13 @@ class PriceHistory:
 
         if fail:
             err_msg = str(_exception)
-            shared._DFS[self.ticker] = utils.empty_df()
-            shared._ERRORS[self.ticker] = err_msg.split(': ', 1)[1]
             if raise_errors:
                 raise _exception
             else:
                 logger.error(err_msg)
             if self._reconstruct_start_interval is not None and self._reconstruct_start_interval == interval:
                 self._reconstruct_start_interval = None
-            return utils.empty_df()
+            return None
 
         # Select useful info from metadata
         quote_type = self._history_metadata["instrumentType"]
@@ -311,35 +837,17 @@ class PriceHistory:
             msg = f'{self.ticker}: yfinance received OHLC data: {quotes.index[0]} -> {quotes.index[-1]}'
         logger.debug(msg)
 
-        # 2) fix weird bug with Yahoo! - returning 60m for 30m bars
-        if interval.lower() == "30m":
-            logger.debug(f'{self.ticker}: resampling 30m OHLC from 15m')
-            quotes2 = quotes.resample('30min')
-            quotes = pd.DataFrame(index=quotes2.last().index, data={
-                'Open': quotes2['Open'].first(),
-                'High': quotes2['High'].max(),
-                'Low': quotes2['Low'].min(),
-                'Close': quotes2['Close'].last(),
-                'Adj Close': quotes2['Adj Close'].last(),
-                'Volume': quotes2['Volume'].sum()
-            })
-            try:
-                quotes['Dividends'] = quotes2['Dividends'].max()
-                quotes['Stock Splits'] = quotes2['Stock Splits'].max()
-            except Exception:
-                pass
+        profiler.lap('parse', len(quotes))
 
         # Note: ordering is important. If you change order, run the tests!
         quotes = utils.set_df_tz(quotes, params["interval"], tz_exchange)
         quotes = utils.fix_Yahoo_dst_issue(quotes, params["interval"])
+        profiler.lap('localize', len(quotes))
         intraday = params["interval"][-1] in ("m", 'h')
-        if not prepost and intraday and "tradingPeriods" in self._history_metadata:
-            tps = self._history_metadata["tradingPeriods"]
-            if not isinstance(tps, pd.DataFrame):
-                self._history_metadata = utils.format_history_metadata(self._history_metadata, tradingPeriodsOnly=True)
-                self._history_metadata_formatted = True
-                tps = self._history_metadata["tradingPeriods"]
+        tps = self._trading_periods() if not prepost and intraday else None
+        if tps is not None:
             quotes = utils.fix_Yahoo_returning_prepost_unrequested(quotes, params["interval"], tps)
+            profiler.lap('prepost', len(quotes))
         if quotes.empty:
             msg = f'{self.ticker}: OHLC after cleaning: EMPTY'
         elif len(quotes) == 1:
@@ -407,27 +915,18 @@ class PriceHistory:
             if splits.shape[0] > 0:
                 splits.index = pd.to_datetime(splits.index.date).tz_localize(tz_exchange, ambiguous=True, nonexistent='shift_forward')
 
+        profiler.lap('events')
+
         # Combine
         df = quotes.sort_index()
-        if dividends.shape[0] > 0:
-            df = utils.safe_merge_dfs(df, dividends, interval)
-        if "Dividends" in df.columns:
-            df.loc[df["Dividends"].isna(), "Dividends"] = 0
-        else:
-            df["Dividends"] = 0.0
-        if splits.shape[0] > 0:
-            df = utils.safe_merge_dfs(df, splits, interval)
-        if "Stock Splits" in df.columns:
-            df.loc[df["Stock Splits"].isna(), "Stock Splits"] = 0
-        else:
-            df["Stock Splits"] = 0.0
-        if expect_capital_gains:
-            if capital_gains.shape[0] > 0:
-                df = utils.safe_merge_dfs(df, capital_gains, interval)
-            if "Capital Gains" in df.columns:
-                df.loc[df["Capital Gains"].isna(), "Capital Gains"] = 0
+        events = [e for e in (dividends, splits, capital_gains) if e is not None and e.shape[0] > 0]
+        if events:
+            df = utils.safe_merge_dfs(df, pd.concat(events), interval)
+        for c in ["Dividends", "Stock Splits"] + (["Capital Gains"] if expect_capital_gains else []):
+            if c in df.columns:
+                df.loc[df[c].isna(), c] = 0
             else:
-                df["Capital Gains"] = 0.0
+                df[c] = 0.0
         if df.empty:
             msg = f'{self.ticker}: OHLC after combining events: EMPTY'
         elif len(df) == 1:
@@ -436,11 +935,14 @@ class PriceHistory:
             msg = f'{self.ticker}: OHLC after combining events: {df.index[0]} -> {df.index[-1]}'
         logger.debug(msg)
 
+        profiler.lap('merge', len(df))
+
         df, last_trade = utils.fix_Yahoo_returning_live_separate(df, params["interval"], tz_exchange, prepost, repair=repair, currency=currency)
         if last_trade is not None:
             self._history_metadata['lastTrade'] = {'Price':last_trade['Close'], "Time":last_trade.name}
 
         df = df[~df.index.duplicated(keep='first')]  # must do before repair
+        profiler.lap('live', len(df))
 
         if repair:
             # Do this before auto/back adjust
@@ -468,45 +970,69 @@ class PriceHistory:
             # Must repair 100x and split errors before price reconstruction
             df = self._fix_zeroes(df, interval, tz_exchange, prepost)
             df = df.sort_index()
+            profiler.lap('repair', len(df))
+
+        return df
+
+    def _finish_history(self, df, request, actions, auto_adjust, back_adjust, adj_factor, keepna, rounding,
+                        raise_errors, profiler=_NO_PROFILER) -> pd.DataFrame:
+        # Unadjusted prices from _process_history_json_raw -> what user asked for
+        logger = utils.get_yf_logger()
+        interval, interval_user, period_user = request['interval'], request['interval_user'], request['period_user']
+        profiler.mark()
 
         # Auto/back adjust
         try:
-            if auto_adjust:
+            if adj_factor:
+                df = utils.adjustment_factor(df)
+            elif auto_adjust:
                 df = utils.auto_adjust(df)
             elif back_adjust:
                 df = utils.back_adjust(df)
         except Exception as e:
-            if auto_adjust:
+            if adj_factor:
+                err_msg = "adj_factor failed with %s" % e
+            elif auto_adjust:
                 err_msg = "auto_adjust failed with %s" % e
             else:
                 err_msg = "back_adjust failed with %s" % e
-            shared._DFS[self.ticker] = utils.empty_df()
-            shared._ERRORS[self.ticker] = err_msg
             if raise_errors:
                 raise Exception('%s: %s' % (self.ticker, err_msg))
             else:
                 logger.error('%s: %s' % (self.ticker, err_msg))
+        profiler.lap('adjust', len(df))
 
         if rounding:
-            df = np.round(df, data["chart"]["result"][0]["meta"]["priceHint"])
+            if 'Adj Factor' in df.columns:
+                # Factor is a ratio, not a price
+                df = df.round({c: self._history_metadata["priceHint"] for c in df.columns if c != 'Adj Factor'})
+            else:
+                df = np.round(df, self._history_metadata["priceHint"])
         df['Volume'] = df['Volume'].fillna(0).astype(np.int64)
 
-        if intraday:
+        if interval[-1] in ("m", 'h'):
             df.index.name = "Datetime"
         else:
             df.index.name = "Date"
 
         # missing rows cleanup
-        if not actions:
-            df = df.drop(columns=["Dividends", "Stock Splits", "Capital Gains"], errors='ignore')
+        action_colnames = ["Dividends", "Stock Splits", "Capital Gains"]
+        resample = interval != interval_user
+        if not actions and not resample:
+            df = df.drop(columns=action_colnames, errors='ignore')
         if not keepna:
-            data_colnames = _PRICE_COLNAMES_ + ['Volume'] + ['Dividends', 'Stock Splits', 'Capital Gains']
+            data_colnames = _PRICE_COLNAMES_ + ['Volume'] + (action_colnames if actions else [])
             data_colnames = [c for c in data_colnames if c in df.columns]
             mask_nan_or_zero = (df[data_colnames].isna() | (df[data_colnames] == 0)).all(axis=1)
             df = df.drop(mask_nan_or_zero.index[mask_nan_or_zero])
+        profiler.lap('cleanup', len(df))
 
-        if interval != interval_user:
-            df = self._resample(df, interval, interval_user, period_user)
+        if resample:
+            # Resampling needs the events
+            df = self._resample(df.copy(), interval, interval_user, period_user)
+            if not actions:
+                df = df.drop(columns=action_colnames, errors='ignore')
+            profiler.lap('resample', len(df))
 
         if df.empty:
             msg = f'{self.ticker}: yfinance returning OHLC: EMPTY'
@@ -536,7 +1062,11 @@ class PriceHistory:
 
         if self._history_metadata is None or 'tradingPeriods' not in self._history_metadata:
             # Request intraday data, because then Yahoo returns exchange schedule (tradingPeriods).
+            # Keep the profile of user's last history() call, not of this one.
+            profile = (self._history_metadata or {}).get('profile')
             self._get_history_cache(period="5d", interval="1h")
+            if profile is not None and self._history_metadata is not None:
+                self._history_metadata.setdefault('profile', profile)
 
         if self._history_metadata_formatted is False:
             self._history_metadata = utils.format_history_metadata(self._history_metadata)
@@ -597,12 +1127,25 @@ class PriceHistory:
             return actions[actions != 0].dropna(how='all').fillna(0)
         return pd.Series()
 
+    def _trading_periods(self):
+        # Exchange sessions of last fetch as DataFrame, or None if Yahoo sent none
+        if self._history_metadata is None or "tradingPeriods" not in self._history_metadata:
+            return None
+        tps = self._history_metadata["tradingPeriods"]
+        if not isinstance(tps, pd.DataFrame):
+            self._history_metadata = utils.format_history_metadata(self._history_metadata, tradingPeriodsOnly=True)
+            self._history_metadata_formatted = True
+            tps = self._history_metadata["tradingPeriods"]
+        return tps if isinstance(tps, pd.DataFrame) else None
+
     def _resample(self, df, df_interval, target_interval, period=None) -> pd.DataFrame:
         # resample
         if df_interval == target_interval:
             return df
         offset = None
-        if target_interval == '1wk':
+        if target_interval[-1] in ('m', 'h'):
+            resample_period = None  # binned by session below
+        elif target_interval == '1wk':
             resample_period = 'W-MON'
         elif target_interval == '5d':
             resample_period = '5D'
@@ -625,10 +1168,19 @@ class PriceHistory:
             resample_map['Repaired?'] = 'any'
         if 'Adj Close' in df.columns:
             resample_map['Adj Close'] = resample_map['Close']
+        if 'Adj Factor' in df.columns:
+            resample_map['Adj Factor'] = resample_map['Close']
         if 'Capital Gains' in df.columns:
             resample_map['Capital Gains'] = 'sum'
         df.loc[df['Stock Splits']==0.0, 'Stock Splits'] = 1.0
-        df2 = df.resample(resample_period, label='left', closed='left', offset=offset).agg(resample_map)
+        if resample_period is None:
+            # Bars counted from each session's open, not from midnight
+            bins = utils.session_bins(df.index, target_interval, self._trading_periods())
+            df2 = df.groupby(bins).agg(resample_map)
+        else:
+            df2 = df.resample(resample_period, label='left', closed='left', offset=offset).agg(resample_map)
+        # Same column order as fetched
+        df2 = df2[[c for c in df.columns if c in resample_map]]
         df2.loc[df2['Stock Splits']==1.0, 'Stock Splits'] = 0.0
         return df2
 
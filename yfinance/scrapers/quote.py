@@ -1,3 +1,4 @@
+import asyncio
 import curl_cffi
 import datetime
 import json
@@ -7,7 +8,7 @@ import warnings
 
 from yfinance import utils
 from yfinance.const import quote_summary_valid_modules, _BASE_URL_, _QUERY1_URL_, _SENTINEL_
-from yfinance.data import YfData
+from yfinance.data import YfData, AsyncYfData
 from yfinance.exceptions import YFDataException, YFException
 
 info_retired_keys_price = {"currentPrice", "dayHigh", "dayLow", "open", "previousClose", "volume", "volume24Hr"}
@@ -513,6 +514,16 @@ class Quote:
 
         return self._info
 
+    async def info_async(self) -> dict:
+        """
+        Asyncio variant of :attr:`info`. quoteSummary and v7 quote are fetched concurrently.
+        """
+        if self._info is None:
+            await self._fetch_info_async()
+            await self._fetch_complementary_async()
+
+        return self._info
+
     @property
     def sustainability(self) -> pd.DataFrame:
         if self._sustainability is None:
@@ -578,14 +589,17 @@ class Quote:
     def valid_modules():
         return quote_summary_valid_modules
 
-    def _fetch(self, modules: list):
+    def _fetch_params(self, modules: list) -> dict:
         if not isinstance(modules, list):
             raise YFException("Should provide a list of modules, see available modules using `valid_modules`")
 
         modules = ','.join([m for m in modules if m in quote_summary_valid_modules])
         if len(modules) == 0:
             raise YFException("No valid modules provided, see available modules using `valid_modules`")
-        params_dict = {"modules": modules, "corsDomain": "finance.yahoo.com", "formatted": "false", "symbol": self._symbol}
+        return {"modules": modules, "corsDomain": "finance.yahoo.com", "formatted": "false", "symbol": self._symbol}
+
+    def _fetch(self, modules: list):
+        params_dict = self._fetch_params(modules)
         try:
             result = self._data.get_raw_json(_QUOTE_SUMMARY_URL_ + f"/{self._symbol}", params=params_dict)
         except curl_cffi.requests.exceptions.HTTPError as e:
@@ -593,6 +607,15 @@ class Quote:
             return None
         return result
 
+    async def _fetch_async(self, modules: list):
+        params_dict = self._fetch_params(modules)
+        try:
+            result = await AsyncYfData().get_raw_json(_QUOTE_SUMMARY_URL_ + f"/{self._symbol}", params=params_dict)
+        except curl_cffi.requests.exceptions.HTTPError as e:
+            utils.get_yf_logger().error(str(e) + e.response.text)
+            return None
+        return result
+
     def _fetch_additional_info(self):
         params_dict = {"symbols": self._symbol, "formatted": "false"}
         try:
@@ -602,13 +625,35 @@ class Quote:
             return None
         return result
 
+    async def _fetch_additional_info_async(self):
+        params_dict = {"symbols": self._symbol, "formatted": "false"}
+        try:
+            result = await AsyncYfData().get_raw_json(f"{_QUERY1_URL_}/v7/finance/quote?", params=params_dict)
+        except curl_cffi.requests.exceptions.HTTPError as e:
+            utils.get_yf_logger().error(str(e) + e.response.text)
+            return None
+        return result
+
+    _info_modules = ['financialData', 'quoteType', 'defaultKeyStatistics', 'assetProfile', 'summaryDetail']
+
     def _fetch_info(self):
         if self._already_fetched:
             return
         self._already_fetched = True
-        modules = ['financialData', 'quoteType', 'defaultKeyStatistics', 'assetProfile', 'summaryDetail']
-        result = self._fetch(modules=modules)
+        result = self._fetch(modules=self._info_modules)
         additional_info = self._fetch_additional_info()
+        self._set_info(result, additional_info)
+
+    async def _fetch_info_async(self):
+        if self._already_fetched:
+            return
+        self._already_fetched = True
+        result, additional_info = await asyncio.gather(
+            self._fetch_async(modules=self._info_modules),
+            self._fetch_additional_info_async())
+        self._set_info(result, additional_info)
+
+    def _set_info(self, result, additional_info):
         if additional_info is not None and result is not None:
             result.update(additional_info)
         else:
@@ -659,6 +704,9 @@ class Quote:
 
         self._info = {k: _format(k, v) for k, v in query1_info.items()}
 
+    # Complementary key-statistics. For now just want 'trailing PEG ratio'
+    _complementary_keys = {"trailingPegRatio"}
+
     def _fetch_complementary(self):
         if self._already_fetched_complementary:
             return
@@ -668,8 +716,23 @@ class Quote:
         if self._info is None:
             return
 
-        # Complementary key-statistics. For now just want 'trailing PEG ratio'
-        keys = {"trailingPegRatio"}
+        json_str = self._data.cache_get(url=self._complementary_url()).text
+        self._set_complementary(json_str)
+
+    async def _fetch_complementary_async(self):
+        if self._already_fetched_complementary:
+            return
+        self._already_fetched_complementary = True
+
+        await self._fetch_info_async()
+        if self._info is None:
+            return
+
+        response = await AsyncYfData().cache_get(url=self._complementary_url())
+        self._set_complementary(response.text)
+
+    def _complementary_url(self):
+        keys = self._complementary_keys
         if keys:
             # Simplified the original scrape code for key-statistics. Very expensive for fetching
             # just one value, best if scraping most/all:
@@ -702,8 +765,11 @@ class Quote:
             end = pd.Timestamp.utcnow().ceil("D")
             end = int(end.timestamp())
             url += f"&period1={start}&period2={end}"
+        return url
 
-            json_str = self._data.cache_get(url=url).text
+    def _set_complementary(self, json_str):
+        keys = self._complementary_keys
+        if keys:
             json_data = json.loads(json_str)
             json_result = json_data.get("timeseries") or json_data.get("finance")
             if json_result["error"] is not None:
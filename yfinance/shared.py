@@ -19,8 +19,10 @@
 # limitations under the License.
 #
 
+# Results of the most recently finished download(), kept for code that reads
+# e.g. yf.shared._ERRORS. Nothing inside yfinance reads these: each download()
+# keeps its own state, see multi._DownloadState.
 _DFS = {}
-_PROGRESS_BAR = None
 _ERRORS = {}
 _TRACEBACKS = {}
 _ISINS = {}
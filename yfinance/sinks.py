@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Destinations for download(..., sink=...). Each ticker's DataFrame is written
+by the worker that fetched it, so no combined DataFrame is ever built.
+"""
+
+import os
+
+
+class Sink:
+    """
+    Base class. Subclasses implement _write(ticker, df) and return where it went.
+    write() is called from download worker threads, concurrently for different
+    tickers, so must not share mutable state between tickers.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def _safe_name(ticker):
+        return ticker.replace('/', '_').replace(os.sep, '_')
+
+    def write(self, ticker, df):
+        """
+        Write one ticker's data. Return (rows written, path).
+        """
+        if df is None or df.empty:
+            return 0, None
+        return len(df), self._write(ticker, df)
+
+    def _write(self, ticker, df):
+        raise NotImplementedError()
+
+
+class ParquetSink(Sink):
+    """
+    Write Parquet, one file per ticker. Requires pyarrow (pip install yfinance[parquet]).
+
+    partition_by="ticker" writes a Hive-style dataset: path/ticker=MSFT/data.parquet,
+    readable with pd.read_parquet(path). partition_by=None writes path/MSFT.parquet.
+    """
+
+    def __init__(self, path, partition_by="ticker", compression="snappy"):
+        if partition_by not in ("ticker", None):
+            raise ValueError(f"partition_by must be 'ticker' or None, not '{partition_by}'")
+        # Only import pyarrow if users actually want parquet. Fail now rather
+        # than once per ticker inside download.
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("ParquetSink requires pyarrow: pip install pyarrow")
+        super().__init__(path)
+        self.partition_by = partition_by
+        self.compression = compression
+
+    def _write(self, ticker, df):
+        name = self._safe_name(ticker)
+        if self.partition_by == "ticker":
+            d = os.path.join(self.path, f"ticker={name}")
+            os.makedirs(d, exist_ok=True)
+            fp = os.path.join(d, "data.parquet")
+        else:
+            fp = os.path.join(self.path, f"{name}.parquet")
+        df.to_parquet(fp, engine="pyarrow", compression=self.compression)
+        return fp
+
+
+class CsvSink(Sink):
+    """
+    Write path/<ticker>.csv per ticker. No extra dependencies.
+    """
+
+    def _write(self, ticker, df):
+        fp = os.path.join(self.path, f"{self._safe_name(ticker)}.csv")
+        df.to_csv(fp)
+        return fp
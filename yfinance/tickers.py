@@ -34,11 +34,17 @@ class Tickers:
     def __repr__(self):
         return f"yfinance.Tickers object <{','.join(self.symbols)}>"
 
-    def __init__(self, tickers, session=None):
+    def __init__(self, tickers, session=None, dispatcher=None):
         tickers = tickers if isinstance(
             tickers, list) else tickers.replace(',', ' ').split()
         self.symbols = [ticker.upper() for ticker in tickers]
-        self.tickers = {ticker: Ticker(ticker, session=session) for ticker in self.symbols}
+        self._dispatcher = dispatcher
+        if dispatcher is not None:
+            # Spread tickers over the dispatcher's contexts
+            contexts = dispatcher.assign(len(self.symbols))
+            self.tickers = {ticker: Ticker(ticker, session=ctx) for ticker, ctx in zip(self.symbols, contexts)}
+        else:
+            self.tickers = {ticker: Ticker(ticker, session=session) for ticker in self.symbols}
 
         self._data = YfData(session=session)
 
@@ -93,6 +99,7 @@ class Tickers:
                               threads=threads,
                               progress=progress,
                               timeout=timeout,
+                              dispatcher=self._dispatcher,
                               **kwargs)
 
         for symbol in self.symbols:
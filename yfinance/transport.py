@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# yfinance - market data downloader
+# https://github.com/ranaroussi/yfinance
+#
+# Copyright 2017-2019 Ran Aroussi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Pluggable transports for YfData, set with yf.set_config(transport=...).
+
+- RecordTransport: pass requests through, save every response to a cassette directory
+- ReplayTransport: serve responses from a cassette directory, no network
+- RewriteTransport: send Yahoo requests to another host, e.g. yfinance.mock_server
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+from curl_cffi import requests
+
+from . import pool, utils
+from .exceptions import YFException
+
+# Response headers worth keeping in a cassette
+_KEEP_HEADERS = ('content-type', 'retry-after')
+
+
+class ReplayedResponse:
+    """
+    Stand-in for curl_cffi Response, rebuilt from a cassette.
+    """
+
+    def __init__(self, url, status_code, content, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self, **kw):
+        return json.loads(self.content, **kw)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.exceptions.HTTPError(f"HTTP Error {self.status_code}", response=self)
+
+
+class Transport:
+    """
+    Base transport: forwards to a curl_cffi session (default a SessionPool).
+    Quacks like a Session for what YfData needs: get, post, cookies, proxies.
+
+    Responses don't reach yfinance's on-disk caches (timezone, cookie, response,
+    history store), so mock or replayed data can't leak into later real runs.
+    Set persist_caches = True to opt back in.
+    """
+
+    persist_caches = False
+
+    def __init__(self, session=None):
+        self._session = session if session is not None else pool.SessionPool()
+
+    @property
+    def cookies(self):
+        return self._session.cookies
+
+    @property
+    def proxies(self):
+        return self._session.proxies
+
+    @proxies.setter
+    def proxies(self, proxies):
+        self._session.proxies = proxies
+
+    def request(self, method, url, **kwargs):
+        return self._session.request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+def _cassette_key(method, url, kwargs):
+    # Crumb changes every session, so ignore it
+    params = {k: v for k, v in (kwargs.get('params') or {}).items() if k != 'crumb'}
+    blob = json.dumps([method.upper(), url, params, kwargs.get('json'), kwargs.get('data')],
+                      sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()[:32]
+
+
+class RecordTransport(Transport):
+    """
+    Send requests normally and save each response in `cassette_dir`,
+    one JSON file per distinct request. Later requests overwrite earlier.
+    """
+
+    def __init__(self, cassette_dir, session=None):
+        super().__init__(session)
+        self.cassette_dir = cassette_dir
+        os.makedirs(cassette_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        response = super().request(method, url, **kwargs)
+        headers = {k: response.headers[k] for k in response.headers.keys() if k.lower() in _KEEP_HEADERS} if response.headers else {}
+        entry = {
+            'request': {'method': method.upper(), 'url': url,
+                        'params': {k: v for k, v in (kwargs.get('params') or {}).items() if k != 'crumb'}},
+            'response': {'url': str(response.url), 'status_code': response.status_code, 'headers': headers,
+                         'body_b64': base64.b64encode(response.content).decode('ascii')},
+        }
+        fp = os.path.join(self.cassette_dir, _cassette_key(method, url, kwargs) + '.json')
+        with self._lock:
+            with open(fp, 'w') as f:
+                json.dump(entry, f, default=str)
+        return response
+
+
+class ReplayTransport(Transport):
+    """
+    Serve responses recorded by RecordTransport. Never touches the network.
+
+    Cookie/crumb handshake requests that weren't recorded get a dummy answer,
+    so a cassette recorded with a warm cookie still replays. Any other missing
+    request raises YFException, or returns 404 if strict=False.
+    """
+
+    _HANDSHAKE_HOSTS = ('fc.yahoo.com', 'guce.yahoo.com', 'consent.yahoo.com')
+
+    def __init__(self, cassette_dir, strict=True):
+        if not os.path.isdir(cassette_dir):
+            raise YFException(f"Cassette directory not found: '{cassette_dir}'")
+        self.cassette_dir = cassette_dir
+        self.strict = strict
+        self._cookies = requests.Cookies()
+        self._proxies = {}
+
+    @property
+    def cookies(self):
+        return self._cookies
+
+    @property
+    def proxies(self):
+        return self._proxies
+
+    @proxies.setter
+    def proxies(self, proxies):
+        self._proxies = proxies
+
+    def request(self, method, url, **kwargs):
+        fp = os.path.join(self.cassette_dir, _cassette_key(method, url, kwargs) + '.json')
+        if os.path.isfile(fp):
+            with open(fp) as f:
+                r = json.load(f)['response']
+            return ReplayedResponse(r['url'], r['status_code'], base64.b64decode(r['body_b64']), r.get('headers'))
+
+        if '/v1/test/getcrumb' in url:
+            return ReplayedResponse(url, 200, b'replay-crumb')
+        if urlsplit(url).netloc in self._HANDSHAKE_HOSTS:
+            return ReplayedResponse(url, 200, b'')
+        utils.get_yf_logger().debug(f'replay miss: {method} {url}')
+        if self.strict:
+            raise YFException(f"No recorded response for {method} {url} params={kwargs.get('params')}")
+        return ReplayedResponse(url, 404, b'{}')
+
+
+class RewriteTransport(Transport):
+    """
+    Send every request to `base_url` instead of Yahoo, keeping path and query.
+    E.g. RewriteTransport("http://127.0.0.1:8000") for yfinance.mock_server.
+    """
+
+    def __init__(self, base_url, session=None):
+        super().__init__(session)
+        parts = urlsplit(base_url)
+        self._scheme, self._netloc = parts.scheme, parts.netloc
+
+    def request(self, method, url, **kwargs):
+        parts = urlsplit(url)
+        url = urlunsplit((self._scheme, self._netloc, parts.path or '/', parts.query, parts.fragment))
+        return super().request(method, url, **kwargs)
@@ -442,72 +442,102 @@ def is_valid_period_format(period):
     return bool(re.match(valid_pattern, period))
 
 
-def auto_adjust(data):
-    col_order = data.columns
-    df = data.copy()
-    ratio = (df["Adj Close"] / df["Close"]).to_numpy()
-    df["Adj Open"] = df["Open"] * ratio
-    df["Adj High"] = df["High"] * ratio
-    df["Adj Low"] = df["Low"] * ratio
+def _adjustment_ratio(data):
+    if "Adj Factor" in data.columns:
+        return data["Adj Factor"].to_numpy()
+    return (data["Adj Close"] / data["Close"]).to_numpy()
+
 
-    df.drop(
-        ["Open", "High", "Low", "Close"],
-        axis=1, inplace=True)
+def adjustment_factor(data):
+    """
+    Unadjusted prices with "Adj Close" replaced by "Adj Factor" = Adj Close / Close.
+    auto_adjust() and back_adjust() accept the result.
+    """
+    df = data.rename(columns={"Adj Close": "Adj Factor"})
+    df["Adj Factor"] = _adjustment_ratio(data)
+    return df
 
-    df.rename(columns={
-        "Adj Open": "Open", "Adj High": "High",
-        "Adj Low": "Low", "Adj Close": "Close"
-    }, inplace=True)
 
-    return df[[c for c in col_order if c in df.columns]]
+def auto_adjust(data):
+    # Only the adjusted columns are new, the rest are shared with data
+    ratio = _adjustment_ratio(data)
+    df = data.drop(columns=["Adj Close", "Adj Factor"], errors="ignore")
+    for c in ["Open", "High", "Low"]:
+        df[c] = df[c].to_numpy() * ratio
+    if "Adj Close" in data.columns:
+        df["Close"] = data["Adj Close"].to_numpy()
+    else:
+        df["Close"] = df["Close"].to_numpy() * ratio
+    return df
 
 
 def back_adjust(data):
     """ back-adjusted data to mimic true historical prices """
 
-    col_order = data.columns
-    df = data.copy()
-    ratio = df["Adj Close"] / df["Close"]
-    df["Adj Open"] = df["Open"] * ratio
-    df["Adj High"] = df["High"] * ratio
-    df["Adj Low"] = df["Low"] * ratio
+    ratio = _adjustment_ratio(data)
+    df = data.drop(columns=["Adj Close", "Adj Factor"], errors="ignore")
+    for c in ["Open", "High", "Low"]:
+        df[c] = df[c].to_numpy() * ratio
+    return df
+
+
+def _float_array(values):
+    # numpy converts None to NaN when the dtype is float
+    return _np.array(values, dtype=_np.float64)
+
 
-    df.drop(
-        ["Open", "High", "Low", "Adj Close"],
-        axis=1, inplace=True)
+def _volume_array(values):
+    # int64 unless Yahoo sent nulls, same as pandas would infer
+    a = _np.array(values)
+    if a.dtype.kind in "if":
+        return a
+    return _np.array(values, dtype=_np.float64)
 
-    df.rename(columns={
-        "Adj Open": "Open", "Adj High": "High",
-        "Adj Low": "Low"
-    }, inplace=True)
 
-    return df[[c for c in col_order if c in df.columns]]
+# Resolution pd.to_datetime(unit="s") gives in this pandas version
+_EPOCH_DTYPE = _pd.to_datetime([0], unit="s").dtype
+
+
+def _epoch_index(timestamps, name=None):
+    # Viewing int64 seconds as datetime64[s] is free, unlike pd.to_datetime(unit="s")
+    a = _np.asarray(timestamps, dtype=_np.int64).view("datetime64[s]")
+    if a.dtype != _EPOCH_DTYPE:
+        a = a.astype(_EPOCH_DTYPE)
+    return _pd.DatetimeIndex(a, name=name)
+
+
+def _sorted(df):
+    if df.index.is_monotonic_increasing:
+        return df
+    return df.sort_index()
 
 
 def parse_quotes(data):
     timestamps = data["timestamp"]
     ohlc = data["indicators"]["quote"][0]
-    volumes = ohlc["volume"]
-    opens = ohlc["open"]
-    closes = ohlc["close"]
-    lows = ohlc["low"]
-    highs = ohlc["high"]
+    closes = _float_array(ohlc["close"])
 
     adjclose = closes
     if "adjclose" in data["indicators"]:
-        adjclose = data["indicators"]["adjclose"][0]["adjclose"]
+        adjclose = _float_array(data["indicators"]["adjclose"][0]["adjclose"])
 
-    quotes = _pd.DataFrame({"Open": opens,
-                            "High": highs,
-                            "Low": lows,
+    quotes = _pd.DataFrame({"Open": _float_array(ohlc["open"]),
+                            "High": _float_array(ohlc["high"]),
+                            "Low": _float_array(ohlc["low"]),
                             "Close": closes,
                             "Adj Close": adjclose,
-                            "Volume": volumes})
+                            "Volume": _volume_array(ohlc["volume"])},
+                           index=_epoch_index(timestamps))
 
-    quotes.index = _pd.to_datetime(timestamps, unit="s")
-    quotes.sort_index(inplace=True)
+    return _sorted(quotes)
 
-    return quotes
+
+def _parse_events(events):
+    events = list(events.values())
+    keys = dict.fromkeys(k for e in events for k in e if k != "date")
+    df = _pd.DataFrame({k: [e.get(k) for e in events] for k in keys},
+                       index=_epoch_index([e["date"] for e in events], name="date"))
+    return _sorted(df)
 
 
 def parse_actions(data):
@@ -517,30 +547,18 @@ def parse_actions(data):
 
     if "events" in data:
         if "dividends" in data["events"] and len(data["events"]['dividends']) > 0:
-            dividends = _pd.DataFrame(
-                data=list(data["events"]["dividends"].values()))
-            dividends.set_index("date", inplace=True)
-            dividends.index = _pd.to_datetime(dividends.index, unit="s")
-            dividends.sort_index(inplace=True)
+            dividends = _parse_events(data["events"]["dividends"])
             if 'currency' in dividends.columns and (dividends['currency'] == '').all():
                 # Currency column useless, drop it.
                 dividends = dividends.drop('currency', axis=1)
             dividends = dividends.rename(columns={'amount': 'Dividends'})
 
         if "capitalGains" in data["events"] and len(data["events"]['capitalGains']) > 0:
-            capital_gains = _pd.DataFrame(
-                data=list(data["events"]["capitalGains"].values()))
-            capital_gains.set_index("date", inplace=True)
-            capital_gains.index = _pd.to_datetime(capital_gains.index, unit="s")
-            capital_gains.sort_index(inplace=True)
+            capital_gains = _parse_events(data["events"]["capitalGains"])
             capital_gains.columns = ["Capital Gains"]
 
         if "splits" in data["events"] and len(data["events"]['splits']) > 0:
-            splits = _pd.DataFrame(
-                data=list(data["events"]["splits"].values()))
-            splits.set_index("date", inplace=True)
-            splits.index = _pd.to_datetime(splits.index, unit="s")
-            splits.sort_index(inplace=True)
+            splits = _parse_events(data["events"]["splits"])
             splits["Stock Splits"] = splits["numerator"] / splits["denominator"]
             splits = splits[["Stock Splits"]]
 
@@ -592,6 +610,28 @@ def fix_Yahoo_returning_prepost_unrequested(quotes, interval, tradingPeriods):
     return quotes
 
 
+def session_bins(index, interval, tradingPeriods=None):
+    """
+    Start of the interval-long bar that each datetime in index falls in.
+    Bars are counted from that day's regular open in tradingPeriods, so e.g.
+    4h bars of a 9:30-16:00 session start 9:30 and 13:30, and pre-market
+    bars count backwards from the open. Days without a trading period count
+    from midnight.
+    """
+    width = _pd.Timedelta(interval)
+    days = index.normalize()
+    opens = days
+    if tradingPeriods is not None and not tradingPeriods.empty:
+        tps_opens = tradingPeriods["start"].dt.tz_convert(index.tz)
+        tps_opens.index = tps_opens.index.tz_convert(index.tz).normalize()
+        tps_opens = tps_opens[~tps_opens.index.duplicated(keep='first')]
+        opens = _pd.DatetimeIndex(tps_opens.reindex(days))
+        opens = opens.where(opens.notna(), days)
+    bins = opens + ((index - opens) // width) * width
+    # Keep index's resolution, tradingPeriods may be finer
+    return _pd.DatetimeIndex(bins, name=index.name).astype(index.dtype)
+
+
 def _dts_in_same_interval(dt1, dt2, interval):
     # Check if second date dt2 in interval starting at dt1
 
@@ -701,16 +741,40 @@ def fix_Yahoo_returning_live_separate(quotes, interval, tz_exchange, prepost, re
     return quotes, dropped_row
 
 
+# How to combine several events of a type falling in one price interval
+_EVENT_AGGREGATION = {'Dividends': 'sum', 'Capital Gains': 'sum', 'Stock Splits': 'prod'}
+
+
+def _datetimes_ns(index):
+    return _pd.DatetimeIndex(index).as_unit('ns').asi8
+
+
+def _dates_ns(index):
+    # Local calendar date of each datetime, as int64
+    index = _pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().as_unit('ns').asi8
+
+
 def safe_merge_dfs(df_main, df_sub, interval):
+    """
+    Add the event columns of df_sub (any of Dividends, Stock Splits, Capital Gains)
+    to the price rows of df_main, each event in the row whose interval contains it.
+    Several events of a type in one row are summed, or multiplied for splits.
+    Rows without an event are NaN.
+    """
     if df_sub.empty:
         raise Exception("No data to merge")
     if df_main.empty:
         return df_main
 
     data_cols = [c for c in df_sub.columns if c not in df_main]
-    if len(data_cols) > 1:
-        raise Exception("Expected 1 data col")
-    data_col = data_cols[0]
+    if not data_cols:
+        raise Exception("Expected a data col not in df_main")
+    df_sub = df_sub[data_cols]
+    if df_sub.isna().all(axis=1).any():
+        raise Exception('Data was lost in merge, investigate')
 
     df_main = df_main.sort_index()
     intraday = interval.endswith('m') or interval.endswith('s')
@@ -720,116 +784,66 @@ def safe_merge_dfs(df_main, df_sub, interval):
         # On some exchanges the event can occur before market open.
         # Problem when combining with intraday data.
         # Solution = use dates, not datetimes, to map/merge.
-        df_main['_date'] = df_main.index.date
-        df_sub['_date'] = df_sub.index.date
-        indices = _np.searchsorted(_np.append(df_main['_date'], [df_main['_date'].iloc[-1]+td]), df_sub['_date'], side='left')
-        df_main = df_main.drop('_date', axis=1)
-        df_sub = df_sub.drop('_date', axis=1)
+        main_dates = _dates_ns(df_main.index)
+        sub_dates = _dates_ns(df_sub.index)
+        f_in_range = (sub_dates >= main_dates[0]) & (sub_dates <= main_dates[-1])
+        if not f_in_range.any():
+            # Discard out-of-range events in intraday data, assume user not interested
+            for c in data_cols:
+                df_main[c] = 0.0
+            return df_main
+        df_sub = df_sub[f_in_range]
+        indices = _np.searchsorted(main_dates, sub_dates[f_in_range], side='left')
     else:
-        indices = _np.searchsorted(_np.append(df_main.index, df_main.index[-1] + td), df_sub.index, side='right')
-        indices -= 1  # Convert from [[i-1], [i]) to [[i], [i+1])
-    # Numpy.searchsorted does not handle out-of-range well, so handle manually:
-    if intraday:
-        for i in range(len(df_sub.index)):
-            dt = df_sub.index[i].date()
-            if dt < df_main.index[0].date() or dt >= df_main.index[-1].date() + _datetime.timedelta(days=1):
-                # Out-of-range
-                indices[i] = -1
-    else:
-        for i in range(len(df_sub.index)):
-            dt = df_sub.index[i]
-            if dt < df_main.index[0] or dt >= df_main.index[-1] + td:
-                # Out-of-range
-                indices[i] = -1
-
-    f_outOfRange = indices == -1
-    if f_outOfRange.any():
-        if intraday:
-            # Discard out-of-range dividends in intraday data, assume user not interested
-            df_sub = df_sub[~f_outOfRange]
-            if df_sub.empty:
-                df_main['Dividends'] = 0.0
-                return df_main
-
-            # df_sub changed so recalc indices:
-            df_main['_date'] = df_main.index.date
-            df_sub['_date'] = df_sub.index.date
-            indices = _np.searchsorted(_np.append(df_main['_date'], [df_main['_date'].iloc[-1]+td]), df_sub['_date'], side='left')
-            df_main = df_main.drop('_date', axis=1)
-            df_sub = df_sub.drop('_date', axis=1)
-        else:
-            empty_row_data = {**{c:[_np.nan] for c in const._PRICE_COLNAMES_}, 'Volume':[0]}
+        sub_dts = _datetimes_ns(df_sub.index)
+
+        def _out_of_range():
+            return (sub_dts < _datetimes_ns(df_main.index[:1])[0]) | \
+                   (sub_dts >= _datetimes_ns([df_main.index[-1] + td])[0])
+
+        f_outOfRange = _out_of_range()
+        if f_outOfRange.any():
             if interval == '1d':
                 # For 1d, add all out-of-range event dates
-                for i in _np.where(f_outOfRange)[0]:
-                    dt = df_sub.index[i]
-                    get_yf_logger().debug(f"Adding out-of-range {data_col} @ {dt.date()} in new prices row of NaNs")
-                    empty_row = _pd.DataFrame(data=empty_row_data, index=[dt])
-                    df_main = _pd.concat([df_main, empty_row], sort=True)
+                new_dts = df_sub.index[f_outOfRange]
             else:
                 # Else, only add out-of-range event dates if occurring in interval
                 # immediately after last price row
-                last_dt = df_main.index[-1]
-                next_interval_start_dt = last_dt + td
-                next_interval_end_dt = next_interval_start_dt + td
-                for i in _np.where(f_outOfRange)[0]:
-                    dt = df_sub.index[i]
-                    if next_interval_start_dt <= dt < next_interval_end_dt:
-                        get_yf_logger().debug(f"Adding out-of-range {data_col} @ {dt.date()} in new prices row of NaNs")
-                        empty_row = _pd.DataFrame(data=empty_row_data, index=[dt])
-                        df_main = _pd.concat([df_main, empty_row], sort=True)
-            df_main = df_main.sort_index()
-
-            # Re-calculate indices
-            indices = _np.searchsorted(_np.append(df_main.index, df_main.index[-1] + td), df_sub.index, side='right')
-            indices -= 1  # Convert from [[i-1], [i]) to [[i], [i+1])
-            # Numpy.searchsorted does not handle out-of-range well, so handle manually:
-            for i in range(len(df_sub.index)):
-                dt = df_sub.index[i]
-                if dt < df_main.index[0] or dt >= df_main.index[-1] + td:
-                    # Out-of-range
-                    indices[i] = -1
-
-    f_outOfRange = indices == -1
-    if f_outOfRange.any():
-        if intraday or interval in ['1d', '1wk']:
-            raise Exception(f"The following '{data_col}' events are out-of-range, did not expect with interval {interval}: {df_sub.index[f_outOfRange]}")
-        get_yf_logger().debug(f'Discarding these {data_col} events:' + '\n' + str(df_sub[f_outOfRange]))
-        df_sub = df_sub[~f_outOfRange].copy()
-        indices = indices[~f_outOfRange]
-
-    def _reindex_events(df, new_index, data_col_name):
-        if len(new_index) == len(set(new_index)):
-            # No duplicates, easy
-            df.index = new_index
-            return df
-
-        df["_NewIndex"] = new_index
-        # Duplicates present within periods but can aggregate
-        if data_col_name in ["Dividends", "Capital Gains"]:
-            # Add
-            df = df.groupby("_NewIndex").sum()
-            df.index.name = None
-        elif data_col_name == "Stock Splits":
-            # Product
-            df = df.groupby("_NewIndex").prod()
-            df.index.name = None
-        else:
-            raise Exception(f"New index contains duplicates but unsure how to aggregate for '{data_col_name}'")
-        if "_NewIndex" in df.columns:
-            df = df.drop("_NewIndex", axis=1)
-        return df
-
-    new_index = df_main.index[indices]
-    df_sub = _reindex_events(df_sub, new_index, data_col)
-
-    df = df_main.join(df_sub)
-    f_na = df[data_col].isna()
-    data_lost = sum(~f_na) < df_sub.shape[0]
-    if data_lost:
-        raise Exception('Data was lost in merge, investigate')
-
-    return df
+                next_interval_start = _datetimes_ns([df_main.index[-1] + td])[0]
+                next_interval_end = _datetimes_ns([df_main.index[-1] + td + td])[0]
+                new_dts = df_sub.index[f_outOfRange & (sub_dts >= next_interval_start) & (sub_dts < next_interval_end)]
+            new_dts = new_dts.unique()
+            if len(new_dts) > 0:
+                for dt in new_dts:
+                    get_yf_logger().debug(f"Adding out-of-range {'/'.join(data_cols)} @ {dt.date()} in new prices row of NaNs")
+                empty_rows = _pd.DataFrame(data={**{c: _np.nan for c in const._PRICE_COLNAMES_}, 'Volume': 0},
+                                           index=new_dts)
+                df_main = _pd.concat([df_main, empty_rows]).sort_index()
+                f_outOfRange = _out_of_range()
+
+        # Convert from [[i-1], [i]) to [[i], [i+1])
+        indices = _np.searchsorted(_datetimes_ns(df_main.index), sub_dts, side='right') - 1
+        if f_outOfRange.any():
+            if interval in ['1d', '1wk']:
+                raise Exception(f"The following '{'/'.join(data_cols)}' events are out-of-range, did not expect with interval {interval}: {df_sub.index[f_outOfRange]}")
+            get_yf_logger().debug(f"Discarding these {'/'.join(data_cols)} events:" + '\n' + str(df_sub[f_outOfRange]))
+            df_sub = df_sub[~f_outOfRange]
+            indices = indices[~f_outOfRange]
+
+    rows = _np.arange(df_main.shape[0])
+    for c in data_cols:
+        f = df_sub[c].notna().to_numpy()
+        values = df_sub[c][f]
+        idx = indices[f]
+        if len(_np.unique(idx)) < len(idx):
+            # Duplicates present within periods but can aggregate
+            if c not in _EVENT_AGGREGATION:
+                raise Exception(f"New index contains duplicates but unsure how to aggregate for '{c}'")
+            values = values.groupby(idx).agg(_EVENT_AGGREGATION[c])
+            idx = values.index.to_numpy()
+        df_main[c] = _pd.Series(values.to_numpy(), index=idx).reindex(rows).to_numpy()
+
+    return df_main
 
 
 def fix_Yahoo_dst_issue(df, interval):